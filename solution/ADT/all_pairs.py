@@ -0,0 +1,169 @@
+import math
+
+from data_structure.csr import csr_arcs, dijkstra
+
+SOURCE_SUFFIX = '.source' # the file next to a saved matrix holding the digest of the snapshot it was computed from
+
+def floyd_warshall(csr, weight = None):
+    """
+    Computes all-pairs shortest path lengths with a NumPy-vectorized Floyd-Warshall.
+
+    Parameters:
+    - csr (CSRGraph): The snapshot.
+    - weight (str, optional): The weight column. Defaults to None, which counts hops.
+
+    Returns:
+    - numpy.ndarray: An n x n float64 matrix, inf where there is no path.
+
+    Detailed Explanation:
+    The k-th iteration relaxes every pair through vertex k at once with
+    dist = minimum(dist, dist[:, k] + dist[k, :]), so the O(n^3) work runs in n NumPy calls.
+    """
+    import numpy as np
+    n = csr.num_vertices()
+    offsets, targets, weights = csr.to_numpy()
+    sources = np.repeat(np.arange(n), np.diff(offsets))
+    w = weights[weight] if weight is not None else np.ones(len(targets))
+
+    dist = np.full((n, n), np.inf)
+    np.minimum.at(dist, (sources, targets), w)
+    np.fill_diagonal(dist, 0)
+    for k in range(n):
+        np.minimum(dist, dist[:, k, None] + dist[None, k, :], out = dist)
+    return dist
+
+_worker_graph = None
+
+def _init_worker(offsets, targets, weights):
+    global _worker_graph
+    _worker_graph = csr_arcs(offsets, targets, weights)
+
+def _dijkstra_rows(sources):
+    arcs = _worker_graph
+    n = len(arcs)
+    rows = []
+    for s in sources:
+        dist = [math.inf] * n
+        dist[s] = 0
+        dijkstra(arcs, dist, [-1] * n, [(0, s)])
+        rows.append(dist)
+    return rows
+
+def repeated_dijkstra(csr, weight = None, processes = None, chunk_size = 32):
+    """
+    Computes all-pairs shortest path lengths by running Dijkstra from every vertex in a process pool.
+
+    Parameters:
+    - csr (CSRGraph): The snapshot.
+    - weight (str, optional): The weight column. Defaults to None, which counts hops.
+    - processes (int, optional): Number of worker processes. Defaults to os.cpu_count().
+    - chunk_size (int, optional): Number of sources handed to a worker at a time.
+
+    Returns:
+    - numpy.ndarray: An n x n float64 matrix, inf where there is no path.
+
+    Detailed Explanation:
+    The snapshot arrays are sent once to each worker through the pool initializer; tasks then only carry source ids. O(n (n + m) log n) in total, which beats Floyd-Warshall on large sparse graphs.
+    """
+    import numpy as np
+    # imported here: scripts run from ADT/ have ADT/queue.py shadowing the queue module multiprocessing needs
+    from concurrent.futures import ProcessPoolExecutor
+    n = csr.num_vertices()
+    w = csr.weights[weight] if weight is not None else None
+    chunks = [range(i, min(n, i + chunk_size)) for i in range(0, n, chunk_size)]
+    dist = np.empty((n, n))
+    with ProcessPoolExecutor(max_workers = processes, initializer = _init_worker,
+                                initargs = (csr.offsets, csr.targets, w)) as pool:
+        for chunk, rows in zip(chunks, pool.map(_dijkstra_rows, chunks)):
+            dist[chunk.start:chunk.stop] = rows
+    return dist
+
+class DistanceMatrix:
+    """
+    Represents precomputed all-pairs shortest path lengths with O(1) lookups.
+
+    Attributes:
+    - vertices (list): The vertices, in row/column order.
+    - vertex_indices (dict): A dictionary mapping each vertex to its row/column.
+    - matrix (numpy.ndarray or numpy.memmap): matrix[i, j] is the length of a shortest path from vertices[i] to vertices[j].
+    - source (str or None): The CSRGraph.digest of the snapshot and weight column the matrix was computed from.
+
+    Detailed Explanation:
+    The matrix is saved as a plain .npy file, with its 'source' digest in a '.source' file next to it. Loading it with mmap_mode='r' only maps the file, so startup cost does not depend on the number of vertices and pages are read on first access.
+
+    Practical Usages:
+    Fare and ETA services that answer many station-to-station queries on a network that rarely changes.
+    """
+    METHODS = {'floyd_warshall': floyd_warshall, 'dijkstra': repeated_dijkstra}
+
+    def __init__(self, vertices, matrix, source = None):
+        assert matrix.shape == (len(vertices), len(vertices))
+        self.vertices = vertices
+        self.vertex_indices = {v: i for i, v in enumerate(vertices)}
+        self.matrix = matrix
+        self.source = source
+
+    @classmethod
+    def compute(cls, csr, weight = None, method = 'floyd_warshall', **kwargs):
+        """
+        Computes the matrix of a CSR snapshot.
+
+        Parameters:
+        - csr (CSRGraph): The snapshot.
+        - weight (str, optional): The weight column. Defaults to None, which counts hops.
+        - method (str, optional): 'floyd_warshall' or 'dijkstra' (repeated, in a process pool). Defaults to 'floyd_warshall'.
+        - kwargs: Passed to the method, e.g. processes for 'dijkstra'.
+
+        Returns:
+        - DistanceMatrix: The matrix.
+        """
+        if method not in cls.METHODS:
+            raise ValueError(f'Invalid method {method}')
+        return cls(csr.vertices, cls.METHODS[method](csr, weight, **kwargs), csr.digest(weight))
+
+    @classmethod
+    def load(cls, csr, path, weight = None, mmap = True):
+        """
+        Loads a matrix saved with save.
+
+        Parameters:
+        - csr (CSRGraph): The snapshot the matrix is expected to have been computed from.
+        - path (str): The .npy file.
+        - weight (str, optional): The weight column it is expected to have been computed on. Defaults to None, which counts hops.
+        - mmap (bool, optional): Memory-map the file instead of reading it. Defaults to True.
+
+        Returns:
+        - DistanceMatrix: The matrix.
+
+        Raises:
+        - ValueError: If the matrix was computed from another snapshot (other vertices, vertex order, arcs or weights) or another weight column, or has no saved source.
+        """
+        import numpy as np
+        source = csr.digest(weight)
+        try:
+            with open(path + SOURCE_SUFFIX, 'r', encoding = 'ascii') as f:
+                saved = f.read().strip()
+        except FileNotFoundError:
+            saved = None
+        if saved != source:
+            raise ValueError(f'{path} was not computed from this graph')
+        vertices = csr.vertices
+        matrix = np.load(path, mmap_mode = 'r' if mmap else None)
+        if matrix.shape != (len(vertices), len(vertices)):
+            raise ValueError(f'{path} was not computed from this graph')
+        return cls(vertices, matrix, source)
+
+    def save(self, path):
+        """
+        Saves the matrix as a .npy file, and its source digest next to it.
+        """
+        import numpy as np
+        np.save(path, self.matrix)
+        with open(path + SOURCE_SUFFIX, 'w', encoding = 'ascii') as f:
+            f.write(self.source or '')
+
+    def get(self, src, dst):
+        """
+        Returns the shortest path length from 'src' to 'dst' (inf if unreachable).
+        """
+        return float(self.matrix[self.vertex_indices[src], self.vertex_indices[dst]])
@@ -0,0 +1,134 @@
+def tarjan_scc(offsets, targets):
+    """
+    Finds the strongly connected components of a directed graph with Tarjan's algorithm.
+
+    Parameters:
+    - offsets, targets: CSR arrays of the graph (see CSRGraph).
+
+    Returns:
+    - list of int: The component of every vertex. Components are numbered in reverse topological order: an arc between two components always goes to a lower number.
+
+    Detailed Explanation:
+    A depth-first search gives every vertex a discovery index and a low-link, the smallest index reachable from its subtree through at most one arc back into the vertices still on the stack. A vertex whose low-link equals its own index is the root of a component, which is popped from the stack when the vertex finishes. The recursion is replaced by an explicit stack of (vertex, next arc) frames, so the search is O(V + E) and does not depend on the Python recursion limit.
+    """
+    offsets, targets = list(offsets), list(targets)
+    n = len(offsets) - 1
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    stack = []
+    component = [-1] * n
+    counter = 0
+    n_components = 0
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+        frames = [root]
+        cursor = [offsets[root]]
+        while frames:
+            v = frames[-1]
+            pos = cursor[-1]
+            if pos < offsets[v + 1]:
+                cursor[-1] = pos + 1
+                w = targets[pos]
+                if index[w] == -1:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = True
+                    frames.append(w)
+                    cursor.append(offsets[w])
+                elif on_stack[w] and index[w] < low[v]:
+                    low[v] = index[w]
+                continue
+            frames.pop()
+            cursor.pop()
+            if frames and low[v] < low[frames[-1]]:
+                low[frames[-1]] = low[v]
+            if low[v] == index[v]:
+                while True:
+                    w = stack.pop()
+                    on_stack[w] = False
+                    component[w] = n_components
+                    if w == v:
+                        break
+                n_components += 1
+    return component
+
+def biconnectivity(n, sources, targets):
+    """
+    Finds the bridges and the articulation points of an undirected multigraph.
+
+    Parameters:
+    - n (int): The number of vertices.
+    - sources, targets (sequence of int): The endpoints of every edge. Direction is ignored.
+
+    Returns:
+    - tuple: (bridges, articulation_points), the positions in 'sources' of the bridges and the sorted list of the articulation vertices.
+
+    Detailed Explanation:
+    A bridge is an edge whose removal disconnects its endpoints; an articulation point is a vertex whose removal disconnects two other vertices. Both come out of one depth-first search with low-links (Hopcroft-Tarjan): a tree edge u - v is a bridge if low[v] > disc[u], and a non-root u is an articulation point if low[v] >= disc[u] for one of its children v (the root if it has two children or more). Arcs remember the edge they come from, and only the very edge leading to the parent is skipped, so a parallel edge correctly counts as a second way back. Like tarjan_scc, the search runs on an explicit stack in O(V + E).
+    """
+    import numpy as np
+    m = len(sources)
+    sources = np.asarray(sources, dtype = np.int64)
+    targets = np.asarray(targets, dtype = np.int64)
+    arc_from = np.concatenate((sources, targets))
+    order = np.argsort(arc_from, kind = 'stable')
+    arc_to = np.concatenate((targets, sources))[order].tolist()
+    arc_edge = np.concatenate((np.arange(m), np.arange(m)))[order].tolist()
+    offsets = np.searchsorted(arc_from[order], np.arange(n + 1)).tolist()
+
+    disc = [-1] * n
+    low = [0] * n
+    is_articulation = [False] * n
+    bridges = []
+    counter = 0
+    for root in range(n):
+        if disc[root] != -1:
+            continue
+        disc[root] = low[root] = counter
+        counter += 1
+        root_children = 0
+        frames = [root]
+        parent_edge = [-1]
+        cursor = [offsets[root]]
+        while frames:
+            v = frames[-1]
+            pos = cursor[-1]
+            if pos < offsets[v + 1]:
+                cursor[-1] = pos + 1
+                e = arc_edge[pos]
+                if e == parent_edge[-1]:
+                    continue
+                w = arc_to[pos]
+                if disc[w] == -1:
+                    disc[w] = low[w] = counter
+                    counter += 1
+                    frames.append(w)
+                    parent_edge.append(e)
+                    cursor.append(offsets[w])
+                elif disc[w] < low[v]:
+                    low[v] = disc[w]
+                continue
+            frames.pop()
+            e = parent_edge.pop()
+            cursor.pop()
+            if not frames:
+                continue
+            u = frames[-1]
+            if low[v] < low[u]:
+                low[u] = low[v]
+            if low[v] > disc[u]:
+                bridges.append(e)
+            if u == root:
+                root_children += 1
+            elif low[v] >= disc[u]:
+                is_articulation[u] = True
+        if root_children > 1:
+            is_articulation[root] = True
+    return sorted(bridges), [v for v in range(n) if is_articulation[v]]
@@ -0,0 +1,261 @@
+import math
+import pickle
+from array import array
+from heapq import heappush, heappop
+
+FORMAT_VERSION = 3
+
+def _pack(adjacency):
+    # list of {neighbor: weight} -> CSR arrays
+    offsets = array('i', [0])
+    targets = array('i')
+    weights = array('d')
+    for arcs in adjacency:
+        targets.extend(arcs.keys())
+        weights.extend(arcs.values())
+        offsets.append(len(targets))
+    return offsets, targets, weights
+
+class ContractionHierarchy:
+    """
+    Represents a contraction hierarchies (CH) index for fast shortest-path queries.
+
+    Attributes:
+    - vertices (list): The vertices, in id order (the order of the CSRGraph the index was built from).
+    - rank (array('i')): The contraction order of every vertex. Higher ranks are more "important".
+    - up (tuple): CSR arrays (offsets, targets, weights) of the arcs u -> x with rank[x] > rank[u], shortcuts included.
+    - down (tuple): CSR arrays of the reversed arcs x <- u with rank[u] > rank[x], used by the backward search.
+    - middle (dict): A dictionary mapping a shortcut (u, x) to the vertex it bypasses.
+    - last_settled (int): The number of vertices settled by the last query, both directions together.
+    - source (str or None): The CSRGraph.digest of the snapshot and weight column the index was built from.
+
+    Detailed Explanation:
+    Preprocessing contracts the vertices one at a time, least important first. Contracting v removes it from the remaining graph; for each pair of neighbors u -> v -> x whose only shortest connection goes through v (checked with a local "witness" Dijkstra search), a shortcut u -> x of the same length is added. Importance is the edge difference (shortcuts added minus arcs removed) plus the number of already contracted neighbors, re-evaluated lazily when a vertex reaches the top of the heap.
+
+    Every shortest path then exists as an "up-down" path: ranks increase, then decrease. A query runs Dijkstra forward from the source on upward arcs and backward from the target on upward arcs of the reversed graph, and the two searches meet at the highest vertex of the path. Both searches stay in the small upper part of the hierarchy, which is why they settle far fewer vertices than a plain Dijkstra. Shortcuts are expanded back into original arcs through 'middle'.
+
+    Practical Usages:
+    Route planners on road and transit networks, where the network changes rarely and queries must be answered in well under a millisecond.
+    """
+    def __init__(self, vertices, rank, up, down, middle, source = None):
+        self.vertices = vertices
+        self.vertex_indices = {v: i for i, v in enumerate(vertices)}
+        self.rank = rank
+        self.up = up
+        self.down = down
+        self.middle = middle
+        self.last_settled = 0
+        self.source = source
+
+    @classmethod
+    def build(cls, csr, weight = None, settle_limit = 64):
+        """
+        Builds the index from a CSR snapshot.
+
+        Parameters:
+        - csr (CSRGraph): The snapshot.
+        - weight (str, optional): The weight column. Defaults to None, which counts hops.
+        - settle_limit (int, optional): Maximum vertices settled by one witness search. A smaller limit preprocesses faster but may add unnecessary (still correct) shortcuts.
+
+        Returns:
+        - ContractionHierarchy: The index.
+
+        Raises:
+        - ValueError: If a weight is negative.
+
+        Example:
+            ch = ContractionHierarchy.build(subway_map.to_csr(), weight = 'time')
+        """
+        n = csr.num_vertices()
+        w = csr.weights[weight] if weight is not None else None
+        out_arcs = [{} for _ in range(n)]
+        in_arcs = [{} for _ in range(n)]
+        for u in range(n):
+            for pos in range(csr.offsets[u], csr.offsets[u + 1]):
+                x = csr.targets[pos]
+                c = w[pos] if w is not None else 1
+                if c < 0:
+                    raise ValueError(f'negative weight on arc {u} -> {x}')
+                if x != u and c < out_arcs[u].get(x, math.inf):
+                    out_arcs[u][x] = c
+                    in_arcs[x][u] = c
+
+        middle = {}
+        deleted_neighbors = [0] * n
+
+        def witness_distances(u, v, limit):
+            dist = {u: 0}
+            heap = [(0, u)]
+            settled = 0
+            while heap:
+                d, a = heappop(heap)
+                if d > dist[a]:
+                    continue
+                if d > limit or settled >= settle_limit:
+                    break
+                settled += 1
+                for b, c in out_arcs[a].items():
+                    if b == v:
+                        continue
+                    nd = d + c
+                    if nd < dist.get(b, math.inf):
+                        dist[b] = nd
+                        heappush(heap, (nd, b))
+            return dist
+
+        def shortcuts(v):
+            res = []
+            if not out_arcs[v]:
+                return res
+            max_out = max(out_arcs[v].values())
+            for u, c_uv in in_arcs[v].items():
+                dist = witness_distances(u, v, c_uv + max_out)
+                for x, c_vx in out_arcs[v].items():
+                    if x != u and dist.get(x, math.inf) > c_uv + c_vx:
+                        res.append((u, x, c_uv + c_vx))
+            return res
+
+        def priority(v):
+            return len(shortcuts(v)) - len(in_arcs[v]) - len(out_arcs[v]) + deleted_neighbors[v]
+
+        heap = [(priority(v), v) for v in range(n)]
+        heap.sort()
+        rank = array('i', [0]) * n
+        up_arcs = [None] * n
+        down_arcs = [None] * n
+        contracted = 0
+        while heap:
+            p, v = heappop(heap)
+            current = priority(v)
+            if heap and current > heap[0][0]:
+                heappush(heap, (current, v))
+                continue
+
+            for u, x, c in shortcuts(v):
+                if c < out_arcs[u].get(x, math.inf):
+                    out_arcs[u][x] = c
+                    in_arcs[x][u] = c
+                    middle[(u, x)] = v
+
+            rank[v] = contracted
+            contracted += 1
+            up_arcs[v] = out_arcs[v]
+            down_arcs[v] = in_arcs[v]
+            for x in out_arcs[v]:
+                del in_arcs[x][v]
+                deleted_neighbors[x] += 1
+            for u in in_arcs[v]:
+                del out_arcs[u][v]
+                deleted_neighbors[u] += 1
+            out_arcs[v] = {}
+            in_arcs[v] = {}
+
+        return cls(csr.vertices, rank, _pack(up_arcs), _pack(down_arcs), middle, csr.digest(weight))
+
+    def num_shortcuts(self):
+        """
+        Returns the number of shortcut arcs in the index.
+        """
+        return len(self.middle)
+
+    def _unpack(self, u, x, path):
+        # appends the original vertices after u on the arc u -> x
+        v = self.middle.get((u, x))
+        if v is None:
+            path.append(x)
+        else:
+            self._unpack(u, v, path)
+            self._unpack(v, x, path)
+
+    def query(self, src, dst):
+        """
+        Computes a shortest path with a bidirectional upward search.
+
+        Parameters:
+        - src (Vertex): The source vertex.
+        - dst (Vertex): The destination vertex.
+
+        Returns:
+        - tuple: (cost, path) with path a list of Vertex. (inf, []) if 'dst' is unreachable.
+
+        Example:
+            cost, path = ch.query(seoul, gangnam)
+        """
+        s, t = self.vertex_indices[src], self.vertex_indices[dst]
+        searches = [(self.up, {s: 0}, {s: -1}, [(0, s)]), (self.down, {t: 0}, {t: -1}, [(0, t)])]
+        best, meet = math.inf, -1
+        settled = 0
+        while searches[0][3] or searches[1][3]:
+            forward = searches[0][3] and (not searches[1][3] or searches[0][3][0][0] <= searches[1][3][0][0])
+            (offsets, targets, weights), dist, parent, heap = searches[0 if forward else 1]
+            other = searches[1 if forward else 0][1]
+            d, i = heappop(heap)
+            if d > dist[i]:
+                continue
+            if d >= best:
+                heap.clear()
+                continue
+            settled += 1
+            if i in other and d + other[i] < best:
+                best, meet = d + other[i], i
+            for pos in range(offsets[i], offsets[i + 1]):
+                j = targets[pos]
+                nd = d + weights[pos]
+                if nd < dist.get(j, math.inf):
+                    dist[j] = nd
+                    parent[j] = i
+                    heappush(heap, (nd, j))
+        self.last_settled = settled
+        if meet == -1:
+            return math.inf, []
+
+        forward_parent, backward_parent = searches[0][2], searches[1][2]
+        up_path = [meet]
+        while forward_parent[up_path[-1]] != -1:
+            up_path.append(forward_parent[up_path[-1]])
+        up_path.reverse()
+        down_path = [meet]
+        while backward_parent[down_path[-1]] != -1:
+            down_path.append(backward_parent[down_path[-1]])
+
+        path = [up_path[0]]
+        for a, b in zip(up_path, up_path[1:]):
+            self._unpack(a, b, path)
+        for a, b in zip(down_path, down_path[1:]):
+            self._unpack(a, b, path)
+        return best, [self.vertices[i] for i in path]
+
+    def save(self, path):
+        """
+        Saves the index with pickle. Vertices are not saved, only their ids and the source digest.
+        """
+        state = {'version': FORMAT_VERSION, 'source': self.source, 'rank': self.rank,
+                    'up': self.up, 'down': self.down,
+                    'middle': (array('i', (u for u, _ in self.middle)), array('i', (x for _, x in self.middle)),
+                                array('i', self.middle.values()))}
+        with open(path, 'wb') as f:
+            pickle.dump(state, f, protocol = pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, csr, path, weight = None):
+        """
+        Loads an index saved with save.
+
+        Parameters:
+        - csr (CSRGraph): The snapshot the index is expected to have been built from.
+        - path (str): The file written by save.
+        - weight (str, optional): The weight column it is expected to have been built on. Defaults to None, which counts hops.
+
+        Returns:
+        - ContractionHierarchy: The index.
+
+        Raises:
+        - ValueError: If the file has another format version, or was built from another snapshot (other vertices, vertex order, arcs or weights) or another weight column.
+        """
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+        source = csr.digest(weight)
+        if state.get('version') != FORMAT_VERSION or state['source'] != source:
+            raise ValueError(f'{path} was not built from this graph')
+        us, xs, vs = state['middle']
+        return cls(csr.vertices, state['rank'], state['up'], state['down'], dict(zip(zip(us, xs), vs)), source)
@@ -0,0 +1,198 @@
+import math
+
+from data_structure.csr import dijkstra
+
+class DynamicShortestPaths:
+    """
+    Represents shortest-path trees from a set of sources, kept up to date while arcs are inserted, deleted or reweighted.
+
+    Attributes:
+    - vertices (list): The vertex of every id.
+    - vertex_indices (dict): A dictionary mapping each vertex to its id.
+    - out_arcs (list of dict): For every id, a dictionary mapping each successor id to the arc weight.
+    - in_arcs (list of dict): For every id, a dictionary mapping each predecessor id to the arc weight.
+    - trees (dict): A dictionary mapping each cached source id to its (dist, parent) lists, math.inf and -1 for unreachable ids.
+    - last_touched (int): The number of (tree, vertex) pairs whose distance or parent was recomputed by the last update.
+
+    Detailed Explanation:
+    A tree is computed once with Dijkstra when its source is first asked for, and then repaired after every change of the graph with the algorithm of Ramalingam and Reps, which only looks at the vertices whose distance actually changes and at their arcs:
+
+    - When an arc gets shorter (or appears), the tree is unchanged unless the arc improves the distance of its head. Dijkstra then restarts from the head alone and only relaxes arcs that strictly improve a distance, so it stops at the border of the improved region.
+
+    - When an arc gets longer (or disappears), the tree is unchanged unless the arc was on a shortest path. The affected vertices are then those left without any shortest path: the head of the arc if none of its other in-arcs is tight (dist[x] + w == dist[v]), then every vertex all of whose tight in-arcs come from affected vertices. Counting the tight in-arcs that remain finds them in one pass over the shortest-path DAG below the arc. Each affected vertex gets the best distance through its unaffected predecessors, and a Dijkstra restricted to the affected vertices settles them. Vertices with an alternative shortest path keep their distance and only get a new parent.
+
+    Both updates cost a few operations per affected vertex and arc instead of O(E log V) per tree, which is what makes simulating closures interactive. A vertex is only counted out of the DAG when all its tight predecessors are, which requires positive weights: a zero-weight cycle could keep an unreachable vertex alive.
+
+    Parallel arcs are folded into one arc of the smallest weight; set_arc takes that weight.
+
+    Practical Usages:
+    Simulating line closures and reopenings on a subway map while routes from the stations of interest stay available.
+    """
+    def __init__(self, vertices, arcs):
+        """
+        Initializes the structure without any tree.
+
+        Parameters:
+        - vertices (list): The vertices, whose positions become their ids.
+        - arcs (iterable): (u, v, weight) tuples of ids. Parallel arcs keep the smallest weight.
+
+        Raises:
+        - ValueError: If a weight is not positive.
+
+        Example:
+            paths = DynamicShortestPaths.from_csr(subway_map.to_csr(['time']), 'time')
+        """
+        self.vertices = list(vertices)
+        self.vertex_indices = {v: i for i, v in enumerate(self.vertices)}
+        n = len(self.vertices)
+        self.out_arcs = [{} for _ in range(n)]
+        self.in_arcs = [{} for _ in range(n)]
+        for u, v, w in arcs:
+            _check_weight(w)
+            if w < self.out_arcs[u].get(v, math.inf):
+                self.out_arcs[u][v] = self.in_arcs[v][u] = w
+        self._arc_items = [arcs.items() for arcs in self.out_arcs] # live views, as dijkstra reads them
+        self.trees = {}
+        self.last_touched = 0
+
+    @classmethod
+    def from_csr(cls, csr, weight):
+        """
+        Builds the structure over the arcs of a CSRGraph snapshot.
+
+        Parameters:
+        - csr (CSRGraph): The snapshot.
+        - weight (str): The weight column.
+        """
+        offsets, targets, w = csr.offsets, csr.targets, csr.weights[weight]
+        return cls(csr.vertices, ((u, targets[pos], w[pos]) for u in range(len(csr.vertices))
+                                    for pos in range(offsets[u], offsets[u + 1])))
+
+    def tree(self, source):
+        """
+        Returns the shortest-path tree of a source id, computing and caching it on first use.
+
+        Returns:
+        - tuple: (dist, parent) lists indexed by id. They are updated in place by later changes.
+        """
+        if source not in self.trees:
+            n = len(self.vertices)
+            dist, parent = [math.inf] * n, [-1] * n
+            dist[source] = 0
+            self._dijkstra(dist, parent, [(0, source)])
+            self.trees[source] = dist, parent
+        return self.trees[source]
+
+    def distance(self, source, target):
+        """
+        Returns the length of a shortest path between two ids, math.inf if there is none.
+        """
+        return self.tree(source)[0][target]
+
+    def path(self, source, target):
+        """
+        Returns a shortest path between two ids as a list of ids, [] if there is none.
+        """
+        dist, parent = self.tree(source)
+        if dist[target] == math.inf:
+            return []
+        path = [target]
+        while path[-1] != source:
+            path.append(parent[path[-1]])
+        path.reverse()
+        return path
+
+    def set_arc(self, u, v, weight):
+        """
+        Changes the weight of the arc u -> v and repairs every cached tree.
+
+        Parameters:
+        - u, v (int): The ids of the tail and the head.
+        - weight (float or None): The new weight, None to delete the arc.
+
+        Raises:
+        - ValueError: If the weight is not positive.
+
+        Example:
+            paths.set_arc(u, v, None)     # closure
+            paths.set_arc(u, v, 2.0)      # reopening
+        """
+        old = self.out_arcs[u].get(v)
+        if weight is None:
+            if old is None:
+                return
+            del self.out_arcs[u][v], self.in_arcs[v][u]
+        else:
+            _check_weight(weight)
+            self.out_arcs[u][v] = self.in_arcs[v][u] = weight
+
+        self.last_touched = 0
+        for dist, parent in self.trees.values():
+            if old is None or (weight is not None and weight < old):
+                self._decrease(dist, parent, u, v, weight)
+            elif weight is None or weight > old:
+                self._increase(dist, parent, u, v, old)
+
+    def _dijkstra(self, dist, parent, heap, region = None):
+        # settles the heap entries, relaxing only into 'region' if given
+        self.last_touched += dijkstra(self._arc_items, dist, parent, heap, region = region)
+
+    def _decrease(self, dist, parent, u, v, weight):
+        nd = dist[u] + weight
+        if nd < dist[v]:
+            dist[v] = nd
+            parent[v] = u
+            self._dijkstra(dist, parent, [(nd, v)])
+
+    def _tight_parent(self, dist, z, excluded):
+        # a predecessor of z on a shortest path, outside 'excluded', or -1
+        for x, w in self.in_arcs[z].items():
+            if x not in excluded and dist[x] + w == dist[z]:
+                return x
+        return -1
+
+    def _increase(self, dist, parent, u, v, old):
+        if dist[v] == math.inf or dist[u] + old != dist[v]:
+            return # the arc was on no shortest path
+
+        # phase 1: the vertices left without a shortest path
+        in_arcs, out_arcs = self.in_arcs, self.out_arcs
+        remaining = {v: sum(1 for x, w in in_arcs[v].items() if dist[x] + w == dist[v])}
+        affected = set()
+        work = [v] if remaining[v] == 0 else []
+        while work:
+            y = work.pop()
+            affected.add(y)
+            for z, w in out_arcs[y].items():
+                if dist[y] + w != dist[z]:
+                    continue
+                if z not in remaining:
+                    remaining[z] = sum(1 for x, wx in in_arcs[z].items() if dist[x] + wx == dist[z])
+                remaining[z] -= 1
+                if remaining[z] == 0:
+                    work.append(z)
+
+        # the vertices that keep their distance may have lost the parent they had
+        for z in remaining:
+            if z not in affected and (parent[z] in affected or (z == v and parent[z] == u)):
+                parent[z] = self._tight_parent(dist, z, affected)
+                self.last_touched += 1
+
+        # phase 2: settle the affected vertices from their unaffected predecessors
+        for y in affected:
+            dist[y] = math.inf
+            parent[y] = -1
+        heap = []
+        for y in affected:
+            for x, w in in_arcs[y].items():
+                if x not in affected and dist[x] + w < dist[y]:
+                    dist[y] = dist[x] + w
+                    parent[y] = x
+            if dist[y] < math.inf:
+                heap.append((dist[y], y))
+        heap.sort()
+        self._dijkstra(dist, parent, heap, region = affected)
+
+def _check_weight(w):
+    if not w > 0:
+        raise ValueError(f'weights must be positive, got {w!r}')
@@ -1,36 +1,106 @@
 import sys 
 import os 
+import json
+from collections import deque 
+from collections.abc import Sequence
 
-cur_path = os.path.abspath(__file__)
+cur_path = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(f'{cur_path}/../data_structure')
 sys.path.append(f'{cur_path}/..')
 
 from data_structure.graph import AdjList, AdjMatrix, Vertex, Edge
+from data_structure.interning import VertexInterner
+from data_structure.csr import CSRGraph
+from data_structure.union_find import UnionFind
+from ADT.connectivity import biconnectivity, tarjan_scc
+from ADT.graph_file import DIRECTED, GraphFile, save_graph
+from ADT.layout import force_layout
+from ADT.reachability import multi_source_bfs
+from ADT.render import draw_graph, select_labels
 from ADT.queue import Queue 
 from ADT.stack import Stack 
     
 
+def _remove_identical(lst, elem):
+    # list.remove compares with __eq__, which treats parallel edges as equal
+    for i, x in enumerate(lst):
+        if x is elem:
+            del lst[i]
+            return 
+
+# the attributes holding the state of the backends, built on first use by a graph opened with Graph.load
+_BACKEND_ATTRIBUTES = ('V', 'E', 'ids', 'out_edges', 'in_edges', 'adj_list', 'adj_matrix')
+
+def _sorted_by_datum(vertices, reverse = False):
+    try:
+        return sorted(vertices, key = lambda x:x.datum, reverse = reverse)
+    except TypeError:
+        # data such as the attribute dict of a Station has no ordering
+        return vertices 
+
+class GraphView(Sequence):
+    """
+    Represents a read-only sequence of the vertices or edges of a graph, as of one version of the graph.
+
+    Detailed Explanation:
+    Graph.get_vertices and Graph.get_edges build their sequence once per version of the graph and then hand out the same view, so repeated calls between two changes allocate nothing. The view is a snapshot: it is not affected by later changes, which give the next call a new view. It compares equal to a list or tuple with the same items.
+    """
+    __slots__ = ('_items',)
+
+    def __init__(self, items):
+        self._items = items
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, i):
+        return self._items[i]
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __contains__(self, x):
+        return x in self._items
+
+    def __eq__(self, other):
+        if isinstance(other, GraphView):
+            other = other._items
+        if isinstance(other, (list, tuple)):
+            return list(self._items) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f'GraphView({self._items!r})'
+
 class Graph:
     """
     Represents a graph data structure.
 
     Attributes:
-    - backend (str): The backend representation ('VE'). Should be one of 'VE', 'adjacent_list', 'adjacent_matrix'. 
+    - backend (str): The backend representation ('indexed'). Should be one of 'indexed', 'VE', 'adjacent_list', 'adjacent_matrix'. 
 
     Detailed Explanation:
     The Graph class represents a graph using a vertex list and an edge list ('VE' backend). This allows for flexibility in representing complex graphs, including cycles and multiple connections.
 
+    The default 'indexed' backend additionally keeps, for every vertex, the list of its outgoing and incoming edges (`out_edges`, `in_edges`). The index is maintained incrementally by add_vertex/remove_vertex/add_edge/remove_edge, so get_neighbors costs O(degree) instead of a scan over every edge. The vertices are interned (`ids`, a VertexInterner) and the two edge lists are indexed by vertex id, so an operation hashes each Vertex it is given once.
+
+    Every change made through the Graph methods increments `version`. Results that only depend on the graph, such as the views returned by get_vertices and get_edges, are memoized for one version and rebuilt on the first call after a change.
+
     Practical Usages:
     Graphs are fundamental in computer science and are used in networking, social networks, transportation systems, and more.
     """
-    def __init__(self, V, E, backend = 'VE'):
+    def __init__(self, V, E, backend = 'indexed', weight_keys = None, validate = True):
         """
         Initializes a new Graph instance.
 
         Parameters:
         - V (list): A list of Vertex instances.
         - E (list): A list of Edge instances.
-        - backend (str, optional): The backend representation. Defaults to 'VE'.
+        - backend (str, optional): The backend representation. Defaults to 'indexed'.
+        - weight_keys (list of str, optional): The edge attributes the 'adjacent_list' and 'adjacent_matrix' backends store next to the neighbors. For 'adjacent_list', defaults to the keys of Edge.data present on every edge, or to those of the first edge added if E is empty. 'adjacent_matrix' keeps a dense float32 matrix per key, so it stores none unless they are named. The other backends keep the edges themselves and ignore it.
+        - validate (bool, optional): Whether to check the vertices and the endpoints of the edges. Pass False for trusted data. Defaults to True.
 
         Raises:
         - AssertionError: If V contains non-Vertex instances or E contains non-Edge instances.
@@ -63,25 +133,298 @@ class Graph:
 
             # The graph now contains 7 vertices and 8 edges, with cycles.
         """
-        for v in V:
-            assert isinstance(v, Vertex) 
-        for e in E:
-            assert isinstance(e, Edge)
-            assert e.from_vertex in V 
-            assert e.to_vertex in V 
+        if validate:
+            for v in V:
+                assert isinstance(v, Vertex) 
+            # a hashed set, since a membership test on the list V per edge would make this O(V * E)
+            vertex_set = set(V)
+            for e in E:
+                assert isinstance(e, Edge)
+                assert e.from_vertex in vertex_set 
+                assert e.to_vertex in vertex_set 
 
         self.V = V 
         self.E = E
         self.backend = backend  
 
-        if self.backend == 'VE':
+        if self.backend == 'indexed':
+            self.ids = VertexInterner(V)
+            self.out_edges = [[] for _ in range(self.ids.capacity())]
+            self.in_edges = [[] for _ in range(self.ids.capacity())]
+            ids = self.ids.index
+            for e in E:
+                self.out_edges[ids[e.from_vertex]].append(e)
+                self.in_edges[ids[e.to_vertex]].append(e)
+        elif self.backend == 'VE':
             pass 
         elif self.backend == 'adjacent_list':
-            self.adj_list = AdjList(V, E)
-        elif self.backend == 'adjacnet_matrix':
-            self.adj_matrix = AdjMatrix(V, E)
+            self.adj_list = AdjList(V, E, weight_keys = weight_keys)
+        elif self.backend == 'adjacent_matrix':
+            self.adj_matrix = AdjMatrix(V, E, weight_keys = weight_keys)
+        else:
+            raise ValueError('Invalid Backend')
+        # cached results of the connectivity analyses, see _edge_added and _invalidate_analysis
+        self._analysis = {}
+        # incremented by every change, see _memoized
+        self.version = 0
+        self._views = {}
+
+    @classmethod
+    def from_arrays(cls, sources, targets, vertices = None, backend = 'indexed', is_directed = True, validate = True, **weights):
+        """
+        Builds a graph from arrays of integer endpoints.
+
+        Parameters:
+        - sources, targets (numpy.ndarray or sequence of int): The endpoints of every edge, as positions in 'vertices'.
+        - vertices (list of Vertex, optional): The vertices. Defaults to Vertex(i, i) for i in range(max endpoint + 1).
+        - backend (str, optional): The backend representation. Defaults to 'indexed'.
+        - is_directed (bool, optional): Whether all the edges are directed. Defaults to True.
+        - validate (bool, optional): Whether to check the shapes, the integer type and the range of the endpoints. Pass False for trusted data. Defaults to True.
+        - **weights (numpy.ndarray or sequence): Edge attributes, one array parallel to 'sources' per attribute.
+
+        Returns:
+        - Graph: The graph. Its edges carry the attributes given in 'weights'.
+
+        Raises:
+        - ValueError: If 'validate' is set and the arrays have different lengths, are not integer arrays, or hold an endpoint outside 'vertices'.
+
+        Detailed Explanation:
+        Validation is a handful of vectorized checks (minimum, maximum, dtype) instead of a membership test per edge. The backend is then built directly from the integer endpoints, see _from_ids: Graph(V, E) would hash two Vertex objects per edge, which dominates the construction of large graphs.
+
+        Example:
+            sources = np.random.randint(0, 10**5, 10**6)
+            targets = np.random.randint(0, 10**5, 10**6)
+            g = Graph.from_arrays(sources, targets, backend = 'adjacent_list', is_directed = False, time = np.ones(10**6))
+        """
+        import numpy as np
+        sources, targets = np.asarray(sources), np.asarray(targets)
+        weights = {k: np.asarray(w) for k, w in weights.items()}
+        if validate:
+            if sources.ndim != 1 or sources.shape != targets.shape:
+                raise ValueError('sources and targets must be 1-dimensional arrays of the same length')
+            if len(sources) and not (np.issubdtype(sources.dtype, np.integer) and np.issubdtype(targets.dtype, np.integer)):
+                raise ValueError('endpoints must be integers')
+            for k, w in weights.items():
+                if w.shape != sources.shape:
+                    raise ValueError(f'{k} must have one value per edge')
+        if vertices is None:
+            n = int(max(sources.max(), targets.max())) + 1 if len(sources) else 0
+            vertices = [Vertex(i, i) for i in range(n)]
+        elif validate:
+            for v in vertices:
+                assert isinstance(v, Vertex)
+        if validate and len(sources):
+            if min(sources.min(), targets.min()) < 0 or max(sources.max(), targets.max()) >= len(vertices):
+                raise ValueError(f'endpoints must be in [0, {len(vertices)})')
+        return cls._from_ids(list(vertices), sources, targets, is_directed, backend, weights)
+
+    @classmethod
+    def from_edge_list(cls, edges, vertices = None, backend = 'indexed', is_directed = True, weight_keys = None):
+        """
+        Builds a graph from a list of (u, v) or (u, v, data) tuples of vertex ids.
+
+        Parameters:
+        - edges (iterable of tuple): The edges. 'u' and 'v' are node ids and 'data', if present, a dictionary of edge attributes.
+        - vertices (list of Vertex, optional): The vertices, matched to the ids by node_id. Defaults to Vertex(id, id) for every id, in order of first appearance.
+        - backend (str, optional): The backend representation. Defaults to 'indexed'.
+        - is_directed (bool, optional): Whether all the edges are directed. Defaults to True.
+        - weight_keys (list of str, optional): See __init__.
+
+        Returns:
+        - Graph: The graph.
+
+        Raises:
+        - ValueError: If an id is not the node_id of one of 'vertices'.
+
+        Detailed Explanation:
+        Each id is resolved to a position with one lookup in a dictionary of ids, which also validates it, and the backend is built from the positions in one pass, see _from_ids.
+
+        Example:
+            g = Graph.from_edge_list([('A', 'B', {'time': 3}), ('B', 'C', {'time': 2})], is_directed = False)
+        """
+        create = vertices is None
+        if create:
+            vertices = []
+            positions = {}
         else:
+            vertices = list(vertices)
+            positions = {v.node_id: i for i, v in enumerate(vertices)}
+
+        def position(node_id):
+            i = positions.get(node_id)
+            if i is None:
+                if not create:
+                    raise ValueError(f'{node_id} is not a vertex of the graph')
+                i = positions[node_id] = len(vertices)
+                vertices.append(Vertex(node_id, node_id))
+            return i
+
+        sources, targets, records = [], [], []
+        for edge in edges:
+            sources.append(position(edge[0]))
+            targets.append(position(edge[1]))
+            records.append(edge[2] if len(edge) > 2 else {})
+        if weight_keys is None:
+            weight_keys = [k for k in records[0] if all(k in r for r in records)] if records else []
+        columns = {k: [r[k] for r in records] for k in weight_keys}
+        return cls._from_ids(vertices, sources, targets, is_directed, backend, columns, records)
+
+    @classmethod
+    def from_json(cls, path, backend = 'indexed', weight_keys = None):
+        """
+        Builds a graph from a JSON file.
+
+        Parameters:
+        - path (str): The file.
+        - backend (str, optional): The backend representation. Defaults to 'indexed'.
+        - weight_keys (list of str, optional): See __init__.
+
+        Returns:
+        - Graph: The graph.
+
+        Detailed Explanation:
+        The file holds one object:
+            {"directed": false,
+             "vertices": [{"id": 0, "datum": "A"}, ...],
+             "edges": [{"from": 0, "to": 1, "time": 3}, ...]}
+        "directed" defaults to true and "vertices" to the ids found in the edges. The attributes of an edge other than "from" and "to" become its Edge.data, like the segments of resources/edges.json. It is read with one json.load and handed to from_edge_list.
+
+        Example:
+            g = Graph.from_json('graph.json', backend = 'adjacent_list')
+        """
+        with open(path, 'r', encoding = 'utf-8') as f:
+            doc = json.load(f)
+        vertices = None
+        if 'vertices' in doc:
+            vertices = [Vertex(v['id'], v.get('datum', v['id'])) for v in doc['vertices']]
+        edges = ((e.pop('from'), e.pop('to'), e) for e in doc['edges'])
+        return cls.from_edge_list(edges, vertices, backend = backend, is_directed = doc.get('directed', True),
+                                    weight_keys = weight_keys)
+
+    @classmethod
+    def _from_ids(cls, V, sources, targets, is_directed, backend, columns, records = None):
+        # builds the backend from integer endpoints (positions in V) without validation.
+        # columns: {key: values parallel to the endpoints}; records: the Edge.data of every edge, made from columns if None
+        graph = cls.__new__(cls)
+        Graph.__init__(graph, V, [], backend = backend, weight_keys = list(columns), validate = False)
+        if backend == 'adjacent_list':
+            graph.adj_list = AdjList.from_arrays(V, sources, targets, is_directed, columns)
+            return graph
+        if backend == 'adjacent_matrix':
+            graph.adj_matrix = AdjMatrix.from_arrays(V, sources, targets, is_directed, columns)
+            return graph
+
+        sources = sources.tolist() if hasattr(sources, 'tolist') else sources
+        targets = targets.tolist() if hasattr(targets, 'tolist') else targets
+        if records is None:
+            keys = list(columns)
+            values = [w.tolist() if hasattr(w, 'tolist') else w for w in columns.values()]
+            records = [dict(zip(keys, row)) for row in zip(*values)] if keys else [{}] * len(sources)
+        E = [Edge(V[a], V[b], is_directed, **data) for a, b, data in zip(sources, targets, records)]
+        if backend == 'VE':
+            graph.E = E
+            return graph
+
+        # indexed: the positions in V are the vertex ids, bucket the edges by them without hashing any vertex
+        for e, a, b in zip(E, sources, targets):
+            graph.out_edges[a].append(e)
+            graph.in_edges[b].append(e)
+        graph.E = E
+        return graph
+
+    def save(self, path):
+        """
+        Writes the graph to a binary file that Graph.load maps back.
+
+        Parameters:
+        - path (str): The file.
+
+        Detailed Explanation:
+        The file holds a versioned header, the vertex table (node_id and datum of every vertex), the edges in CSR order, one column per edge attribute and a string pool; see ADT.graph_file.save_graph for the layout. Node ids, data and attributes that are not numbers or strings are stored as JSON. The 'indexed' and 'VE' backends save their edges as they are; the adjacency backends save their arcs, as directed edges carrying the stored weights.
+
+        Example:
+            SubwayMap().save('subway.graph')
+            g = Graph.load('subway.graph')
+        """
+        vertices = list(self.get_vertices())
+        index = {v: i for i, v in enumerate(vertices)}
+        if self.backend in ('adjacent_list', 'adjacent_matrix'):
+            # the stored weights are read as they are: an AdjList may keep strings or lists, which a CSR weight column cannot hold
+            sources, targets, records = [], [], []
+            for v in vertices:
+                if self.backend == 'adjacent_list':
+                    # one record per arc, from the AdjList's own rows: parallel arcs never shift the weights of other neighbors
+                    arcs = list(self.adj_list.iter_arcs(v))
+                else:
+                    # a matrix holds one arc per neighbor, in the order of its weighted neighbors
+                    weight_keys = self.adj_matrix.weight_keys
+                    columns = [[w for _, w in self.get_weighted_neighbors(v, k)] for k in weight_keys]
+                    arcs = [(n, {k: column[j] for k, column in zip(weight_keys, columns)}) for j, n in enumerate(self.get_neighbors(v))]
+                sources.extend([index[v]] * len(arcs))
+                targets.extend(index[n] for n, _ in arcs)
+                records.extend(data for _, data in arcs)
+            save_graph(path, vertices, sources, targets, [True] * len(sources), records)
+            return
+        edges = self.get_edges()
+        save_graph(path, vertices, [index[e.from_vertex] for e in edges], [index[e.to_vertex] for e in edges],
+                    [e.is_directed for e in edges], [e.data for e in edges])
+
+    @classmethod
+    def load(cls, path, mmap = True, backend = 'indexed', vertex_factory = Vertex):
+        """
+        Opens a graph written by Graph.save.
+
+        Parameters:
+        - path (str): The file.
+        - mmap (bool, optional): Map the file in memory instead of reading it whole. Defaults to True.
+        - backend (str, optional): The backend representation. Defaults to 'indexed'.
+        - vertex_factory (callable, optional): Makes a vertex from its node_id and datum. Defaults to Vertex, which hashes its datum: vertices whose datum is a dictionary, such as stations, need their own class.
+
+        Returns:
+        - Graph: The graph.
+
+        Raises:
+        - ValueError: If the file is not a graph file of the current format version, or the backend is invalid.
+
+        Detailed Explanation:
+        Loading reads the header and wraps the sections of the mapped file in arrays without reading them (ADT.graph_file.GraphFile), so it takes the same time whatever the size of the graph. The backend is built from those arrays the first time the graph is used (see __getattr__), in one pass over the integer columns like from_arrays, and only the pages of the file it reads are loaded from disk.
+
+        Example:
+            g = Graph.load('subway.graph', backend = 'adjacent_list', vertex_factory = lambda name, data: Station(name, **data))
+        """
+        if backend not in ('indexed', 'VE', 'adjacent_list', 'adjacent_matrix'):
             raise ValueError('Invalid Backend')
+        graph = cls.__new__(cls)
+        graph.backend = backend
+        graph._analysis = {}
+        graph.version = 0
+        graph._views = {}
+        graph._file = GraphFile(path, use_mmap = mmap)
+        graph._vertex_factory = vertex_factory
+        return graph
+
+    def __getattr__(self, name):
+        # only called for missing attributes: the backend of a graph opened by load, built on first use
+        if name in _BACKEND_ATTRIBUTES and '_file' in self.__dict__:
+            self._materialize()
+            return getattr(self, name)
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def _materialize(self):
+        graph_file = self.__dict__.pop('_file')
+        V = graph_file.vertices(self.__dict__.pop('_vertex_factory'))
+        records = graph_file.records()
+        columns = graph_file.numeric_columns()
+        if graph_file.directed is None:
+            built = Graph._from_ids(V, graph_file.sources(), graph_file.targets, graph_file.directedness == DIRECTED,
+                                    self.backend, columns, records)
+        else:
+            E = [Edge(V[a], V[b], d, **data) for a, b, d, data in zip(graph_file.sources().tolist(),
+                    graph_file.targets.tolist(), graph_file.directed.astype(bool).tolist(), records)]
+            built = Graph(V, E, backend = self.backend, weight_keys = list(columns), validate = False)
+        for name in _BACKEND_ATTRIBUTES:
+            if name in built.__dict__:
+                setattr(self, name, built.__dict__[name])
 
     def add_vertex(self, v):
         """
@@ -129,15 +472,23 @@ class Graph:
                     H (isolated)
         """
         assert isinstance(v, Vertex)
-        if self.backend == 'VE':
+        if self.backend == 'indexed':
+            if v in self.ids.index:
+                raise ValueError(f'{v} is already in the graph')
+            i = self.ids.intern(v)
+            if i == len(self.out_edges):
+                self.out_edges.append([])
+                self.in_edges.append([])
+        elif self.backend == 'VE':
             if v not in self.V:
                 self.V.append(v)
             else:
                 raise ValueError(f'{v} is already in the graph')
         elif self.backend == 'adjacent_list':
             self.adj_list.add_vertex(v)
-        elif self.backend == 'adjacnet_matrix':
+        elif self.backend == 'adjacent_matrix':
             self.adj_matrix.add_vertex(v)
+        self._vertex_added(v)
     
     def remove_vertex(self, v):
         """
@@ -183,15 +534,29 @@ class Graph:
             'C' and its connecting edges are removed.
         """
         assert isinstance(v, Vertex)
-        if self.backend == 'VE':
+        if self.backend == 'indexed':
+            if v not in self.ids.index:
+                raise ValueError(f'{v} not in graph')
+            i = self.ids.release(v)
+            ids = self.ids.index
+            for e in self.out_edges[i]:
+                if e.to_vertex != v:
+                    _remove_identical(self.in_edges[ids[e.to_vertex]], e)
+            for e in self.in_edges[i]:
+                if e.from_vertex != v:
+                    _remove_identical(self.out_edges[ids[e.from_vertex]], e)
+            self.out_edges[i] = []
+            self.in_edges[i] = []
+        elif self.backend == 'VE':
             try:
                 self.V.remove(v)
             except ValueError as e:
                 raise ValueError(f'{v} not in graph')
         elif self.backend == 'adjacent_list':
             self.adj_list.remove_vertex(v)
-        elif self.backend == 'adjacnet_matrix':
+        elif self.backend == 'adjacent_matrix':
             self.adj_matrix.remove_vertex(v)
+        self._invalidate_analysis()
 
     def add_edge(self, e):
         """
@@ -238,15 +603,19 @@ class Graph:
                   F G H
         """
         assert isinstance(e, Edge)
-        assert e.from_vertex in self.get_vertices()
-        assert e.to_vertex in self.get_vertices()
+        assert self.has_vertex(e.from_vertex)
+        assert self.has_vertex(e.to_vertex)
         
-        if self.backend == 'VE':
+        if self.backend == 'indexed':
+            self.out_edges[self.ids.index[e.from_vertex]].append(e)
+            self.in_edges[self.ids.index[e.to_vertex]].append(e)
+        elif self.backend == 'VE':
             self.E.append(e) 
         elif self.backend == 'adjacent_list':
             self.adj_list.add_edge(e)
-        elif self.backend == 'adjacnet_matrix':
+        elif self.backend == 'adjacent_matrix':
             self.adj_matrix.add_edge(e)
+        self._edge_added(e)
 
     def remove_edge(self, e):
         """
@@ -292,54 +661,159 @@ class Graph:
                 F (disconnected from 'E', but may still be connected through other paths)
         """
         assert isinstance(e, Edge)
-        if e not in self.get_edges():
+        if not self.has_edge(e):
             raise ValueError(f'{e} not in graph')
-        assert e.from_vertex in self.get_vertices()
-        assert e.to_vertex in self.get_vertices()
-        if self.backend == 'VE':
+        assert self.has_vertex(e.from_vertex)
+        assert self.has_vertex(e.to_vertex)
+        if self.backend == 'indexed':
+            out_edges = self.out_edges[self.ids.index[e.from_vertex]]
+            for stored in out_edges:
+                if stored == e:
+                    break 
+            _remove_identical(out_edges, stored)
+            _remove_identical(self.in_edges[self.ids.index[e.to_vertex]], stored)
+        elif self.backend == 'VE':
             self.E.remove(e)
         elif self.backend == 'adjacent_list':
             self.adj_list.remove_edge(e)
-        elif self.backend == 'adjacnet_matrix':
+        elif self.backend == 'adjacent_matrix':
             self.adj_matrix.remove_edge(e)
+        self._invalidate_analysis()
 
     def get_vertices(self):
         """
-        Returns the list of vertices in the graph.
+        Returns the vertices in the graph.
 
         Returns:
-        - list: A list of Vertex instances.
+        - GraphView: A read-only sequence of Vertex instances, shared by the calls made until the graph changes.
 
         Example:
             vertices = g.get_vertices()
             print([str(v) for v in vertices])
             # Output: ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']
         """
-        if self.backend == 'VE':
-            return self.V 
+        return self._memoized('vertices', lambda: GraphView(list(self.iter_vertices())))
+
+    def iter_vertices(self):
+        """
+        Returns an iterator over the vertices, in the order of get_vertices, that builds no list. The graph must not change during the iteration.
+        """
+        if self.backend == 'indexed':
+            return iter(self.ids.index)
+        elif self.backend == 'VE':
+            return iter(self.V)
         elif self.backend == 'adjacent_list':
-            return self.adj_list.get_vertices()
-        elif self.backend == 'adjacnet_matrix':
-            return self.adj_matrix.get_vertices()
+            return iter(self.adj_list.ids.index)
+        elif self.backend == 'adjacent_matrix':
+            return iter(self.adj_matrix.ids.index)
          
     def get_edges(self):
         """
-        Returns the list of edges in the graph.
+        Returns the edges in the graph.
 
         Returns:
-        - list: A list of Edge instances.
+        - GraphView: A read-only sequence of Edge instances, shared by the calls made until the graph changes.
+
+        Detailed Explanation:
+        The 'adjacent_list' and 'adjacent_matrix' backends make new Edge objects from their neighbors and weights; the view keeps them, so they are only made again after a change.
 
         Example:
             edges = g.get_edges()
             print([(str(e.from_vertex), str(e.to_vertex)) for e in edges])
             # Output: [('A', 'B'), ('A', 'C'), ('B', 'D'), ('C', 'D'), ('D', 'E'), ('E', 'F'), ('F', 'G'), ('G', 'E'), ('H', 'E')]
         """
-        if self.backend == 'VE':
-            return self.E 
+        def build():
+            if self.backend == 'indexed':
+                out_edges = self.out_edges
+                return GraphView([e for i in self.ids.index.values() for e in out_edges[i]])
+            return GraphView(list(self.iter_edges()))
+        return self._memoized('edges', build)
+
+    def iter_edges(self):
+        """
+        Returns an iterator over the edges, in the order of get_edges, that builds no list. The graph must not change during the iteration.
+        """
+        if self.backend == 'indexed':
+            out_edges = self.out_edges
+            return (e for i in self.ids.index.values() for e in out_edges[i])
+        elif self.backend == 'VE':
+            return iter(self.E)
+        elif self.backend == 'adjacent_list':
+            return self.adj_list.iter_edges()
+        elif self.backend == 'adjacent_matrix':
+            return self.adj_matrix.iter_edges()
+
+    def _memoized(self, name, build):
+        # the result of build() for the current version of the graph
+        entry = self._views.get(name)
+        if entry is None or entry[0] != self.version:
+            entry = self._views[name] = (self.version, build())
+        return entry[1]
+
+    def _incidence(self):
+        # VE has no index: the neighbors of every vertex and the edges leading to them, built once per version
+        def build():
+            index = {}
+            for e in self.E:
+                neighbors, edges = index.setdefault(e.from_vertex, ([], []))
+                neighbors.append(e.to_vertex)
+                edges.append(e)
+                if not e.is_directed:
+                    neighbors, edges = index.setdefault(e.to_vertex, ([], []))
+                    neighbors.append(e.from_vertex)
+                    edges.append(e)
+            return index
+        return self._memoized('incidence', build)
+
+    def has_vertex(self, v):
+        """
+        Checks whether a vertex is in the graph.
+
+        Parameters:
+        - v (Vertex): The vertex to look up.
+
+        Returns:
+        - bool: True if the vertex is in the graph.
+
+        Detailed Explanation:
+        The 'indexed', 'adjacent_list' and 'adjacent_matrix' backends answer with a dictionary lookup. The 'VE' backend scans its vertex list.
+
+        Example:
+            g.has_vertex(vA)  # True
+        """
+        if self.backend == 'indexed':
+            return v in self.ids.index
+        elif self.backend == 'VE':
+            return v in self.V 
         elif self.backend == 'adjacent_list':
-            return self.adj_list.get_edges()
-        elif self.backend == 'adjacnet_matrix':
-            return self.adj_matrix.get_edges()
+            return v in self.adj_list.ids.index
+        elif self.backend == 'adjacent_matrix':
+            return v in self.adj_matrix.ids.index
+
+    def has_edge(self, e):
+        """
+        Checks whether an edge is in the graph.
+
+        Parameters:
+        - e (Edge): The edge to look up.
+
+        Returns:
+        - bool: True if an edge equal to 'e' is in the graph.
+
+        Detailed Explanation:
+        The 'indexed' backend only looks at the outgoing edges of 'e.from_vertex', so the check costs O(degree). The 'adjacent_list' and 'adjacent_matrix' backends answer in O(1), the 'VE' backend scans every edge.
+
+        Example:
+            g.has_edge(eAB)  # True
+        """
+        if self.backend == 'indexed':
+            i = self.ids.index.get(e.from_vertex)
+            return i is not None and any(stored == e for stored in self.out_edges[i])
+        elif self.backend == 'adjacent_list':
+            return self.adj_list.has_edge(e)
+        elif self.backend == 'adjacent_matrix':
+            return self.adj_matrix.has_edge(e)
+        return e in self.get_edges()
 
     def get_neighbors(self, v):
         """
@@ -367,28 +841,187 @@ class Graph:
             Neighbors of 'E' are 'D', 'F', 'G', and 'H'.
         """
         assert isinstance(v, Vertex)
-        if self.backend == 'VE':
-            res = []
-            
-            for e in self.get_edges():
-                if e.from_vertex == v:
-                    res.append(e.to_vertex)
+        if self.backend == 'indexed':
+            i = self.ids.index[v]
+            res = [e.to_vertex for e in self.out_edges[i]]
+            for e in self.in_edges[i]:
                 if not e.is_directed:
-                    if e.to_vertex == v:
-                        res.append(e.from_vertex)
-            
+                    res.append(e.from_vertex)
             return res 
+        elif self.backend == 'VE':
+            neighbors, _ = self._incidence().get(v, ((), ()))
+            return list(neighbors)
         elif self.backend == 'adjacent_list':
             return self.adj_list.get_neighbors(v)
-        elif self.backend == 'adjacnet_matrix':
+        elif self.backend == 'adjacent_matrix':
             return self.adj_matrix.get_neighbors(v)
 
-    def dfs(self, src):
+    def iter_neighbors(self, v):
+        """
+        Lazily yields the neighbors of get_neighbors, in the same order, without building the list. The graph must not change during the iteration.
+
+        Example:
+            if any(n.datum == 'F' for n in g.iter_neighbors(vE)):
+                ...
+        """
+        assert isinstance(v, Vertex)
+        if self.backend == 'indexed':
+            i = self.ids.index[v]
+            for e in self.out_edges[i]:
+                yield e.to_vertex
+            for e in self.in_edges[i]:
+                if not e.is_directed:
+                    yield e.from_vertex
+        elif self.backend == 'VE':
+            neighbors, _ = self._incidence().get(v, ((), ()))
+            yield from neighbors
+        elif self.backend == 'adjacent_list':
+            yield from self.adj_list.iter_neighbors(v)
+        elif self.backend == 'adjacent_matrix':
+            yield from self.adj_matrix.iter_neighbors(v)
+
+    def get_weighted_neighbors(self, v, key):
+        """
+        Returns the neighbors of a given vertex together with the weights of the edges leading to them.
+
+        Parameters:
+        - v (Vertex): The vertex for which to find neighbors.
+        - key (str): The edge attribute (key of Edge.data) to use as weight.
+
+        Returns:
+        - list: A list of (neighbor, weight) tuples, in the order of get_neighbors.
+
+        Raises:
+        - KeyError: If an edge of 'v' lacks 'key', or the 'adjacent_list'/'adjacent_matrix' backend does not store it.
+
+        Detailed Explanation:
+        The 'adjacent_list' and 'adjacent_matrix' backends keep the weights next to the neighbors and answer without touching any Edge. The 'indexed' and 'VE' backends read Edge.data of the edges they already visit for get_neighbors. Either way a weighted traversal gets each weight with its neighbor, without looking the edge up again.
+
+        Example:
+            for neighbor, time in g.get_weighted_neighbors(vE, 'time'):
+                ...
+        """
+        assert isinstance(v, Vertex)
+        if self.backend == 'indexed':
+            i = self.ids.index[v]
+            res = [(e.to_vertex, e.data[key]) for e in self.out_edges[i]]
+            for e in self.in_edges[i]:
+                if not e.is_directed:
+                    res.append((e.from_vertex, e.data[key]))
+            return res
+        elif self.backend == 'VE':
+            neighbors, edges = self._incidence().get(v, ((), ()))
+            return [(n, e.data[key]) for n, e in zip(neighbors, edges)]
+        elif self.backend == 'adjacent_list':
+            return self.adj_list.get_weighted_neighbors(v, key)
+        elif self.backend == 'adjacent_matrix':
+            return self.adj_matrix.get_weighted_neighbors(v, key)
+
+    def to_csr(self, weight_keys = None):
+        """
+        Freezes the graph into an immutable compressed sparse row snapshot.
+
+        Parameters:
+        - weight_keys (list of str, optional): The edge attributes to keep as weight columns. Defaults to the keys of Edge.data present on every edge with a real number as value.
+
+        Returns:
+        - CSRGraph: The snapshot. Later changes to the graph are not reflected in it.
+
+        Example:
+            csr = SubwayMap().to_csr()
+            cost, path = csr.shortest_path(src, dst, weight = 'time')
+        """
+        if self.backend == 'adjacent_list':
+            # AdjList.get_edges folds the two arcs of an undirected edge into one directed Edge, so read the neighbors
+            return CSRGraph.from_adj_list(self.adj_list, weight_keys = weight_keys)
+        return CSRGraph.from_graph(self, weight_keys = weight_keys)
+
+    def _neighbor_lookup(self):
+        # VE has no index: read the neighbor lists of _incidence without copying them
+        if self.backend != 'VE':
+            return self.get_neighbors
+        index = self._incidence()
+        return lambda v: index[v][0] if v in index else []
+
+    def iter_dfs(self, src, target = None, max_depth = None):
+        """
+        Lazily performs a depth-first search starting from the given vertex.
+
+        Parameters:
+        - src (Vertex): The starting vertex.
+        - target (Vertex, optional): Stop right after this vertex is visited.
+        - max_depth (int, optional): Do not expand vertices this many edges away from 'src'.
+
+        Yields:
+        - Vertex: The visited vertices, in the same order as dfs.
+
+        Detailed Explanation:
+        Discovered vertices are kept in a set, so each vertex is pushed at most once and each edge is looked at once per endpoint. The traversal is O(V + E) on every backend except 'adjacent_matrix', whose neighbor lookup scans a whole row. Nothing is materialized beyond the stack, so breaking out of the loop early costs only the work done so far.
+
+        Example:
+            for v in g.iter_dfs(vA, target = vE):
+                print(v)  # A, B, D, E
+        """
+        assert isinstance(src, Vertex) 
+        get_neighbors = self._neighbor_lookup()
+        s = Stack((src, 0))
+        discovered = {src}
+
+        while not s.is_empty():
+            cur, depth = s.pop()
+            yield cur 
+            if cur == target:
+                return 
+            if max_depth is not None and depth >= max_depth:
+                continue 
+            for n in _sorted_by_datum(get_neighbors(cur), reverse = True):
+                if n not in discovered:
+                    discovered.add(n)
+                    s.push((n, depth + 1))
+
+    def iter_bfs(self, src, target = None, max_depth = None):
+        """
+        Lazily performs a breadth-first search starting from the given vertex.
+
+        Parameters:
+        - src (Vertex): The starting vertex.
+        - target (Vertex, optional): Stop right after this vertex is visited.
+        - max_depth (int, optional): Do not expand vertices this many edges away from 'src'.
+
+        Yields:
+        - Vertex: The visited vertices, level by level.
+
+        Detailed Explanation:
+        Same bookkeeping as iter_dfs, with a deque as the FIFO frontier.
+
+        Example:
+            print([str(v) for v in g.iter_bfs(vA, max_depth = 1)])  # ['A', 'B', 'C']
+        """
+        assert isinstance(src, Vertex) 
+        get_neighbors = self._neighbor_lookup()
+        q = deque([(src, 0)])
+        discovered = {src}
+
+        while q:
+            cur, depth = q.popleft()
+            yield cur 
+            if cur == target:
+                return 
+            if max_depth is not None and depth >= max_depth:
+                continue 
+            for n in _sorted_by_datum(get_neighbors(cur)):
+                if n not in discovered:
+                    discovered.add(n)
+                    q.append((n, depth + 1))
+
+    def dfs(self, src, target = None, max_depth = None):
         """
         Performs a depth-first search starting from the given vertex.
 
         Parameters:
         - src (Vertex): The starting vertex.
+        - target (Vertex, optional): Stop right after this vertex is visited.
+        - max_depth (int, optional): Do not expand vertices this many edges away from 'src'.
 
         Returns:
         - list: A list of visited Vertex instances in the order they were visited.
@@ -422,34 +1055,16 @@ class Graph:
             - Backtrack to 'E', then 'D', then 'C', then 'A'.
             - Visit 'B' (remaining neighbor of 'A').
         """
-        assert isinstance(src, Vertex) 
+        return list(self.iter_dfs(src, target = target, max_depth = max_depth))
         
-        if self.backend == 'VE':
-            s = Stack(src)
-            visited = []
-
-            while not s.is_empty():
-                cur = s.pop()
-                visited.append(cur)
-                neighbors = self.get_neighbors(cur)
-                neighbors.sort(key = lambda x:x.datum, reverse = True)
-                for n in neighbors:
-                    if n not in visited and n not in s.elements():
-                        s.push(n)
-            
-            return visited 
-
-        elif self.backend == 'adjacent_list':
-            pass 
-        elif self.backend == 'adjacnet_matrix':
-            pass 
-        
-    def bfs(self, src):
+    def bfs(self, src, target = None, max_depth = None):
         """
         Performs a breadth-first search starting from the given vertex.
 
         Parameters:
         - src (Vertex): The starting vertex.
+        - target (Vertex, optional): Stop right after this vertex is visited.
+        - max_depth (int, optional): Do not expand vertices this many edges away from 'src'.
 
         Returns:
         - list: A list of visited Vertex instances in the order they were visited.
@@ -479,26 +1094,190 @@ class Graph:
             - Visit neighbors of 'D': 'E'.
             - Visit neighbors of 'E': 'F', 'G', 'H'.
         """
-        assert isinstance(src, Vertex) 
-        if self.backend == 'VE':
-            s = Queue(src)
-            visited = []
-
-            while not s.is_empty():
-                cur = s.dequeue()
-                visited.append(cur)
-                neighbors = self.get_neighbors(cur)
-                neighbors.sort(key = lambda x:x.datum, reverse = True)
-                for n in neighbors:
-                    if n not in visited and n not in s.elements():
-                        s.enqueue(n)
-            
-            return visited 
-        elif self.backend == 'adjacent_list':
-            pass 
-        elif self.backend == 'adjacnet_matrix':
-            pass 
+        return list(self.iter_bfs(src, target = target, max_depth = max_depth))
         
+    def multi_bfs(self, sources, max_depth = None, processes = None, batch_size = 1024):
+        """
+        Finds the vertices reachable from each of many sources, all searches advancing together.
+
+        Parameters:
+        - sources (iterable of Vertex): The starting vertices.
+        - max_depth (int, optional): Do not expand vertices this many edges away from their source, e.g. "reachable within N stops".
+        - processes (int, optional): Spread the sources over this many worker processes. Defaults to None, which runs in this process.
+        - batch_size (int, optional): Maximum number of sources advanced together by one search.
+
+        Returns:
+        - dict: A dictionary mapping each source to a dictionary {vertex: depth} of the vertices it reaches, level by level, the source itself at depth 0.
+
+        Detailed Explanation:
+        The graph is frozen into a CSR snapshot and searched by reachability.multi_source_bfs: a level-synchronous BFS where every vertex of the frontier carries a bitset of the sources that just reached it, so one pass over the arcs of a level advances up to batch_size searches (64 per machine word). With 'processes', batches of sources go to a process pool whose workers share the read-only snapshot. The visit order inside a level is by vertex id, not by datum as in bfs.
+
+        Example:
+            reachable = g.multi_bfs([vA, vE], max_depth = 2)
+            print(sorted(str(v) for v in reachable[vA]))  # ['A', 'B', 'C', 'D']
+        """
+        import numpy as np
+        sources = list(dict.fromkeys(sources))
+        for v in sources:
+            assert isinstance(v, Vertex)
+            assert self.has_vertex(v)
+        csr = self.to_csr(weight_keys = [])
+        ids = [csr.vertex_indices[v] for v in sources]
+        query, vertex, depth = multi_source_bfs(csr, ids, max_depth = max_depth, processes = processes,
+                                                batch_size = batch_size)
+        order = np.argsort(query, kind = 'stable')
+        vertices = [csr.vertices[i] for i in vertex[order].tolist()]
+        depth = depth[order].tolist()
+        bounds = np.searchsorted(query[order], np.arange(len(sources) + 1)).tolist()
+        return {v: dict(zip(vertices[a:b], depth[a:b])) for v, a, b in zip(sources, bounds, bounds[1:])}
+
+    def _invalidate_analysis(self):
+        # called by every change: the memoized views of the previous version become stale
+        self.version += 1
+        self._analysis = {}
+
+    def _vertex_added(self, v):
+        # a new vertex is a component of its own: grow the union-find instead of dropping it
+        components = self._analysis.get('components')
+        if components is not None and v in components[1]:
+            return # already in the graph, which AdjMatrix accepts: nothing changed
+        self._invalidate_analysis()
+        if components is not None:
+            vertices, index, union_find = components
+            vertices.append(v)
+            index[v] = union_find.add()
+            self._analysis['components'] = components
+
+    def _edge_added(self, e):
+        # an insertion only merges components: keep the union-find up to date, drop the other analyses
+        components = self._analysis.get('components')
+        self._invalidate_analysis()
+        if components is not None:
+            _, index, union_find = components
+            union_find.union(index[e.from_vertex], index[e.to_vertex])
+            self._analysis['components'] = components
+
+    def _edge_arrays(self):
+        # the vertices, their positions, and the edges with their endpoints as positions
+        vertices = list(self.get_vertices())
+        index = {v: i for i, v in enumerate(vertices)}
+        # the adjacency backends cannot tell an undirected edge from two opposite arcs, so on every backend
+        # an arc u -> w paired with an arc w -> u counts as one undirected edge
+        edges = []
+        unpaired = {}
+        for e in self.get_edges():
+            if e.is_directed:
+                a, b = index[e.from_vertex], index[e.to_vertex]
+                if unpaired.get((b, a)):
+                    unpaired[b, a] -= 1
+                    continue
+                unpaired[a, b] = unpaired.get((a, b), 0) + 1
+            edges.append(e)
+        sources = [index[e.from_vertex] for e in edges]
+        targets = [index[e.to_vertex] for e in edges]
+        return vertices, index, edges, sources, targets
+
+    def _components(self):
+        components = self._analysis.get('components')
+        if components is None:
+            vertices, index, _, sources, targets = self._edge_arrays()
+            union_find = UnionFind(len(vertices))
+            for a, b in zip(sources, targets):
+                union_find.union(a, b)
+            components = self._analysis['components'] = (vertices, index, union_find)
+        return components
+
+    def connected_components(self):
+        """
+        Returns the connected components of the graph, edge directions ignored.
+
+        Returns:
+        - list: A list of components, each a list of Vertex instances in get_vertices order.
+
+        Detailed Explanation:
+        The components are kept in a union-find (UnionFind) built once in O((V + E) α(V)) and cached on the graph. add_edge and add_vertex update it in place, since an insertion can only merge components; remove_edge and remove_vertex drop it, and it is rebuilt on the next query.
+
+        Example:
+            components = g.connected_components()
+            print([[str(v) for v in c] for c in components])  # [['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']]
+        """
+        vertices, _, union_find = self._components()
+        groups = {}
+        for i, root in enumerate(union_find.labels()):
+            groups.setdefault(root, []).append(vertices[i])
+        return list(groups.values())
+
+    def same_component(self, u, v):
+        """
+        Checks whether 'u' and 'v' are in the same connected component, edge directions ignored.
+
+        Detailed Explanation:
+        Two finds in the cached union-find, so nearly O(1) per query, also between edge insertions.
+        """
+        _, index, union_find = self._components()
+        return union_find.connected(index[u], index[v])
+
+    def strongly_connected_components(self):
+        """
+        Returns the strongly connected components of the graph, an undirected edge counting as two arcs.
+
+        Returns:
+        - list: A list of components, each a list of Vertex instances, in reverse topological order (arcs between components go from later to earlier ones).
+
+        Detailed Explanation:
+        Iterative Tarjan's algorithm (connectivity.tarjan_scc) on a CSR snapshot, O(V + E). The result is cached until the graph changes.
+
+        Example:
+            print([[str(v) for v in c] for c in g.strongly_connected_components()])
+        """
+        groups = self._analysis.get('scc')
+        if groups is None:
+            csr = self.to_csr(weight_keys = [])
+            component = tarjan_scc(csr.offsets, csr.targets)
+            groups = [[] for _ in range(max(component, default = -1) + 1)]
+            for v, c in zip(csr.vertices, component):
+                groups[c].append(v)
+            self._analysis['scc'] = groups
+        return [list(group) for group in groups]
+
+    def _biconnectivity(self):
+        result = self._analysis.get('biconnectivity')
+        if result is None:
+            vertices, _, edges, sources, targets = self._edge_arrays()
+            bridges, points = biconnectivity(len(vertices), sources, targets)
+            result = self._analysis['biconnectivity'] = ([edges[i] for i in bridges], [vertices[i] for i in points])
+        return result
+
+    def bridges(self):
+        """
+        Returns the edges whose removal disconnects the graph (more precisely, their own endpoints), edge directions ignored.
+
+        Returns:
+        - list of Edge: The bridges. A parallel edge is never a bridge.
+
+        Detailed Explanation:
+        The adjacency backends store an undirected edge as two opposite arcs, so on every backend two opposite arcs u -> w and w -> u count as one undirected edge, which can be a bridge. Any further arc between them is a parallel edge.
+
+        One iterative low-link depth-first search (connectivity.biconnectivity), O(V + E), shared with articulation_points and cached until the graph changes.
+
+        Example:
+            for e in subway_map.bridges():
+                print(e.from_vertex, e.to_vertex)  # segments with no detour
+        """
+        return list(self._biconnectivity()[0])
+
+    def articulation_points(self):
+        """
+        Returns the vertices whose removal disconnects the graph (more precisely, two other vertices of their component), edge directions ignored.
+
+        Returns:
+        - list of Vertex: The articulation points, in get_vertices order.
+
+        Example:
+            critical = subway_map.articulation_points()  # stations that cut the network if closed
+        """
+        return list(self._biconnectivity()[1])
+
     # Do not modify this method
 
     @staticmethod
@@ -536,30 +1315,82 @@ class Graph:
         
         return positions
 
-    def show(self):
-        import matplotlib.pyplot as plt
-        nodes = self.V 
-        edges = self.E 
-        positions = Graph.spring_layout(nodes, edges)
-        plt.figure(figsize=(8, 6))
-        ax = plt.gca()
+    def layout_seed(self):
+        """
+        Returns a dictionary mapping vertices to starting (x, y) positions for show, or None for random ones.
+        Subclasses with a natural geometry (such as geographic coordinates) override it.
+        """
+        return None
 
-        # Plot nodes
-        for node, pos in positions.items():
-            ax.scatter(*pos, s=2000, color='lightblue')
-            ax.text(*pos, node, fontsize=20, ha='center', va='center')
+    def layout(self, method = 'exact', **kwargs):
+        """
+        Computes 2D positions of the vertices with force_layout, seeded by layout_seed.
 
-        # Plot edges
-        for edge in edges:
-            node1, node2 = edge.from_vertex, edge.to_vertex
-            x_values = [positions[node1][0], positions[node2][0]]
-            y_values = [positions[node1][1], positions[node2][1]]
-            ax.plot(x_values, y_values, color='gray', linewidth=2)
+        Parameters:
+        - method (str, optional): 'exact' or 'barnes_hut'. Defaults to 'exact'.
+        - kwargs: Passed to force_layout (iterations, k, repulsion, theta, seed, ...).
+
+        Returns:
+        - dict: A dictionary mapping each vertex to its position.
+        """
+        kwargs.setdefault('initial_positions', self.layout_seed())
+        return force_layout(self.get_vertices(), self.get_edges(), method = method, **kwargs)
+
+    def render(self, positions, path = None, max_labels = 100, figsize = (8, 6)):
+        """
+        Draws the graph at the given positions with matplotlib.
+
+        Parameters:
+        - positions (dict): A dictionary mapping each vertex to its (x, y) position, e.g. from layout.
+        - path (str, optional): Save the drawing to this file instead of opening a window; the format (png, svg, pdf, ...) follows the extension. This works without a display.
+        - max_labels (int, optional): Maximum number of vertex labels; beyond it, the vertices of highest degree in uncrowded areas are labeled. Defaults to 100.
+        - figsize (tuple, optional): Figure size in inches. Defaults to (8, 6).
+
+        Returns:
+        - matplotlib.figure.Figure: The figure.
+        """
+        nodes = self.get_vertices()
+        edges = self.get_edges()
+        degrees = {v: 0 for v in nodes}
+        for e in edges:
+            degrees[e.from_vertex] += 1
+            degrees[e.to_vertex] += 1
+
+        if path is None:
+            import matplotlib.pyplot as plt
+            fig = plt.figure(figsize = figsize)
+        else:
+            # a bare Figure renders through Agg/SVG without pyplot's GUI machinery
+            from matplotlib.figure import Figure
+            fig = Figure(figsize = figsize)
+        ax = fig.add_subplot()
+        draw_graph(ax, nodes, edges, positions, labels = select_labels(nodes, positions, degrees, max_labels))
 
         ax.set_title("Graph Visualization with Spring Layout", fontsize=20)
         ax.set_xticks([])
         ax.set_yticks([])
-        plt.show()
+        if path is None:
+            plt.show()
+        else:
+            fig.savefig(path)
+        return fig
+
+    def show(self, method = 'exact', path = None, max_labels = 100, figsize = (8, 6), **kwargs):
+        """
+        Lays out the graph with layout and draws it with render.
+
+        Parameters:
+        - method (str, optional): The layout method, 'exact' or 'barnes_hut'. Defaults to 'exact'.
+        - path, max_labels, figsize: See render.
+        - kwargs: Passed to force_layout.
+
+        Returns:
+        - matplotlib.figure.Figure: The figure.
+
+        Example:
+            g.show(path = 'graph.svg', method = 'barnes_hut')
+        """
+        return self.render(self.layout(method = method, **kwargs), path = path, max_labels = max_labels, figsize = figsize)
 
 Edge = Edge 
 Vertex = Vertex 
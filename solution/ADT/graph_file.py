@@ -0,0 +1,256 @@
+import json
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+
+from data_structure.graph import Vertex
+
+MAGIC = b'GRPH'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sIIIQQQQ') # magic, version, directedness, edge columns, vertices, edges, strings, string pool bytes
+COLUMN = struct.Struct('<QI4x') # name (string index), type
+
+UNDIRECTED, DIRECTED, MIXED = 0, 1, 2
+INT, FLOAT, STRING, JSON = 0, 1, 2, 3
+EXTRA = '' # name of the column holding, as JSON, the attributes that are not on every edge
+
+def _pad(size):
+    return -size % 8
+
+def _json_default(value):
+    # lazily loaded stations keep their attributes in a Mapping
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+def _column_type(values):
+    if all(type(x) is int for x in values) and all(-2**63 <= x < 2**63 for x in values):
+        return INT
+    if all(type(x) in (int, float) for x in values):
+        return FLOAT
+    if all(type(x) is str for x in values):
+        return STRING
+    return JSON
+
+def _freeze(value):
+    # JSON turns tuples into lists, which a Vertex cannot hash
+    if isinstance(value, list):
+        return tuple(_freeze(x) for x in value)
+    return value
+
+class _StringPool:
+    def __init__(self):
+        self.index = {}
+        self.strings = []
+
+    def add(self, s):
+        i = self.index.get(s)
+        if i is None:
+            i = self.index[s] = len(self.strings)
+            self.strings.append(s)
+        return i
+
+def _encode(values, kind, pool):
+    import numpy as np
+    if kind == INT:
+        return np.array(values, dtype = '<i8')
+    if kind == FLOAT:
+        return np.array(values, dtype = '<f8')
+    if kind == STRING:
+        return np.array([pool.add(x) for x in values], dtype = '<i8')
+    return np.array([pool.add(json.dumps(x, ensure_ascii = False, default = _json_default)) for x in values], dtype = '<i8')
+
+def save_graph(path, vertices, sources, targets, directed, records):
+    """
+    Writes a graph to a binary file.
+
+    Parameters:
+    - path (str): The file. It is written next to it first and then renamed, so readers never see half a file.
+    - vertices (list of Vertex): The vertices; their node_id and datum are stored.
+    - sources, targets (list of int): The endpoints of every edge, as positions in 'vertices'.
+    - directed (list of bool): Whether every edge is directed.
+    - records (list of dict): The Edge.data of every edge.
+
+    Detailed Explanation:
+    Layout, every section starting on an 8-byte boundary:
+    - HEADER, then one COLUMN descriptor per vertex column (node_id, datum) and per edge column.
+    - The string pool: int64 offsets of its n + 1 boundaries, then the UTF-8 bytes of the strings.
+    - The edges in CSR order, grouped by source: int64 offsets (vertices + 1) and int64 targets.
+    - With mixed directedness, one uint8 flag per edge.
+    - The columns, vertex columns first: int64 or float64 values, or int64 indices into the string pool for strings and JSON-encoded values.
+
+    An edge attribute present on every edge gets a column of its own; the attributes found on some edges only are kept per edge as one JSON object in the EXTRA column.
+    """
+    import numpy as np
+    n, m = len(vertices), len(sources)
+    sources = np.asarray(sources, dtype = np.int64)
+    order = np.argsort(sources, kind = 'stable')
+    offsets = np.searchsorted(sources[order], np.arange(n + 1)).astype('<i8')
+    targets = np.asarray(targets, dtype = '<i8')[order]
+    order = order.tolist()
+    records = [records[i] for i in order]
+    directed = [bool(directed[i]) for i in order]
+    directedness = DIRECTED if all(directed) else UNDIRECTED if not any(directed) else MIXED
+
+    keys = [k for k in records[0] if all(k in r for r in records)] if records else []
+    extra = [{k: v for k, v in r.items() if k not in keys} for r in records]
+    columns = [('node_id', [v.node_id for v in vertices]), ('datum', [v.datum for v in vertices])]
+    columns += [(k, [r[k] for r in records]) for k in keys]
+    if any(extra):
+        columns.append((EXTRA, extra))
+
+    pool = _StringPool()
+    names = [pool.add(name) for name, _ in columns]
+    kinds = [_column_type(values) for _, values in columns]
+    if columns[-1][0] == EXTRA:
+        kinds[-1] = JSON
+    data = [_encode(values, kind, pool) for (_, values), kind in zip(columns, kinds)]
+    blobs = [s.encode('utf-8') for s in pool.strings]
+    string_offsets = np.zeros(len(blobs) + 1, dtype = '<i8')
+    np.cumsum([len(b) for b in blobs], out = string_offsets[1:])
+    pool_bytes = b''.join(blobs)
+
+    tmp = f'{path}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, directedness, len(columns) - 2, n, m, len(blobs), len(pool_bytes)))
+        for name, kind in zip(names, kinds):
+            f.write(COLUMN.pack(name, kind))
+        f.write(string_offsets.tobytes())
+        f.write(pool_bytes)
+        f.write(b'\0' * _pad(len(pool_bytes)))
+        f.write(offsets.tobytes())
+        f.write(targets.tobytes())
+        if directedness == MIXED:
+            f.write(np.array(directed, dtype = np.uint8).tobytes())
+            f.write(b'\0' * _pad(m))
+        for column in data:
+            f.write(column.tobytes())
+    os.replace(tmp, path)
+
+class GraphFile:
+    """
+    Represents a graph file written by save_graph, mapped in memory.
+
+    Attributes:
+    - num_vertices, num_edges (int): The sizes read from the header.
+    - directedness (int): UNDIRECTED, DIRECTED or MIXED.
+    - string_offsets (numpy.ndarray), pool (memoryview): The string pool, string i being pool[string_offsets[i]:string_offsets[i + 1]].
+    - offsets, targets (numpy.ndarray): The edges in CSR order, zero-copy views of the file.
+    - directed (numpy.ndarray or None): One flag per edge with mixed directedness.
+    - vertex_columns, edge_columns (list): (name, type, numpy.ndarray) of every column, views of the file.
+
+    Detailed Explanation:
+    Opening reads the header and the column descriptors, and wraps each section in a numpy array over the mapped bytes. No section is read, so the cost does not depend on the number of vertices or edges. Pages are read by the operating system when the arrays are first touched, and strings are decoded only when asked for.
+    """
+    def __init__(self, path, use_mmap = True):
+        """
+        Opens a graph file.
+
+        Parameters:
+        - path (str): The file.
+        - use_mmap (bool, optional): Map the file instead of reading it whole. Defaults to True.
+
+        Raises:
+        - ValueError: If the file is not a graph file of this format version.
+        """
+        import numpy as np
+        with open(path, 'rb') as f:
+            if use_mmap:
+                buffer = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+            else:
+                buffer = f.read()
+        if len(buffer) < HEADER.size:
+            raise ValueError(f'{path} is not a graph file')
+        magic, version, directedness, n_columns, n, m, n_strings, pool_size = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f'{path} is not a graph file')
+        if version != FORMAT_VERSION:
+            raise ValueError(f'{path} has format version {version}, expected {FORMAT_VERSION}')
+        self.buffer = buffer
+        self.num_vertices, self.num_edges, self.directedness = n, m, directedness
+
+        pos = HEADER.size
+        descriptors = []
+        for _ in range(n_columns + 2):
+            descriptors.append(COLUMN.unpack_from(buffer, pos))
+            pos += COLUMN.size
+
+        def section(dtype, count):
+            nonlocal pos
+            array = np.frombuffer(buffer, dtype = dtype, count = count, offset = pos)
+            pos += array.nbytes + _pad(array.nbytes)
+            return array
+
+        self.string_offsets = section('<i8', n_strings + 1)
+        self.pool = memoryview(buffer)[pos:pos + pool_size]
+        pos += pool_size + _pad(pool_size)
+        self.offsets = section('<i8', n + 1)
+        self.targets = section('<i8', m)
+        self.directed = section(np.uint8, m) if directedness == MIXED else None
+        columns = []
+        for i, (name, kind) in enumerate(descriptors):
+            columns.append((self.string(name), kind, section('<f8' if kind == FLOAT else '<i8', n if i < 2 else m)))
+        self.vertex_columns, self.edge_columns = columns[:2], columns[2:]
+
+    def string(self, i):
+        """
+        Returns string number 'i' of the string pool.
+        """
+        start, end = self.string_offsets[i], self.string_offsets[i + 1]
+        return str(self.pool[start:end], 'utf-8')
+
+    def values(self, kind, array, freeze = False):
+        """
+        Decodes a column into a list of Python values, with the JSON arrays as tuples if 'freeze' is set.
+        """
+        if kind in (INT, FLOAT):
+            return array.tolist()
+        pool, offsets = self.pool, self.string_offsets.tolist()
+        indices = array.tolist()
+        if kind == STRING:
+            strings = {}
+            for i in indices:
+                if i not in strings:
+                    strings[i] = str(pool[offsets[i]:offsets[i + 1]], 'utf-8')
+            return [strings[i] for i in indices]
+        # one json.loads for the whole column; every row gets objects of its own
+        values = json.loads(b'[' + b','.join(pool[offsets[i]:offsets[i + 1]] for i in indices) + b']')
+        return [_freeze(x) for x in values] if freeze else values
+
+    def vertices(self, vertex_factory = Vertex):
+        """
+        Returns the vertices, as vertex_factory(node_id, datum). Node ids and data saved as tuples come back as tuples, so that they stay hashable.
+        """
+        (_, id_kind, ids), (_, datum_kind, data) = self.vertex_columns
+        return [vertex_factory(i, d) for i, d in zip(self.values(id_kind, ids, True), self.values(datum_kind, data, True))]
+
+    def sources(self):
+        """
+        Returns the source of every edge, in CSR order.
+        """
+        import numpy as np
+        return np.repeat(np.arange(self.num_vertices), np.diff(self.offsets))
+
+    def records(self):
+        """
+        Returns the Edge.data of every edge, in CSR order.
+        """
+        keys, columns, extra = [], [], None
+        for name, kind, array in self.edge_columns:
+            if name == EXTRA:
+                extra = self.values(kind, array)
+            else:
+                keys.append(name)
+                columns.append(self.values(kind, array))
+        records = [dict(zip(keys, row)) for row in zip(*columns)] if keys else [{} for _ in range(self.num_edges)]
+        if extra is not None:
+            for record, more in zip(records, extra):
+                record.update(more)
+        return records
+
+    def numeric_columns(self):
+        """
+        Returns a dictionary mapping the name of every numeric edge column to its values.
+        """
+        return {name: array for name, kind, array in self.edge_columns if kind in (INT, FLOAT) and name != EXTRA}
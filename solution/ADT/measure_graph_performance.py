@@ -0,0 +1,370 @@
+import sys
+import os
+import random
+import tempfile
+import tracemalloc
+import warnings
+from heapq import heappush, heappop
+from time import time
+
+cur_path = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(f'{cur_path}/..')
+
+from ADT.graph import Graph, Vertex, Edge
+from data_structure.graph import AdjMatrix
+from ADT.layout import LAYOUT_METHODS
+from subway_map import SubwayMap
+
+resource_dir = f'{cur_path}/../resources'
+
+BACKENDS = ['indexed', 'VE', 'adjacent_list', 'adjacent_matrix']
+
+# AdjMatrix keeps an n x n bit matrix (n^2 / 8 bytes), skip it beyond this many vertices
+MATRIX_VERTEX_LIMIT = 20000
+
+def load_subway_map(backend = 'indexed'):
+    return SubwayMap(f'{resource_dir}/vertices.json', f'{resource_dir}/edges.json', backend = backend)
+
+def generate_random_graph(n_vertices, n_edges, seed = 0):
+    rng = random.Random(seed)
+    V = [Vertex(i, i) for i in range(n_vertices)]
+    E = [Edge(V[rng.randrange(n_vertices)], V[rng.randrange(n_vertices)], is_directed = False) \
+            for _ in range(n_edges)]
+    return V, E
+
+def build_graph(V, E, backend):
+    if backend == 'VE':
+        # VE validates every edge with a list scan, which would dominate the measurement
+        g = Graph(V, [], backend = 'VE')
+        g.E = list(E)
+        return g
+    return Graph(V, E, backend = backend)
+
+def measure_neighbors(g, queries):
+    begin = time()
+    total = 0
+    for v in queries:
+        total += len(g.get_neighbors(v))
+    end = time()
+    return (end - begin) / len(queries), total
+
+def report(name, backend, per_query, n_queries):
+    print(f'{name:>24} {backend:>16} {per_query * 1e6:12.2f} us/query ({n_queries} queries)')
+
+def measure_subway_map():
+    for backend in BACKENDS:
+        g = load_subway_map(backend)
+        queries = g.get_vertices()
+        per_query, _ = measure_neighbors(g, queries)
+        report('subway map', backend, per_query, len(queries))
+
+def measure_traversal(g, src, repeat = 10):
+    res = {}
+    for name, traversal in [('dfs', g.dfs), ('bfs', g.bfs)]:
+        begin = time()
+        for _ in range(repeat):
+            traversal(src)
+        end = time()
+        res[name] = (end - begin) / repeat
+    return res
+
+def measure_subway_traversal():
+    for backend in BACKENDS:
+        g = load_subway_map(backend)
+        src = g.get_vertices()[0]
+        for name, elapsed in measure_traversal(g, src).items():
+            print(f'{"subway map " + name:>24} {backend:>16} {elapsed * 1e3:12.2f} ms/traversal')
+
+def dijkstra(src, weighted_neighbors):
+    dist = {src: 0}
+    heap = [(0, id(src), src)]
+    while heap:
+        d, _, v = heappop(heap)
+        if d > dist[v]:
+            continue
+        for n, w in weighted_neighbors(v):
+            if d + w < dist.get(n, float('inf')):
+                dist[n] = d + w
+                heappush(heap, (d + w, id(n), n))
+    return dist
+
+def measure_weighted_traversal(weight = 'time', repeat = 10):
+    # Dijkstra fed by get_weighted_neighbors, against get_neighbors plus a weight lookup per edge
+    for backend in ['indexed', 'adjacent_list', 'adjacent_matrix']:
+        g = load_subway_map(backend)
+        src = g.get_vertices()[0]
+        weights = {}
+        for e in g.get_edges():
+            weights[(e.from_vertex, e.to_vertex)] = weights[(e.to_vertex, e.from_vertex)] = e.data[weight]
+        lookup = lambda v: [(n, weights[(v, n)]) for n in g.get_neighbors(v)]
+        for name, weighted_neighbors in [('lookup', lookup), 
+                                            ('weighted', lambda v: g.get_weighted_neighbors(v, weight))]:
+            begin = time()
+            for _ in range(repeat):
+                dijkstra(src, weighted_neighbors)
+            elapsed = (time() - begin) / repeat
+            print(f'{"dijkstra " + name:>24} {backend:>16} {elapsed * 1e3:12.2f} ms/traversal')
+
+def measure_synthetic(n_edges, n_queries = 1000, ve_queries = 5):
+    n_vertices = n_edges // 10
+    V, E = generate_random_graph(n_vertices, n_edges)
+    rng = random.Random(1)
+    for backend in BACKENDS:
+        if backend == 'adjacent_matrix' and n_vertices > MATRIX_VERTEX_LIMIT:
+            print(f'{str(n_edges) + " edges":>24} {backend:>16} skipped ({n_vertices} vertices)')
+            continue
+        g = build_graph(V, E, backend)
+        k = ve_queries if backend == 'VE' else n_queries
+        queries = [V[rng.randrange(n_vertices)] for _ in range(k)]
+        per_query, _ = measure_neighbors(g, queries)
+        report(f'{n_edges} edges', backend, per_query, k)
+
+def measure_views(n_edges = 10**5, repeat = 100, n_queries = 1000):
+    # get_vertices/get_edges are built once per version and shared until the graph changes
+    n_vertices = n_edges // 10
+    V, E = generate_random_graph(n_vertices, n_edges)
+    rng = random.Random(2)
+    queries = [V[rng.randrange(n_vertices)] for _ in range(n_queries)]
+    for backend in BACKENDS:
+        g = build_graph(V, E, backend)
+        begin = time()
+        g.get_edges()
+        first = time() - begin
+        g.get_vertices()
+        tracemalloc.start()
+        begin = time()
+        for _ in range(repeat):
+            g.get_vertices()
+            g.get_edges()
+        repeated = (time() - begin) / repeat
+        allocated, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        begin = time()
+        n = sum(1 for _ in g.iter_edges())
+        iterated = time() - begin
+        print(f'{"get_edges, " + str(n_edges) + " edges":>24} {backend:>16} first {first * 1e3:9.2f} ms, '
+                f'then {repeated * 1e6:6.2f} us ({allocated} bytes for {repeat} calls), iter_edges {iterated * 1e3:9.2f} ms')
+        g.get_neighbors(queries[0]) # VE builds its neighbor index once per version
+        per_query, _ = measure_neighbors(g, queries)
+        report('neighbors after views', backend, per_query, n_queries)
+
+def churn(g, n_ops, rng):
+    # a random mix of mutations: 40% add_edge, 30% remove_edge, 15% add_vertex, 15% remove_vertex
+    live = list(g.get_vertices())
+    edges = []
+    next_id = max(v.node_id for v in live) + 1
+    for _ in range(n_ops):
+        op = rng.random()
+        if op < 0.4 and live:
+            e = Edge(live[rng.randrange(len(live))], live[rng.randrange(len(live))], is_directed = rng.random() < 0.5)
+            g.add_edge(e)
+            edges.append(e)
+        elif op < 0.7 and edges:
+            i = rng.randrange(len(edges))
+            edges[i], edges[-1] = edges[-1], edges[i]
+            e = edges.pop()
+            if g.has_edge(e): # it may have gone with one of its vertices
+                g.remove_edge(e)
+        elif op < 0.85 or not live:
+            v = Vertex(next_id, next_id)
+            next_id += 1
+            g.add_vertex(v)
+            live.append(v)
+        else:
+            i = rng.randrange(len(live))
+            live[i], live[-1] = live[-1], live[i]
+            g.remove_vertex(live.pop())
+
+def measure_churn(n_ops = 10**5, n_vertices = 1000, n_edges = 5000):
+    V, E = generate_random_graph(n_vertices, n_edges)
+    for backend in BACKENDS:
+        if backend == 'VE':
+            print(f'{str(n_ops) + " mutations":>24} {backend:>16} skipped (O(E) edge lookups)')
+            continue
+        g = build_graph(list(V), E, backend)
+        begin = time()
+        churn(g, n_ops, random.Random(2))
+        end = time()
+        print(f'{str(n_ops) + " mutations":>24} {backend:>16} {(end - begin) / n_ops * 1e6:12.2f} us/op')
+
+def measure_dense_matrix(n_vertices = 10**4, degree = 100, closure_vertices = 2000):
+    V, E = generate_random_graph(n_vertices, n_vertices * degree // 2)
+    begin = time()
+    m = AdjMatrix(V, E)
+    end = time()
+    name = f'{n_vertices} vertices'
+    print(f'{name:>24} {"build":>16} {end - begin:12.2f} s ({len(m.bits) / 2**20:.1f} MiB of cells)')
+    rng = random.Random(1)
+    queries = [V[rng.randrange(n_vertices)] for _ in range(1000)]
+    begin = time()
+    for v in queries:
+        m.get_neighbors(v)
+    end = time()
+    print(f'{name:>24} {"get_neighbors":>16} {(end - begin) / len(queries) * 1e6:12.2f} us/query')
+    for label, query in [('out degrees', lambda: m.degrees('out')), ('in degrees', lambda: m.degrees('in')), 
+                            ('reachable', lambda: m.reachable(V[0]))]:
+        begin = time()
+        query()
+        end = time()
+        print(f'{name:>24} {label:>16} {(end - begin) * 1e3:12.2f} ms')
+
+    V, E = generate_random_graph(closure_vertices, closure_vertices * 2)
+    E = [Edge(e.from_vertex, e.to_vertex) for e in E] # directed, so the closure is not just the components
+    m = AdjMatrix(V, E)
+    begin = time()
+    m.transitive_closure()
+    end = time()
+    print(f'{str(closure_vertices) + " vertices":>24} {"closure":>16} {(end - begin) * 1e3:12.2f} ms')
+
+def measure_bulk_construction(n_edges = 10**6, n_vertices = 10**5, matrix_vertices = 10**4):
+    # Edge instances plus Graph(V, E) against Graph.from_arrays from integer arrays
+    import numpy as np
+    rng = np.random.default_rng(0)
+    sources = rng.integers(0, n_vertices, n_edges)
+    targets = rng.integers(0, n_vertices, n_edges)
+    times = rng.random(n_edges)
+    for backend in BACKENDS:
+        n = matrix_vertices if backend == 'adjacent_matrix' else n_vertices
+        s, t = sources % n, targets % n
+        V = [Vertex(i, i) for i in range(n)]
+        name = f'{n_edges} edges'
+        def from_edges():
+            E = [Edge(V[a], V[b], False, time = w) for a, b, w in zip(s.tolist(), t.tolist(), times.tolist())]
+            return Graph(V, E, backend = backend)
+        for label, build in [('Graph(V, E)', from_edges),
+                                ('from_arrays', lambda: Graph.from_arrays(s, t, V, backend = backend, is_directed = False, time = times))]:
+            begin = time()
+            build()
+            end = time()
+            print(f'{name:>24} {backend:>16} {label:>12} {end - begin:8.2f} s')
+
+def measure_connectivity(n_vertices = 10**5, n_edges = 3 * 10**5, n_insertions = 1000):
+    s = load_subway_map()
+    print(f'{"subway map":>24} {len(s.articulation_points()):>6} articulation points, {len(s.bridges())} bridges, '
+            f'{len(s.connected_components())} components')
+    V, E = generate_random_graph(n_vertices, n_edges)
+    for name, g in [('subway map', load_subway_map()), (f'{n_edges} edges', Graph(V, E))]:
+        for label, analysis in [('components', g.connected_components), ('scc', g.strongly_connected_components),
+                                ('bridges', g.bridges), ('cached', g.articulation_points)]:
+            begin = time()
+            analysis()
+            end = time()
+            print(f'{name:>24} {label:>16} {(end - begin) * 1e3:12.2f} ms')
+
+        # edge insertions interleaved with component queries: incremental union-find against a rebuild per query
+        rng = random.Random(2)
+        vertices = g.get_vertices()
+        pairs = [(vertices[rng.randrange(len(vertices))], vertices[rng.randrange(len(vertices))]) for _ in range(n_insertions)]
+        begin = time()
+        for u, v in pairs:
+            g.add_edge(Edge(u, v, is_directed = False))
+            g.same_component(u, vertices[0])
+        end = time()
+        print(f'{name:>24} {"insert + query":>16} {(end - begin) / n_insertions * 1e6:12.2f} us/insertion')
+        begin = time()
+        g._invalidate_analysis()
+        g.same_component(vertices[0], vertices[-1])
+        end = time()
+        print(f'{name:>24} {"rebuild":>16} {(end - begin) * 1e3:12.2f} ms')
+
+def measure_allocation(build):
+    tracemalloc.start()
+    res = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return res, size
+
+def measure_csr_memory(name, build_graph_func):
+    g, graph_bytes = measure_allocation(build_graph_func)
+    csr, csr_bytes = measure_allocation(g.to_csr)
+    n_edges = len(g.get_edges())
+    print(f'{name:>24} {"object graph":>16} {graph_bytes / n_edges:12.1f} bytes/edge')
+    print(f'{name:>24} {"csr":>16} {csr_bytes / n_edges:12.1f} bytes/edge '
+            f'({csr.memory_usage() / n_edges:.1f} in arrays)')
+    # searches read the arrays through CSRArcs: what they leave behind is counted, their results are not
+    def search_every_column():
+        for weight in [None, *csr.weights]:
+            csr.search(0, weight)
+    _, kept_bytes = measure_allocation(search_every_column)
+    print(f'{name:>24} {"csr + searches":>16} {(csr_bytes + kept_bytes) / n_edges:12.1f} bytes/edge '
+            f'({csr.memory_usage() / n_edges:.1f} in arrays)')
+    return g
+
+def measure_csr_traversal(name, g, repeat = 10):
+    csr = g.to_csr()
+    src = g.get_vertices()[0]
+    for label, traversal in [('graph bfs', g.bfs), ('csr bfs', csr.bfs)]:
+        begin = time()
+        for _ in range(repeat):
+            traversal(src)
+        end = time()
+        print(f'{name:>24} {label:>16} {(end - begin) / repeat * 1e3:12.2f} ms/traversal')
+
+def measure_csr():
+    g = measure_csr_memory('subway map', load_subway_map)
+    measure_csr_traversal('subway map', g)
+    for n_edges in [10**5, 10**6]:
+        build = lambda: Graph(*generate_random_graph(n_edges // 10, n_edges))
+        g = measure_csr_memory(f'{n_edges} edges', build)
+        measure_csr_traversal(f'{n_edges} edges', g)
+
+def measure_layout(name, g, methods = LAYOUT_METHODS, **kwargs):
+    for method in methods:
+        begin = time()
+        g.layout(method = method, **kwargs)
+        end = time()
+        print(f'{name:>24} {method:>16} {(end - begin) * 1e3:12.2f} ms/layout')
+
+def measure_layouts():
+    g = load_subway_map()
+    measure_layout('subway map (wgs seed)', g)
+    measure_layout('subway map (random)', g, initial_positions = None)
+    for n_vertices in [2000, 10000]:
+        g = Graph(*generate_random_graph(n_vertices, n_vertices * 2))
+        # the exact O(V^2) repulsion is too slow to be worth measuring beyond a few thousand vertices
+        methods = LAYOUT_METHODS if n_vertices <= 2000 else ['barnes_hut']
+        measure_layout(f'{n_vertices} vertices', g, methods, iterations = 10)
+
+def render_per_artist(g, positions, path):
+    # the drawing of the original Graph.show: one artist per vertex, label and edge
+    from matplotlib.figure import Figure
+    fig = Figure(figsize = (8, 6))
+    ax = fig.add_subplot()
+    for node in g.get_vertices():
+        ax.scatter(*positions[node], s=2000, color='lightblue')
+        ax.text(*positions[node], node, fontsize=20, ha='center', va='center')
+    for edge in g.get_edges():
+        node1, node2 = edge.from_vertex, edge.to_vertex
+        ax.plot([positions[node1][0], positions[node2][0]], [positions[node1][1], positions[node2][1]], color='gray', linewidth=2)
+    fig.savefig(path)
+
+def measure_render(name, g, repeat = 3):
+    positions = g.layout(method = 'barnes_hut', iterations = 10)
+    with tempfile.TemporaryDirectory() as out, warnings.catch_warnings():
+        warnings.simplefilter('ignore') # missing glyphs for the station names
+        for label, render in [('per artist', render_per_artist), ('collections', Graph.render)]:
+            for extension in ['png', 'svg']:
+                begin = time()
+                for _ in range(repeat):
+                    render(g, positions, path = f'{out}/graph.{extension}')
+                end = time()
+                print(f'{name:>24} {label + " " + extension:>16} {(end - begin) / repeat * 1e3:12.2f} ms/render')
+
+def measure_renders():
+    measure_render('subway map', load_subway_map())
+    measure_render('2000 vertices', Graph(*generate_random_graph(2000, 4000)), repeat = 1)
+
+if __name__ == '__main__':
+    measure_subway_map()
+    measure_subway_traversal()
+    measure_weighted_traversal()
+    for n_edges in [10**4, 10**5, 10**6]:
+        measure_synthetic(n_edges)
+    measure_churn()
+    measure_views()
+    measure_dense_matrix()
+    measure_bulk_construction()
+    measure_connectivity()
+    measure_csr()
+    measure_layouts()
+    measure_renders()
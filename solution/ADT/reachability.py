@@ -0,0 +1,114 @@
+def _arcs_of(offsets, rows):
+    # positions in 'targets' of the arcs leaving 'rows', and the row of each of them
+    import numpy as np
+    starts = offsets[rows]
+    counts = offsets[rows + 1] - starts
+    ends = np.cumsum(counts)
+    arcs = np.arange(ends[-1] if len(ends) else 0) + np.repeat(starts - ends + counts, counts)
+    return arcs, np.repeat(np.arange(len(rows)), counts)
+
+def bitset_bfs(offsets, targets, sources, max_depth = None):
+    """
+    Runs a breadth-first search from every source at once, level by level.
+
+    Parameters:
+    - offsets, targets: CSR arrays of the graph (see CSRGraph).
+    - sources (sequence of int): The vertex ids to start from.
+    - max_depth (int, optional): Do not expand vertices this many edges away from their source.
+
+    Returns:
+    - tuple: Three numpy arrays (query, vertex, depth) with one entry per (source, reached vertex) pair, 'query' being the position of the source in 'sources'. Pairs come level by level.
+
+    Detailed Explanation:
+    Source i owns bit i of a row of ceil(k / 64) uint64 words, so a set of sources is one row of words. The frontier holds, for every vertex reached at the current level, the row of sources that just reached it. One level is a few array operations whatever the number of sources: gather the frontier rows along the arcs leaving the frontier, sort the arcs by target and OR the rows of each target together with numpy.bitwise_or.reduceat, then mask out the sources that had already visited the target. An arc is therefore looked at once per level for up to 64 sources per word, instead of once per source as in k separate searches. Only the vertices of the frontier are touched, never whole n x k matrices except 'visited'.
+    """
+    import numpy as np
+    offsets = np.asarray(offsets, dtype = np.int64)
+    targets = np.asarray(targets, dtype = np.int64)
+    sources = np.asarray(sources, dtype = np.int64)
+    n, k = len(offsets) - 1, len(sources)
+    words = max(1, (k + 63) >> 6)
+    query = np.arange(k)
+    one_bits = np.zeros((k, words), dtype = '<u8')
+    one_bits[query, query >> 6] = np.left_shift(np.uint64(1), (query & 63).astype(np.uint64))
+
+    # several queries may share a source vertex: merge their bits
+    rows, inverse = np.unique(sources, return_inverse = True)
+    frontier = np.zeros((len(rows), words), dtype = '<u8')
+    np.bitwise_or.at(frontier, inverse, one_bits)
+    visited = np.zeros((n, words), dtype = '<u8')
+    visited[rows] = frontier
+    found = [(query, sources, np.zeros(k, dtype = np.int64))]
+
+    depth = 0
+    while len(rows) and (max_depth is None or depth < max_depth):
+        arcs, owner = _arcs_of(offsets, rows)
+        if len(arcs) == 0:
+            break
+        reached = targets[arcs]
+        order = np.argsort(reached, kind = 'stable')
+        reached = reached[order]
+        starts = np.flatnonzero(np.concatenate(([True], reached[1:] != reached[:-1])))
+        rows = reached[starts]
+        frontier = np.bitwise_or.reduceat(frontier[owner[order]], starts, axis = 0)
+        frontier &= ~visited[rows]
+        keep = frontier.any(axis = 1)
+        rows, frontier = rows[keep], frontier[keep]
+        visited[rows] |= frontier
+        depth += 1
+
+        bits = np.unpackbits(frontier.view(np.uint8), axis = 1, bitorder = 'little')[:, :k]
+        r, q = np.nonzero(bits)
+        found.append((q, rows[r], np.full(len(r), depth, dtype = np.int64)))
+
+    return tuple(np.concatenate(column) for column in zip(*found))
+
+_worker_graph = None
+
+def _init_worker(offsets, targets):
+    global _worker_graph
+    _worker_graph = (offsets, targets)
+
+def _bfs_task(args):
+    sources, max_depth = args
+    return bitset_bfs(*_worker_graph, sources, max_depth)
+
+def multi_source_bfs(csr, sources, max_depth = None, processes = None, batch_size = 1024):
+    """
+    Runs bitset_bfs over a CSR snapshot for any number of sources, in batches, optionally in a process pool.
+
+    Parameters:
+    - csr (CSRGraph): The snapshot.
+    - sources (sequence of int): The vertex ids to start from.
+    - max_depth (int, optional): See bitset_bfs.
+    - processes (int, optional): Number of worker processes. Defaults to None, which runs in this process.
+    - batch_size (int, optional): Maximum number of sources advanced together, which bounds 'visited' to n x batch_size bits.
+
+    Returns:
+    - tuple: (query, vertex, depth) numpy arrays as in bitset_bfs, 'query' indexing 'sources'.
+
+    Detailed Explanation:
+    Batches are independent, so they can be spread over worker processes. The snapshot arrays are sent once to each worker through the pool initializer, as in repeated_dijkstra, and then shared read-only by all the batches the worker runs; tasks only carry source ids. Batches are made small enough that every worker gets at least one.
+    """
+    import numpy as np
+    sources = list(sources)
+    if processes is not None:
+        batch_size = max(1, min(batch_size, -(-len(sources) // processes)))
+    batches = [(sources[i:i + batch_size], max_depth) for i in range(0, len(sources), batch_size)]
+    if processes is None:
+        results = [bitset_bfs(csr.offsets, csr.targets, *batch) for batch in batches]
+    else:
+        # imported here: scripts run from ADT/ have ADT/queue.py shadowing the queue module multiprocessing needs
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers = processes, initializer = _init_worker,
+                                    initargs = (csr.offsets, csr.targets)) as pool:
+            results = list(pool.map(_bfs_task, batches))
+    if not results:
+        empty = np.zeros(0, dtype = np.int64)
+        return empty, empty, empty
+    first = 0
+    shifted = []
+    for (query, vertex, depth), (batch, _) in zip(results, batches):
+        shifted.append((query + first, vertex, depth))
+        first += len(batch)
+    return tuple(np.concatenate(column) for column in zip(*shifted))
@@ -0,0 +1,80 @@
+import math
+
+def select_labels(nodes, positions, priorities, max_labels = 100):
+    """
+    Chooses which vertices get a text label so that labels do not pile up (level of detail).
+
+    Parameters:
+    - nodes (list): The vertices.
+    - positions (dict): A dictionary mapping each vertex to its (x, y) position.
+    - priorities (dict): A dictionary mapping each vertex to a number; higher ones are labeled first (e.g. degrees).
+    - max_labels (int, optional): Maximum number of labels. Defaults to 100.
+
+    Returns:
+    - list: The vertices to label.
+
+    Detailed Explanation:
+    The bounding box of the drawing is cut into a grid of about max_labels cells. Vertices are visited by decreasing priority and a vertex is labeled only if its cell is still free. Every vertex is labeled when there are at most max_labels of them; otherwise the important ones (for a subway map, the transfer stations) are labeled and the crowded areas stay readable.
+    """
+    if len(nodes) <= max_labels:
+        return list(nodes)
+    if max_labels <= 0:
+        return []
+    xs = [positions[v][0] for v in nodes]
+    ys = [positions[v][1] for v in nodes]
+    x0, y0 = min(xs), min(ys)
+    width, height = (max(xs) - x0) or 1.0, (max(ys) - y0) or 1.0
+    cell = math.sqrt(width * height / max_labels)
+
+    labeled = []
+    occupied = set()
+    for v in sorted(nodes, key = lambda v: -priorities.get(v, 0)):
+        key = (int((positions[v][0] - x0) / cell), int((positions[v][1] - y0) / cell))
+        if key in occupied:
+            continue
+        occupied.add(key)
+        labeled.append(v)
+        if len(labeled) == max_labels:
+            break
+    return labeled
+
+def draw_graph(ax, nodes, edges, positions, labels = None, node_size = None, font_size = None,
+                node_color = 'lightblue', edge_color = 'gray'):
+    """
+    Draws a graph on a matplotlib Axes with one artist for all the vertices and one for all the edges.
+
+    Parameters:
+    - ax (matplotlib.axes.Axes): The axes to draw on.
+    - nodes (list): The vertices.
+    - edges (list of Edge): The edges.
+    - positions (dict): A dictionary mapping each vertex to its (x, y) position.
+    - labels (list, optional): The vertices to write the name of. Defaults to None, which labels every vertex.
+    - node_size (float, optional): Marker area in points^2. Defaults to a size shrinking with the number of vertices.
+    - font_size (float, optional): Label font size. Defaults to a size shrinking with the number of labels.
+    - node_color, edge_color (optional): matplotlib colors.
+
+    Returns:
+    - tuple: (PathCollection of the vertices, LineCollection of the edges).
+
+    Detailed Explanation:
+    Calling ax.scatter and ax.plot once per vertex and per edge creates one artist each, and matplotlib's cost per artist (layout, transforms, draw calls) dominates rendering for graphs of a few hundred vertices. Here the edges become a single LineCollection of E segments and the vertices a single scatter PathCollection, so drawing costs two artists plus the labels.
+    """
+    from matplotlib.collections import LineCollection
+    n = max(len(nodes), 1)
+    if labels is None:
+        labels = nodes
+    if node_size is None:
+        node_size = max(4.0, min(2000.0, 8000.0 / n))
+    if font_size is None:
+        font_size = max(6.0, min(20.0, 400.0 / max(len(labels), 1)))
+
+    segments = [(positions[e.from_vertex], positions[e.to_vertex]) for e in edges]
+    edge_artist = LineCollection(segments, colors = edge_color, linewidths = 2 if n <= 100 else 0.5, zorder = 1)
+    ax.add_collection(edge_artist)
+    node_artist = ax.scatter([positions[v][0] for v in nodes], [positions[v][1] for v in nodes],
+                                s = node_size, color = node_color, zorder = 2)
+    for v in labels:
+        ax.text(positions[v][0], positions[v][1], str(v), fontsize = font_size, ha = 'center', va = 'center', zorder = 3)
+    ax.margins(0.1)
+    ax.autoscale_view()
+    return node_artist, edge_artist
@@ -0,0 +1,199 @@
+import math
+
+EARTH_RADIUS = 6371000.0 # meters
+
+def haversine(lat1, lon1, lat2, lon2):
+    """
+    Returns the great-circle distance in meters between two WGS84 points given in degrees.
+    """
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    h = math.sin((lat2 - lat1) / 2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2)**2
+    return 2 * EARTH_RADIUS * math.asin(math.sqrt(min(1.0, h)))
+
+def to_unit_vector(lat, lon):
+    """
+    Returns the point on the unit sphere for a WGS84 (latitude, longitude) in degrees.
+    The chord between two such points times EARTH_RADIUS never exceeds their great-circle distance.
+    """
+    lat, lon = math.radians(lat), math.radians(lon)
+    return (math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat))
+
+class ShortestPathEngine:
+    """
+    Represents a shortest-path engine (Dijkstra and A*) running on a CSRGraph snapshot.
+
+    Attributes:
+    - csr (CSRGraph): The snapshot to search.
+    - coordinates (list or None): Unit-sphere (x, y, z) per vertex id, or None if A* has no heuristic.
+    - last_settled (int): The number of vertices settled by the last query.
+
+    Detailed Explanation:
+    All searches run the relaxation loop of data_structure.csr.dijkstra: a binary heap (heapq) as the priority queue, with lazy deletion. Edge costs come from one of the snapshot's weight columns, or count hops when 'weight' is None. Weights must be non-negative. The arcs are read from the offset, target and weight arrays of the snapshot (CSRGraph.arcs), so a long-lived engine holds no per-arc data besides them, however many weights it is queried on.
+
+    For A*, the heuristic is the straight-line (chord) distance to the destination multiplied by the smallest ratio (edge weight / chord length of the edge) over all edges. With that scale h(u) - h(v) never exceeds the weight of the edge (u, v) by the triangle inequality, so the heuristic is consistent and therefore admissible, whatever unit the weight is in. Chords are used instead of great-circle distances because they need no trigonometry per query.
+
+    Practical Usages:
+    Route planning on transportation networks, where the coordinates of the stations let A* skip vertices that lead away from the destination.
+    """
+    def __init__(self, csr, coordinates = None):
+        """
+        Initializes the engine.
+
+        Parameters:
+        - csr (CSRGraph): The snapshot to search.
+        - coordinates (dict, optional): A dictionary mapping each vertex to (latitude, longitude) in degrees. If any vertex is missing, A* runs without a heuristic.
+
+        Raises:
+        - ValueError: If a weight column holds a negative weight.
+
+        Example:
+            engine = ShortestPathEngine(subway_map.to_csr(), coordinates)
+        """
+        self.csr = csr
+        for key, column in csr.weights.items():
+            if any(w < 0 for w in column):
+                raise ValueError(f'negative weight in column {key!r}')
+
+        self.coordinates = None
+        if coordinates is not None:
+            coords = [coordinates.get(v) for v in csr.vertices]
+            if all(c is not None for c in coords):
+                self.coordinates = [to_unit_vector(*c) for c in coords]
+        self._heuristic_scale = {}
+        self.last_settled = 0
+
+    def _weight_column(self, weight):
+        if weight is None:
+            return None
+        if weight not in self.csr.weights:
+            raise ValueError(f'no weight column {weight!r}, available: {list(self.csr.weights)}')
+        return self.csr.weights[weight]
+
+    def heuristic_scale(self, weight):
+        """
+        Returns the factor that turns chord lengths on the unit sphere into a lower bound of 'weight'.
+
+        Parameters:
+        - weight (str or None): The weight column.
+
+        Returns:
+        - float: min over edges of weight / chord length. 0 if there are no coordinates.
+        """
+        if weight in self._heuristic_scale:
+            return self._heuristic_scale[weight]
+        scale = 0.0
+        if self.coordinates is not None:
+            w = self._weight_column(weight)
+            offsets, targets, coords = self.csr.offsets, self.csr.targets, self.coordinates
+            scale = math.inf
+            for i in range(len(coords)):
+                for pos in range(offsets[i], offsets[i + 1]):
+                    length = math.dist(coords[i], coords[targets[pos]])
+                    if length > 0:
+                        scale = min(scale, (w[pos] if w is not None else 1) / length)
+            if scale == math.inf:
+                scale = 0.0
+        self._heuristic_scale[weight] = scale
+        return scale
+
+    def _search(self, s, weight, t = None, use_heuristic = False):
+        scale = 0
+        if use_heuristic and t is not None:
+            scale = self.heuristic_scale(weight)
+        if scale > 0:
+            coords = self.coordinates
+            tx, ty, tz = coords[t]
+            def h(j):
+                x, y, z = coords[j]
+                return scale * math.sqrt((x - tx)**2 + (y - ty)**2 + (z - tz)**2)
+        else:
+            h = None
+
+        dist, parent, self.last_settled = self.csr.search(s, weight, t, h)
+        return dist, parent
+
+    def _path(self, parent, t):
+        path = []
+        i = t
+        while i != -1:
+            path.append(self.csr.vertices[i])
+            i = parent[i]
+        path.reverse()
+        return path
+
+    def single_source(self, src, weight = None):
+        """
+        Computes the shortest paths from one vertex to every reachable vertex (Dijkstra).
+
+        Parameters:
+        - src (Vertex): The source vertex.
+        - weight (str, optional): The weight column. Defaults to None, which counts hops.
+
+        Returns:
+        - tuple: (dist, parent) dictionaries keyed by Vertex. parent[src] is None.
+
+        Example:
+            dist, parent = engine.single_source(seoul, weight = 'time')
+            engine.path_to(parent, gangnam)
+        """
+        s = self.csr.vertex_indices[src]
+        dist, parent = self._search(s, weight)
+        vertices = self.csr.vertices
+        reached = [i for i, d in enumerate(dist) if d < math.inf]
+        return ({vertices[i]: dist[i] for i in reached},
+                {vertices[i]: (vertices[parent[i]] if i != s else None) for i in reached})
+
+    @staticmethod
+    def path_to(parent, dst):
+        """
+        Rebuilds the path to 'dst' from a parent dictionary returned by single_source.
+
+        Returns:
+        - list of Vertex: The path, or [] if 'dst' is unreachable.
+        """
+        if dst not in parent:
+            return []
+        path = []
+        while dst is not None:
+            path.append(dst)
+            dst = parent[dst]
+        path.reverse()
+        return path
+
+    def single_pair(self, src, dst, weight = None):
+        """
+        Computes a shortest path between two vertices with Dijkstra, stopping as soon as 'dst' is settled.
+
+        Parameters:
+        - src (Vertex): The source vertex.
+        - dst (Vertex): The destination vertex.
+        - weight (str, optional): The weight column. Defaults to None, which counts hops.
+
+        Returns:
+        - tuple: (cost, path) with path a list of Vertex. (inf, []) if 'dst' is unreachable.
+        """
+        return self._pair(src, dst, weight, use_heuristic = False)
+
+    def astar(self, src, dst, weight = None):
+        """
+        Computes a shortest path between two vertices with A*.
+
+        Parameters:
+        - src (Vertex): The source vertex.
+        - dst (Vertex): The destination vertex.
+        - weight (str, optional): The weight column. Defaults to None, which counts hops.
+
+        Returns:
+        - tuple: (cost, path) with path a list of Vertex. (inf, []) if 'dst' is unreachable.
+
+        Detailed Explanation:
+        Without coordinates the heuristic is zero and A* is exactly single_pair.
+        """
+        return self._pair(src, dst, weight, use_heuristic = True)
+
+    def _pair(self, src, dst, weight, use_heuristic):
+        s, t = self.csr.vertex_indices[src], self.csr.vertex_indices[dst]
+        dist, parent = self._search(s, weight, t, use_heuristic = use_heuristic)
+        if dist[t] == math.inf:
+            return math.inf, []
+        return dist[t], self._path(parent, t)
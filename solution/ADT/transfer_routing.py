@@ -0,0 +1,143 @@
+import math
+from array import array
+from heapq import heappush, heappop
+
+class TransferGraph:
+    """
+    Represents the (vertex, line) state graph of a multi-line transportation network.
+
+    Attributes:
+    - states (list): List of (vertex, line) pairs. The position of a state in this list is its integer id.
+    - states_of (dict): A dictionary mapping each vertex to the ids of its states, one per line serving it.
+    - offsets, targets (array('i')): CSR adjacency of the state graph.
+    - weights (array('d')): Travel cost of each arc. Transfer arcs cost 0 here; the transfer penalty is added at query time.
+    - is_transfer (array('b')): 1 for arcs that change line at a vertex, 0 for arcs that ride a line.
+
+    Detailed Explanation:
+    A station served by several lines is a single vertex in the Graph, so a route that changes lines looks exactly like one that does not. The state graph splits every vertex into one state per line. Riding an edge of line L connects (u, L) and (v, L), and a transfer connects (v, L1) and (v, L2). The graph is built once; queries only run the search.
+
+    Routes are compared on two criteria, total cost (including transfer penalties) and number of transfers. pareto_routes returns every route that is not beaten on both criteria by another one.
+
+    Practical Usages:
+    Journey planners offering "fastest" and "fewest transfers" alternatives side by side.
+    """
+    def __init__(self, edges, weight = 'time', line_key = 'line'):
+        """
+        Builds the state graph.
+
+        Parameters:
+        - edges (list of Edge): The edges of the network. Each edge must carry its line as attribute 'line_key' and its cost in Edge.data[weight].
+        - weight (str, optional): The edge attribute used as travel cost. Defaults to 'time'.
+        - line_key (str, optional): The edge attribute holding the line. Defaults to 'line'.
+
+        Raises:
+        - ValueError: If an edge has a negative cost.
+
+        Example:
+            tg = TransferGraph(subway_map.get_edges())
+        """
+        self.weight = weight
+        self.states = []
+        self.states_of = {}
+        state_indices = {}
+
+        def state(v, line):
+            key = (v, line)
+            if key not in state_indices:
+                state_indices[key] = len(self.states)
+                self.states.append(key)
+                self.states_of.setdefault(v, []).append(state_indices[key])
+            return state_indices[key]
+
+        arcs = []
+        for e in edges:
+            w = e.data[weight]
+            if w < 0:
+                raise ValueError(f'negative {weight} on edge {e.from_vertex} - {e.to_vertex}')
+            line = getattr(e, line_key)
+            a, b = state(e.from_vertex, line), state(e.to_vertex, line)
+            arcs.append((a, b, w, 0))
+            if not e.is_directed:
+                arcs.append((b, a, w, 0))
+        for ids in self.states_of.values():
+            for a in ids:
+                for b in ids:
+                    if a != b:
+                        arcs.append((a, b, 0, 1))
+
+        arcs.sort(key = lambda arc: arc[0])
+        n = len(self.states)
+        self.offsets = array('i', [0]) * (n + 1)
+        for a, _, _, _ in arcs:
+            self.offsets[a + 1] += 1
+        for i in range(n):
+            self.offsets[i + 1] += self.offsets[i]
+        self.targets = array('i', (arc[1] for arc in arcs))
+        self.weights = array('d', (arc[2] for arc in arcs))
+        self.is_transfer = array('b', (arc[3] for arc in arcs))
+
+    def pareto_routes(self, src, dst, transfer_cost = 0, max_transfers = None):
+        """
+        Finds every Pareto-optimal route by (cost, transfers) between two vertices.
+
+        Parameters:
+        - src (Vertex): The departure vertex. The route may start on any of its lines.
+        - dst (Vertex): The arrival vertex, reached on any of its lines.
+        - transfer_cost (float, optional): Penalty added to the cost for each transfer. Defaults to 0.
+        - max_transfers (int, optional): Ignore routes with more transfers.
+
+        Returns:
+        - list of tuple: (cost, transfers, path) sorted by increasing cost (hence decreasing transfers). path is a list of (vertex, line) states; a transfer shows up as two consecutive states of the same vertex.
+
+        Detailed Explanation:
+        This is a bicriteria label-setting search. Labels (cost, transfers) are popped from a binary heap in lexicographic order, so a label popped at a state is only worth keeping if it uses fewer transfers than every label already settled there. That single "fewest transfers so far" number per state is enough to discard dominated labels, both when popping and when pushing, and the same test against the labels settled at 'dst' stops the search once no better trade-off is possible.
+
+        Example:
+            for cost, transfers, path in tg.pareto_routes(seoul, gangnam, transfer_cost = 5):
+                print(cost, transfers, [f'{v}({line})' for v, line in path])
+        """
+        if src not in self.states_of or dst not in self.states_of:
+            return []
+        offsets, targets, weights, is_transfer = self.offsets, self.targets, self.weights, self.is_transfer
+        goal = set(self.states_of[dst])
+
+        labels = [] # (state, cost, transfers, parent label)
+        heap = []
+        for s in self.states_of[src]:
+            labels.append((s, 0, 0, -1))
+            heappush(heap, (0, 0, len(labels) - 1))
+
+        fewest = {}
+        goal_fewest = math.inf
+        found = []
+        while heap:
+            cost, k, label = heappop(heap)
+            i = labels[label][0]
+            if k >= fewest.get(i, math.inf) or k >= goal_fewest:
+                continue
+            fewest[i] = k
+            if i in goal:
+                goal_fewest = k
+                found.append(label)
+                continue
+            for pos in range(offsets[i], offsets[i + 1]):
+                j = targets[pos]
+                nk = k + is_transfer[pos]
+                if max_transfers is not None and nk > max_transfers:
+                    continue
+                if nk >= fewest.get(j, math.inf) or nk >= goal_fewest:
+                    continue
+                ncost = cost + weights[pos] + transfer_cost * is_transfer[pos]
+                labels.append((j, ncost, nk, label))
+                heappush(heap, (ncost, nk, len(labels) - 1))
+
+        routes = []
+        for label in found:
+            _, cost, k, _ = labels[label]
+            path = []
+            while label != -1:
+                path.append(self.states[labels[label][0]])
+                label = labels[label][3]
+            path.reverse()
+            routes.append((cost, k, path))
+        return routes
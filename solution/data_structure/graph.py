@@ -1,3 +1,8 @@
+try:
+    from data_structure.interning import VertexInterner
+except ModuleNotFoundError:
+    from interning import VertexInterner
+
 class Vertex:
     """
     Represents a vertex in the graph.
@@ -57,52 +62,145 @@ class Edge:
             return self.from_vertex == other.from_vertex and self.to_vertex == other.to_vertex
 
 
+def common_weight_keys(edges):
+    """
+    Returns the keys of Edge.data present on every edge, in the order of the first edge ([] if there are no edges).
+    """
+    edges = list(edges)
+    if not edges:
+        return []
+    return [k for k in edges[0].data if all(k in e.data for e in edges)]
+
 class AdjList:
     """
     Represents an adjacency list for graph representation.
 
     Attributes:
-    - adj_list (dict): A dictionary mapping each vertex to a list of its neighboring vertices.
+    - ids (VertexInterner): The integer id of every vertex.
+    - adj_list (list of dict): For every vertex id, a dictionary {neighbor id: multiplicity}, the number of parallel edges to that neighbor.
+    - in_adj (list of dict): For every vertex id, a dictionary {predecessor id: multiplicity}, the reverse of adj_list.
+    - weight_keys (list of str): The edge attributes (keys of Edge.data) kept in 'weights'.
+    - weights (dict): A dictionary mapping each weight key to a list of dictionaries {neighbor id: weight} parallel to adj_list. A neighbor reached by parallel edges maps to the list of their weights.
 
     Detailed Explanation:
-    An adjacency list represents a graph by maintaining a list of adjacent vertices for each vertex. It's efficient for sparse graphs and allows for quick lookup of neighbors.
+    An adjacency list represents a graph by maintaining the adjacent vertices of each vertex. It's efficient for sparse graphs and allows for quick lookup of neighbors.
+
+    Neighbors are kept in hashed dictionaries rather than lists, so an edge is found, added or removed in O(1), and parallel edges are counted instead of stored twice. The reverse index in_adj records who points to each vertex, so removing a vertex only visits its own neighbors and predecessors, O(degree), instead of every neighbor list of the graph.
+
+    Edge payloads are kept as one plain number per (vertex, neighbor) and weight key, in dictionaries with the same keys as the neighbor dictionaries, instead of one Edge object per neighbor. get_weighted_neighbors returns the (neighbor, weight) pairs of a vertex straight from them, so a weighted traversal does not have to look the edge up again.
+
+    Vertices are interned (VertexInterner): every public method hashes the Vertex objects it is given once, and the dictionaries inside hold integer ids, so adding, finding or removing an edge costs C-level int hashing instead of several calls to Vertex.__hash__. Returned vertices are read back from the interner's list by id.
 
     Practical Usages:
     Adjacency lists are commonly used in graph algorithms where space efficiency is important, such as representing social networks or the World Wide Web.
 
     """
-    def __init__(self, V, E):
+    def __init__(self, V, E, weight_keys = None):
         """
         Initializes the adjacency list representation of a graph.
 
         Parameters:
         - V (list of Vertex): A list of Vertex instances representing the vertices of the graph.
         - E (list of Edge): A list of Edge instances representing the edges of the graph.
+        - weight_keys (list of str, optional): The edge attributes to keep. Defaults to the keys of Edge.data present on every edge of E, or if E is empty to the keys of the first edge added. Every edge added later must carry them.
 
         Returns:
         - None
 
         Detailed Explanation:
-        This method initializes the adjacency list by creating a dictionary where each vertex maps to a list of its neighboring vertices. It populates the adjacency list based on the provided edges, considering whether the edges are directed or undirected.
+        This method initializes the adjacency list by creating, for each vertex, an empty dictionary of neighbors and one of predecessors. It populates them based on the provided edges, considering whether the edges are directed or undirected.
 
         Implementation Steps:
-        1. Create an empty adjacency list for each vertex in V.
-        2. Iterate over each edge in E:
-           - Add the 'to_vertex' to the adjacency list of 'from_vertex'.
-           - If the edge is undirected, also add the 'from_vertex' to the adjacency list of 'to_vertex'.
+        1. Intern the vertices of V, which gives them the ids 0 .. len(V) - 1.
+        2. Create empty neighbor, predecessor and weight dictionaries for each id.
+        3. Add each edge in E with add_edge.
 
         Example:
             v1 = Vertex(1, 'A')
             v2 = Vertex(2, 'B')
             e1 = Edge(v1, v2)
             adj_list = AdjList([v1, v2], [e1])
-            # adj_list.adj_list will be {v1: [v2], v2: []} for a directed edge.
-        """
-        self.adj_list = {v: [] for v in V}
+            # adj_list.adj_list will be [{1: 1}, {}] for a directed edge.
+        """
+        # keys inferred from no edge at all are taken from the first edge added instead
+        self._infer_weight_keys = weight_keys is None and not E
+        if weight_keys is None:
+            weight_keys = common_weight_keys(E)
+        self.ids = VertexInterner(V)
+        n = self.ids.capacity()
+        self.adj_list = [{} for _ in range(n)]
+        self.in_adj = [{} for _ in range(n)]
+        self.weight_keys = list(weight_keys)
+        self.weights = {k: [{} for _ in range(n)] for k in self.weight_keys}
         for e in E:
-            self.adj_list[e.from_vertex].append(e.to_vertex)
-            if not e.is_directed:
-                self.adj_list[e.to_vertex].append(e.from_vertex)
+            self.add_edge(e)
+
+    @classmethod
+    def from_arrays(cls, V, sources, targets, is_directed = True, weights = None):
+        """
+        Builds an adjacency list from integer endpoint arrays in one pass, without creating Edge instances.
+
+        Parameters:
+        - V (list of Vertex): The vertices. Endpoints are positions in this list.
+        - sources, targets (numpy.ndarray or sequence of int): The endpoints of every edge.
+        - is_directed (bool, optional): Whether all the edges are directed. Defaults to True.
+        - weights (dict, optional): A dictionary mapping each weight key to the weights of the edges, parallel to 'sources'.
+
+        Returns:
+        - AdjList: The same adjacency list as AdjList(V, E) with the corresponding edges.
+
+        Detailed Explanation:
+        Calling add_edge once per edge costs a few dictionary updates and two Vertex hashes each. Here the arcs are encoded as integers source * n + target and sorted once with NumPy, which groups parallel arcs (their multiplicity is the group size) and groups the arcs of each vertex. The positions in V are the ids of the vertices, so every neighbor dictionary is built in a single dict(zip(...)) call over ints, without hashing any Vertex, and the predecessor dictionaries the same way from the arcs sorted by target.
+
+        Example:
+            adj_list = AdjList.from_arrays(V, np.array([0, 1]), np.array([1, 2]), weights = {'time': np.array([3, 4])})
+        """
+        import numpy as np
+        weights = weights or {}
+        n = len(V)
+        s = np.asarray(sources, dtype = np.int64)
+        t = np.asarray(targets, dtype = np.int64)
+        columns = {k: np.asarray(w) for k, w in weights.items()}
+        if not is_directed:
+            # both arcs of every edge, interleaved so that they come in the order add_edge would store them
+            s, t = np.stack((s, t), axis = 1).ravel(), np.stack((t, s), axis = 1).ravel()
+            columns = {k: np.repeat(w, 2) for k, w in columns.items()}
+        adj = cls(V, [], weight_keys = list(columns))
+        if len(s) == 0:
+            return adj
+
+        # group equal arcs: one entry per (source, target) pair, sorted by source
+        order = np.argsort(s * n + t, kind = 'stable')
+        s, t = s[order], t[order]
+        starts = np.flatnonzero(np.concatenate(([True], (s[1:] != s[:-1]) | (t[1:] != t[:-1]))))
+        counts = np.diff(np.append(starts, len(s)))
+        pair_s, pair_t = s[starts], t[starts]
+        values = {}
+        for k, w in columns.items():
+            w = w[order]
+            values[k] = w[starts].tolist()
+            for j in np.flatnonzero(counts > 1).tolist():
+                values[k][j] = w[starts[j]:starts[j] + counts[j]].tolist()
+        # ids from tolist() would be a fresh int object per arc: reuse the interned ones
+        ids = adj.ids.live_ids()
+        neighbors = [ids[j] for j in pair_t.tolist()]
+        counts_list = counts.tolist()
+        bounds = np.flatnonzero(np.concatenate(([True], pair_s[1:] != pair_s[:-1], [True]))).tolist()
+        for a, b in zip(bounds, bounds[1:]):
+            u = int(pair_s[a])
+            adj.adj_list[u] = dict(zip(neighbors[a:b], counts_list[a:b]))
+            for k in columns:
+                adj.weights[k][u] = dict(zip(neighbors[a:b], values[k][a:b]))
+
+        # the same pairs sorted by target give the predecessor dictionaries
+        order = np.argsort(pair_t * n + pair_s, kind = 'stable')
+        pair_s, pair_t = pair_s[order], pair_t[order]
+        predecessors = [ids[j] for j in pair_s.tolist()]
+        counts_list = counts[order].tolist()
+        bounds = np.flatnonzero(np.concatenate(([True], pair_t[1:] != pair_t[:-1], [True]))).tolist()
+        for a, b in zip(bounds, bounds[1:]):
+            adj.in_adj[ids[pair_t[a]]] = dict(zip(predecessors[a:b], counts_list[a:b]))
+        return adj
 
     def add_vertex(self, v):
         """
@@ -114,22 +212,28 @@ class AdjList:
         Returns:
         - None
 
-        Detailed Explanation:
-        This method adds a new vertex to the adjacency list. If the vertex already exists, it does nothing.
+        Raises:
+        - ValueError: If the vertex is already in the graph.
 
         Implementation Steps:
-        1. Check if the vertex 'v' is not already in the adjacency list.
-        2. If not, add 'v' to the adjacency list with an empty list of neighbors.
+        1. Check if the vertex 'v' is not already interned.
+        2. If not, intern it and give its id empty neighbor and predecessor dictionaries, reusing the slot of a removed vertex if there is one.
 
         Example:
             v3 = Vertex(3, 'C')
             adj_list.add_vertex(v3)
-            # Now adj_list.adj_list includes v3: []
+            # Now adj_list.adj_list has an empty dictionary for the id of v3
         """
-        if v not in self.adj_list:
-            self.adj_list[v] = []
-        else:
+        if v in self.ids.index:
             raise ValueError('Already in graph')
+        i = self.ids.intern(v)
+        tables = [self.adj_list, self.in_adj, *self.weights.values()]
+        if i == len(self.adj_list):
+            for table in tables:
+                table.append({})
+        else:
+            for table in tables:
+                table[i] = {}
 
     def remove_vertex(self, v):
         """
@@ -142,22 +246,75 @@ class AdjList:
         - None
 
         Detailed Explanation:
-        This method removes the specified vertex from the adjacency list and also removes it from the neighbor lists of other vertices.
+        This method removes the specified vertex and removes it from the neighbors of its predecessors and the predecessors of its neighbors. Only those vertices are visited, so it runs in O(degree).
 
         Implementation Steps:
-        1. Remove the vertex 'v' from the adjacency list.
-        2. Iterate over all the neighbor lists in the adjacency list:
-           - Remove 'v' from any neighbor lists where it appears.
+        1. For each predecessor 'u' of 'v', delete 'v' from the neighbors of 'u'.
+        2. For each neighbor 'w' of 'v', delete 'v' from the predecessors of 'w'.
+        3. Empty the dictionaries of 'v' (and the weights stored under the same id) and release its id.
 
         Example:
             adj_list.remove_vertex(v1)
             # Vertex v1 and all edges connected to it are removed from adj_list.adj_list.
         """
-        if v in self.adj_list:
-            del self.adj_list[v]
-            for neighbors in self.adj_list.values():
-                while v in neighbors:
-                    neighbors.remove(v)
+        i = self.ids.index.get(v)
+        if i is not None:
+            for u in self.in_adj[i]:
+                if u != i:
+                    del self.adj_list[u][i]
+                    for weights in self.weights.values():
+                        del weights[u][i]
+            for w in self.adj_list[i]:
+                if w != i:
+                    del self.in_adj[w][i]
+            self.adj_list[i] = {}
+            self.in_adj[i] = {}
+            for weights in self.weights.values():
+                weights[i] = {}
+            self.ids.release(v)
+
+    def _payload(self, e):
+        # the tracked attributes of 'e', read before anything is mutated
+        return [e.data[k] for k in self.weight_keys]
+
+    def _link(self, u, w, payload):
+        neighbors, predecessors = self.adj_list[u], self.in_adj[w]
+        count = neighbors.get(w, 0)
+        neighbors[w] = count + 1
+        predecessors[u] = predecessors.get(u, 0) + 1
+        for k, value in zip(self.weight_keys, payload):
+            row = self.weights[k][u]
+            if count == 0:
+                row[w] = value
+            elif count == 1:
+                row[w] = [row[w], value]
+            else:
+                row[w].append(value)
+
+    def _unlink(self, u, w, data):
+        neighbors = self.adj_list[u]
+        if w not in neighbors:
+            return
+        predecessors = self.in_adj[w]
+        count = neighbors[w]
+        if count == 1:
+            del neighbors[w]
+            del predecessors[u]
+        else:
+            neighbors[w] -= 1
+            predecessors[u] -= 1
+        rows = [self.weights[k][u] for k in self.weight_keys]
+        if count == 1:
+            for row in rows:
+                del row[w]
+            return
+        # among parallel edges, drop the one whose weights match 'data' (missing keys match anything), else the last one
+        columns = list(zip(self.weight_keys, [row[w] for row in rows]))
+        i = next((i for i in range(count) if all(values[i] == data.get(k, values[i]) for k, values in columns)), count - 1)
+        for row, (_, values) in zip(rows, columns):
+            del values[i]
+            if count == 2:
+                row[w] = values[0]
 
     def add_edge(self, e):
         """
@@ -169,21 +326,30 @@ class AdjList:
         Returns:
         - None
 
+        Raises:
+        - KeyError: If an endpoint of 'e' is not in the graph or 'e' lacks one of the weight keys. Nothing is changed then.
+
         Detailed Explanation:
-        This method updates the adjacency list to include the new edge, considering whether it's directed or undirected.
+        This method increments the multiplicity of 'e.to_vertex' among the neighbors of 'e.from_vertex', and of the reverse pair if the edge is undirected, and records the weights of the edge next to it. O(1).
 
         Implementation Steps:
-        1. Add 'e.to_vertex' to the adjacency list of 'e.from_vertex'.
-        2. If the edge is undirected, also add 'e.from_vertex' to the adjacency list of 'e.to_vertex'.
+        1. Count 'e.to_vertex' as a neighbor of 'e.from_vertex' and store its weights.
+        2. If the edge is undirected, also count 'e.from_vertex' as a neighbor of 'e.to_vertex'.
 
         Example:
             e2 = Edge(v1, v3)
             adj_list.add_edge(e2)
             # adj_list.adj_list[v1] will now include v3.
         """
-        self.adj_list[e.from_vertex].append(e.to_vertex)
+        u, w = self.ids.index[e.from_vertex], self.ids.index[e.to_vertex]
+        if self._infer_weight_keys:
+            self._infer_weight_keys = False
+            self.weight_keys = list(e.data)
+            self.weights = {k: [{} for _ in range(self.ids.capacity())] for k in self.weight_keys}
+        payload = self._payload(e)
+        self._link(u, w, payload)
         if not e.is_directed:
-            self.adj_list[e.to_vertex].append(e.from_vertex)
+            self._link(w, u, payload)
 
     def remove_edge(self, e):
         """
@@ -196,20 +362,29 @@ class AdjList:
         - None
 
         Detailed Explanation:
-        This method updates the adjacency list to remove the specified edge, considering whether it's directed or undirected.
+        This method decrements the multiplicity of the edge, considering whether it's directed or undirected, and forgets the neighbor when it reaches 0. O(1). Among parallel edges, the one whose weights match 'e.data' is removed.
 
         Implementation Steps:
-        1. Remove 'e.to_vertex' from the adjacency list of 'e.from_vertex' if it exists.
-        2. If the edge is undirected, also remove 'e.from_vertex' from the adjacency list of 'e.to_vertex'.
+        1. Remove one 'e.to_vertex' from the neighbors of 'e.from_vertex' if it exists.
+        2. If the edge is undirected, also remove one 'e.from_vertex' from the neighbors of 'e.to_vertex'.
 
         Example:
             adj_list.remove_edge(e1)
             # The edge from v1 to v2 is removed from adj_list.adj_list.
         """
-        if e.to_vertex in self.adj_list[e.from_vertex]:
-            self.adj_list[e.from_vertex].remove(e.to_vertex)
-        if not e.is_directed and e.from_vertex in self.adj_list[e.to_vertex]:
-            self.adj_list[e.to_vertex].remove(e.from_vertex)
+        u, w = self.ids.index[e.from_vertex], self.ids.index.get(e.to_vertex)
+        if w is None:
+            return
+        self._unlink(u, w, e.data)
+        if not e.is_directed:
+            self._unlink(w, u, e.data)
+
+    def has_edge(self, e):
+        """
+        Checks in O(1) whether 'e.to_vertex' is a neighbor of 'e.from_vertex'.
+        """
+        u, w = self.ids.index.get(e.from_vertex), self.ids.index.get(e.to_vertex)
+        return u is not None and w is not None and w in self.adj_list[u]
 
     def get_vertices(self):
         """
@@ -222,13 +397,13 @@ class AdjList:
         - list of Vertex: A list of all vertices in the graph.
 
         Implementation Steps:
-        1. Return the list of keys from the adjacency list dictionary.
+        1. Return the interned vertices, in the order they were added.
 
         Example:
             vertices = adj_list.get_vertices()
             # vertices will be a list of all Vertex instances in the graph.
         """
-        return list(self.adj_list.keys())
+        return list(self.ids)
 
     def get_edges(self):
         """
@@ -241,28 +416,33 @@ class AdjList:
         - list of Edge: A list of all edges in the graph.
 
         Detailed Explanation:
-        This method reconstructs the list of edges by examining the adjacency list.
+        This method reconstructs the list of edges by examining the adjacency list. The edges carry the stored weights as their data.
 
         Implementation Steps:
-        1. Initialize an empty list to store edges.
-        2. Iterate over each vertex 'v' and its neighbors in the adjacency list:
-           - For each neighbor, create an Edge instance from 'v' to the neighbor.
-           - Append the Edge instance to the edges list.
-        3. For undirected graphs, ensure that each edge is only added once to avoid duplicates.
+        1. Collect the edges yielded by iter_edges, which iterates over each vertex 'v' and its neighbors in the adjacency list:
+           - For each neighbor, create as many Edge instances from 'v' to the neighbor as its multiplicity.
+        2. For undirected graphs, ensure that each edge is only added once to avoid duplicates.
 
         Example:
             edges = adj_list.get_edges()
             # edges will contain all Edge instances in the graph.
         """
-        edges = []
+        return list(self.iter_edges())
+
+    def iter_edges(self):
+        """
+        Lazily yields the edges of get_edges, in the same order, without building the list.
+        """
         seen = set()
-        for v, neighbors in self.adj_list.items():
-            for neighbor in neighbors:
-                edge = Edge(v, neighbor)
-                if (neighbor, v) not in seen:
-                    edges.append(edge)
-                    seen.add((v, neighbor))
-        return edges
+        vertices = self.ids.vertices
+        for v, u in self.ids.index.items():
+            rows = [(k, self.weights[k][u]) for k in self.weight_keys]
+            for neighbor, count in self.adj_list[u].items():
+                if (neighbor, u) not in seen:
+                    for i in range(count):
+                        data = {k: row[neighbor][i] if count > 1 else row[neighbor] for k, row in rows}
+                        yield Edge(v, vertices[neighbor], **data)
+                    seen.add((u, neighbor))
 
     def get_neighbors(self, v):
         """
@@ -272,53 +452,124 @@ class AdjList:
         - v (Vertex): The vertex whose neighbors are to be retrieved.
 
         Returns:
-        - list of Vertex: A list of neighboring vertices.
+        - list of Vertex: A list of neighboring vertices, a neighbor appearing once per parallel edge.
 
         Implementation Steps:
-        1. Return the adjacency list for the vertex 'v'.
+        1. Expand the neighbor dictionary of the id of 'v' by multiplicity.
+        2. Map the neighbor ids back to vertices.
 
         Example:
             neighbors = adj_list.get_neighbors(v1)
             # neighbors will be a list of Vertex instances adjacent to v1.
         """
-        return self.adj_list.get(v, [])
+        i = self.ids.index.get(v)
+        if i is None:
+            return []
+        neighbors, vertices = self.adj_list[i], self.ids.vertices
+        if len(neighbors) < sum(neighbors.values()):
+            return [vertices[n] for n, count in neighbors.items() for _ in range(count)]
+        return [vertices[n] for n in neighbors]
+
+    def iter_neighbors(self, v):
+        """
+        Lazily yields the neighbors of get_neighbors, in the same order, without building the list.
+        """
+        i = self.ids.index.get(v)
+        if i is None:
+            return
+        vertices = self.ids.vertices
+        for n, count in self.adj_list[i].items():
+            for _ in range(count):
+                yield vertices[n]
+
+    def get_weighted_neighbors(self, v, key):
+        """
+        Retrieves the neighbors of a given vertex together with the weights of the edges leading to them.
+
+        Parameters:
+        - v (Vertex): The vertex whose neighbors are to be retrieved.
+        - key (str): The weight key, one of 'weight_keys'.
+
+        Returns:
+        - list of tuple: (neighbor, weight) pairs, a neighbor appearing once per parallel edge.
+
+        Raises:
+        - KeyError: If 'key' is not one of the weight keys.
+
+        Example:
+            for neighbor, time in adj_list.get_weighted_neighbors(v1, 'time'):
+                ...
+        """
+        if key not in self.weights:
+            raise KeyError(f'{key!r} is not a weight key of this graph')
+        i = self.ids.index.get(v)
+        if i is None:
+            return []
+        row, neighbors, vertices = self.weights[key][i], self.adj_list[i], self.ids.vertices
+        if len(neighbors) < sum(neighbors.values()):
+            # the multiplicity, not the type of the payload, tells a list of parallel weights from one list-valued weight
+            return [(vertices[n], w) for n, count in neighbors.items() for w in (row[n] if count > 1 else [row[n]])]
+        return [(vertices[n], w) for n, w in row.items()]
+
+    def iter_arcs(self, v):
+        """
+        Lazily yields a (neighbor, data) pair per arc leaving 'v', in the order of get_neighbors, 'data' mapping every weight key to the weight of that arc.
+        """
+        i = self.ids.index.get(v)
+        if i is None:
+            return
+        rows, vertices = [(k, self.weights[k][i]) for k in self.weight_keys], self.ids.vertices
+        for n, count in self.adj_list[i].items():
+            for j in range(count):
+                yield vertices[n], {k: row[n][j] if count > 1 else row[n] for k, row in rows}
 
 class AdjMatrix:
     """
     Represents an adjacency matrix for graph representation.
 
     Attributes:
-    - vertices (list): List of vertices.
-    - matrix (list of lists): A 2D list representing the adjacency matrix.
+    - ids (VertexInterner): The slot of every vertex. A removed vertex leaves a tombstone (None) in its slot until a new vertex reuses it.
+    - capacity (int): Number of slots, a multiple of 64; the matrix is capacity x capacity.
+    - bits (bytearray): The matrix as packed bitsets, one row of capacity / 8 bytes per slot. Cell [i][j] is bit (j % 8) of byte i * capacity / 8 + j // 8.
+    - weight_keys (list of str): The edge attributes (keys of Edge.data) kept in 'weights'.
+    - weights (dict): A dictionary mapping each weight key to a capacity x capacity float32 numpy matrix of edge weights.
 
     Detailed Explanation:
-    An adjacency matrix uses a 2D array to represent a graph, where each cell [i][j] indicates the presence (and possibly weight) of an edge from vertex i to vertex j. It's efficient for dense graphs.
+    An adjacency matrix uses a 2D array to represent a graph, where each cell [i][j] indicates the presence of an edge from vertex i to vertex j. It's efficient for dense graphs.
+
+    Cells are single bits, so a graph of 10^4 vertices takes 12.5 MB instead of the 800 MB of pointers of a list of lists. Single cells are set and tested on the bytearray directly; everything that touches whole rows or columns goes through a NumPy view of the same memory: neighbor lists with np.flatnonzero, degrees, and reachability or transitive closure computed 64 cells at a time on uint64 words.
+
+    Edge payloads are opt-in: only the keys named in 'weight_keys' are stored, each in a dense float32 matrix indexed by the same slots as the bits. A weight matrix takes 32 times the memory of the bits (400 MB per key for 10^4 vertices), so by default none is allocated. float32 holds integers up to 2^24 exactly and other values to about 7 significant digits. get_weighted_neighbors gathers the weights of a row with the same NumPy index that finds its neighbors. A matrix holds one edge per cell, so of parallel edges only the last one added keeps its weight.
+
+    The matrix is allocated with spare capacity, which doubles when it runs out, so adding vertices copies the matrix O(log n) times in total instead of growing every row each time. Removing a vertex clears its row and column and leaves a tombstone instead of shifting the indices of all later vertices; the freed slot is reused by the next added vertex.
 
     Practical Usages:
     Adjacency matrices are suitable when the graph is dense, and quick edge existence checks are required, such as in network routing algorithms.
 
     """
-    def __init__(self, V, E):
+    MIN_CAPACITY = 64
+
+    def __init__(self, V, E, weight_keys = ()):
         """
         Initializes the adjacency matrix representation of a graph.
 
         Parameters:
         - V (list of Vertex): A list of Vertex instances representing the vertices of the graph.
         - E (list of Edge): A list of Edge instances representing the edges of the graph.
+        - weight_keys (list of str, optional): The edge attributes to keep, each in a float32 weight matrix of 4 bytes per cell. Defaults to none; None also stores none. Every edge added must carry them.
 
         Returns:
         - None
 
         Detailed Explanation:
-        This method creates a 2D matrix to represent the graph. Each cell [i][j] corresponds to an edge from vertex 'i' to vertex 'j'.
+        This method creates a zeroed bit matrix with room for at least len(V) vertices. Each cell [i][j] corresponds to an edge from vertex 'i' to vertex 'j'.
 
         Implementation Steps:
-        1. Store a copy of the vertices list.
-        2. Create a mapping from each vertex to its index in the list.
-        3. Initialize an n x n matrix with zeros, where n is the number of vertices.
-        4. Iterate over each edge in E:
-           - Set matrix[i][j] = 1, where 'i' and 'j' are indices of 'from_vertex' and 'to_vertex'.
-           - If the edge is undirected, also set matrix[j][i] = 1.
+        1. Intern the vertices: the slot of a vertex is its position in V.
+        2. Allocate a capacity x capacity zeroed bit matrix (and a weight matrix per weight key).
+        3. Iterate over each edge in E:
+           - Set cell [i][j] = 1, where 'i' and 'j' are indices of 'from_vertex' and 'to_vertex'.
+           - If the edge is undirected, also set cell [j][i] = 1.
 
         Example:
             v1 = Vertex(1, 'A')
@@ -327,16 +578,89 @@ class AdjMatrix:
             adj_matrix = AdjMatrix([v1, v2], [e1])
             # adj_matrix.matrix will be [[0, 1], [0, 0]] for a directed edge from 'A' to 'B'.
         """
-        self.vertices = V.copy()
-        self.vertex_indices = {v: i for i, v in enumerate(V)}
-        n = len(V)
-        self.matrix = [[0] * n for _ in range(n)]
+        self.ids = VertexInterner(V)
+        self.capacity = max(self.MIN_CAPACITY, -(-self.ids.capacity() // 64) * 64)
+        self.bits = bytearray(self.capacity * self.capacity // 8)
+        self.weight_keys = list(weight_keys or ())
+        self.weights = {}
+        if self.weight_keys:
+            import numpy as np
+            self.weights = {k: np.zeros((self.capacity, self.capacity), dtype = np.float32) for k in self.weight_keys}
         for e in E:
-            i = self.vertex_indices[e.from_vertex]
-            j = self.vertex_indices[e.to_vertex]
-            self.matrix[i][j] = 1
-            if not e.is_directed:
-                self.matrix[j][i] = 1
+            self.add_edge(e)
+
+    @classmethod
+    def from_arrays(cls, V, sources, targets, is_directed = True, weights = None):
+        """
+        Builds an adjacency matrix from integer endpoint arrays in one pass, without creating Edge instances.
+
+        Parameters:
+        - V (list of Vertex): The vertices. Endpoints are positions in this list, which are also their slots.
+        - sources, targets (numpy.ndarray or sequence of int): The endpoints of every edge.
+        - is_directed (bool, optional): Whether all the edges are directed. Defaults to True.
+        - weights (dict, optional): A dictionary mapping each weight key to the weights of the edges, parallel to 'sources'.
+
+        Returns:
+        - AdjMatrix: The same adjacency matrix as AdjMatrix(V, E) with the corresponding edges.
+
+        Detailed Explanation:
+        All the bits are set with a single numpy.bitwise_or.at over the packed rows and all the weights with one fancy-indexed assignment per key, so no Python code runs per edge.
+
+        Example:
+            adj_matrix = AdjMatrix.from_arrays(V, np.array([0, 1]), np.array([1, 2]))
+        """
+        import numpy as np
+        weights = weights or {}
+        s = np.asarray(sources, dtype = np.int64)
+        t = np.asarray(targets, dtype = np.int64)
+        columns = {k: np.asarray(w) for k, w in weights.items()}
+        if not is_directed:
+            # both arcs of every edge, interleaved so that they come in the order add_edge would store them
+            s, t = np.stack((s, t), axis = 1).ravel(), np.stack((t, s), axis = 1).ravel()
+            columns = {k: np.repeat(w, 2) for k, w in columns.items()}
+        matrix = cls(V, [], weight_keys = list(columns))
+        np.bitwise_or.at(matrix._view(), (s, t >> 3), np.left_shift(1, t & 7).astype(np.uint8))
+        for k, w in columns.items():
+            matrix.weights[k][s, t] = w
+        return matrix
+
+    def _view(self):
+        # (capacity, capacity / 8) uint8 NumPy view of 'bits', no copy
+        import numpy as np
+        return np.frombuffer(self.bits, dtype = np.uint8).reshape(self.capacity, self.capacity // 8)
+
+    def _live_slots(self):
+        import numpy as np
+        return np.fromiter(self.ids.index.values(), dtype = np.int64, count = len(self.ids))
+
+    def _set(self, i, j, value):
+        pos = i * (self.capacity >> 3) + (j >> 3)
+        if value:
+            self.bits[pos] |= 1 << (j & 7)
+        else:
+            self.bits[pos] &= ~(1 << (j & 7)) & 0xFF
+
+    def _get(self, i, j):
+        return self.bits[i * (self.capacity >> 3) + (j >> 3)] >> (j & 7) & 1
+
+    @property
+    def matrix(self):
+        """
+        The matrix restricted to the live vertices, in get_vertices order, as a list of lists.
+        """
+        slots = self.ids.live_ids()
+        return [[self._get(i, j) for j in slots] for i in slots]
+
+    def _grow(self):
+        import numpy as np
+        old_view, cap = self._view(), self.capacity
+        self.capacity = cap * 2
+        self.bits = bytearray(self.capacity * self.capacity // 8)
+        self._view()[:cap, :cap // 8] = old_view
+        for k, old in self.weights.items():
+            weights = np.zeros((self.capacity, self.capacity), dtype = np.float32)
+            weights[:cap, :cap] = old
+            self.weights[k] = weights
 
     def add_vertex(self, v):
         """
@@ -349,28 +673,22 @@ class AdjMatrix:
         - None
 
         Detailed Explanation:
-        This method adds a new vertex to the vertices list and updates the adjacency matrix accordingly.
+        This method gives the new vertex a tombstoned slot if there is one, or the next unused slot otherwise. Slots are kept zeroed, so nothing else is written. The matrix is only reallocated, to twice its capacity, when every slot is taken, which makes additions amortized O(1) plus O(n) per doubling.
 
         Implementation Steps:
-        1. Check if the vertex 'v' is not already in the vertex indices.
-        2. Append 'v' to the vertices list.
-        3. Update the vertex indices mapping.
-        4. Add a new row and column to the matrix:
-           - Append '0' to each existing row.
-           - Append a new row with zeros.
+        1. Check if the vertex 'v' is not already interned.
+        2. If every slot is taken, double the capacity.
+        3. Intern 'v', which gives it a free slot or the next unused one.
 
         Example:
             v3 = Vertex(3, 'C')
             adj_matrix.add_vertex(v3)
             # The matrix now includes 'v3' as a new row and column.
         """
-        if v not in self.vertex_indices:
-            self.vertex_indices[v] = len(self.vertices)
-            self.vertices.append(v)
-            n = len(self.vertices)
-            for row in self.matrix:
-                row.append(0)
-            self.matrix.append([0] * n)
+        if v not in self.ids.index:
+            if not self.ids.free and self.ids.capacity() == self.capacity:
+                self._grow()
+            self.ids.intern(v)
 
     def remove_vertex(self, v):
         """
@@ -383,25 +701,21 @@ class AdjMatrix:
         - None
 
         Detailed Explanation:
-        This method removes the vertex from the vertices list, updates the matrix, and rebuilds the vertex indices mapping.
+        This method zeroes the row and the column of the vertex and leaves a tombstone in its slot. The other vertices keep their slots, so no index has to be rebuilt.
 
         Implementation Steps:
-        1. Find the index of 'v' in the vertices list.
-        2. Remove 'v' from the vertices list.
-        3. Remove the corresponding row and column from the matrix.
-        4. Rebuild the vertex indices mapping.
+        1. Release 'v', which leaves a tombstone in its slot 'idx' and makes it free.
+        2. Zero row 'idx' with a slice assignment and bit 'idx' of every row with one vectorized AND.
 
         Example:
             adj_matrix.remove_vertex(v1)
             # Vertex 'v1' and its edges are removed from the graph.
         """
-        if v in self.vertex_indices:
-            idx = self.vertex_indices[v]
-            self.vertices.pop(idx)
-            self.matrix.pop(idx)
-            for row in self.matrix:
-                row.pop(idx)
-            self.vertex_indices = {vertex: i for i, vertex in enumerate(self.vertices)}
+        if v in self.ids.index:
+            idx = self.ids.release(v)
+            view = self._view()
+            view[idx] = 0
+            view[:, idx >> 3] &= ~(1 << (idx & 7)) & 0xFF
 
     def add_edge(self, e):
         """
@@ -413,24 +727,26 @@ class AdjMatrix:
         Returns:
         - None
 
-        Detailed Explanation:
-        This method updates the matrix to represent the new edge.
-
         Implementation Steps:
         1. Retrieve the indices of 'from_vertex' and 'to_vertex'.
-        2. Set matrix[i][j] = 1.
-        3. If the edge is undirected, also set matrix[j][i] = 1.
+        2. Set cell [i][j] = 1 (and store the weight, if any).
+        3. If the edge is undirected, also set cell [j][i] = 1.
 
         Example:
             e2 = Edge(v2, v3)
             adj_matrix.add_edge(e2)
             # The matrix is updated to include the new edge.
         """
-        i = self.vertex_indices[e.from_vertex]
-        j = self.vertex_indices[e.to_vertex]
-        self.matrix[i][j] = 1
+        i = self.ids.index[e.from_vertex]
+        j = self.ids.index[e.to_vertex]
+        payload = [e.data[k] for k in self.weight_keys]
+        self._set(i, j, 1)
+        for k, value in zip(self.weight_keys, payload):
+            self.weights[k][i, j] = value
         if not e.is_directed:
-            self.matrix[j][i] = 1
+            self._set(j, i, 1)
+            for k, value in zip(self.weight_keys, payload):
+                self.weights[k][j, i] = value
 
     def remove_edge(self, e):
         """
@@ -442,23 +758,35 @@ class AdjMatrix:
         Returns:
         - None
 
-        Detailed Explanation:
-        This method updates the matrix to remove the specified edge.
-
         Implementation Steps:
         1. Retrieve the indices of 'from_vertex' and 'to_vertex'.
-        2. Set matrix[i][j] = 0.
-        3. If the edge is undirected, also set matrix[j][i] = 0.
+        2. Set cell [i][j] = 0.
+        3. If the edge is undirected, also set cell [j][i] = 0.
 
         Example:
             adj_matrix.remove_edge(e1)
             # The edge is removed from the matrix.
         """
-        i = self.vertex_indices[e.from_vertex]
-        j = self.vertex_indices[e.to_vertex]
-        self.matrix[i][j] = 0
+        i = self.ids.index[e.from_vertex]
+        j = self.ids.index[e.to_vertex]
+        self._set(i, j, 0)
         if not e.is_directed:
-            self.matrix[j][i] = 0
+            self._set(j, i, 0)
+
+    def has_edge(self, e):
+        """
+        Checks in O(1) whether cell [from_vertex][to_vertex] is set.
+        """
+        i = self.ids.index.get(e.from_vertex)
+        j = self.ids.index.get(e.to_vertex)
+        return i is not None and j is not None and self._get(i, j) == 1
+
+    def get_weight(self, u, v, key):
+        """
+        Returns the 'key' attribute of the edge from 'u' to 'v', or None if there is no such edge.
+        """
+        i, j = self.ids.index[u], self.ids.index[v]
+        return float(self.weights[key][i, j]) if self._get(i, j) else None
 
     def get_vertices(self):
         """
@@ -468,16 +796,27 @@ class AdjMatrix:
         - None
 
         Returns:
-        - list of Vertex: A list of all vertices in the graph.
+        - list of Vertex: A list of all vertices in the graph, in insertion order.
 
         Implementation Steps:
-        1. Return the vertices list.
+        1. Return the interned vertices, which skips tombstones.
 
         Example:
             vertices = adj_matrix.get_vertices()
             # vertices will be a list of all Vertex instances in the graph.
         """
-        return self.vertices
+        return list(self.ids)
+
+    def _slots_of(self, packed):
+        # slots whose bit is set in a packed row; only its nonzero bytes are unpacked
+        import numpy as np
+        nonzero = np.flatnonzero(packed)
+        hits = np.flatnonzero(np.unpackbits(packed[nonzero], bitorder = 'little'))
+        return nonzero[hits >> 3] * 8 + (hits & 7)
+
+    def _to_vertices(self, slots):
+        vertices = self.ids.vertices
+        return [vertices[j] for j in slots.tolist()]
 
     def get_edges(self):
         """
@@ -490,27 +829,30 @@ class AdjMatrix:
         - list of Edge: A list of all edges in the graph.
 
         Detailed Explanation:
-        This method reconstructs the list of edges by examining the adjacency matrix.
+        This method reconstructs the list of edges by examining the adjacency matrix. The edges carry the stored weights as their data.
 
         Implementation Steps:
-        1. Initialize an empty list to store edges.
-        2. Iterate over the matrix:
-           - For each cell matrix[i][j] == 1:
+        1. Collect the edges yielded by iter_edges, which iterates over the rows of the live vertices:
+           - For each set cell [i][j]:
              - Create an Edge instance from vertices[i] to vertices[j].
-             - Append the Edge instance to the edges list.
-        3. For undirected graphs, ensure that each edge is only added once to avoid duplicates.
 
         Example:
             edges = adj_matrix.get_edges()
             # edges will contain all Edge instances in the graph.
         """
-        edges = []
-        n = len(self.vertices)
-        for i in range(n):
-            for j in range(n):
-                if self.matrix[i][j]:
-                    edges.append(Edge(self.vertices[i], self.vertices[j]))
-        return edges
+        return list(self.iter_edges())
+
+    def iter_edges(self):
+        """
+        Lazily yields the edges of get_edges, in the same order, without building the list.
+        """
+        view = self._view()
+        vertices = self.ids.vertices
+        for v, i in self.ids.index.items():
+            slots = self._slots_of(view[i])
+            columns = [(k, self.weights[k][i, slots].tolist()) for k in self.weight_keys]
+            for n, j in enumerate(slots.tolist()):
+                yield Edge(v, vertices[j], **{k: column[n] for k, column in columns})
 
     def get_neighbors(self, v):
         """
@@ -524,18 +866,139 @@ class AdjMatrix:
 
         Implementation Steps:
         1. Retrieve the index 'idx' of the vertex 'v'.
-        2. Iterate over the row matrix[idx]:
-           - For each cell where matrix[idx][j] == 1:
-             - Append vertices[j] to the neighbors list.
+        2. Find the nonzero bytes of row 'idx' with np.flatnonzero, then the set bits among them.
+        3. Map their slots back to vertices.
 
         Example:
             neighbors = adj_matrix.get_neighbors(v1)
             # neighbors will be a list of Vertex instances adjacent to v1.
         """
-        idx = self.vertex_indices[v]
-        neighbors = []
-        n = len(self.vertices)
-        for j in range(n):
-            if self.matrix[idx][j]:
-                neighbors.append(self.vertices[j])
-        return neighbors
+        return self._to_vertices(self._slots_of(self._view()[self.ids.index[v]]))
+
+    def iter_neighbors(self, v):
+        """
+        Lazily yields the neighbors of get_neighbors, in the same order, without building the list.
+        """
+        vertices = self.ids.vertices
+        for j in self._slots_of(self._view()[self.ids.index[v]]).tolist():
+            yield vertices[j]
+
+    def get_weighted_neighbors(self, v, key):
+        """
+        Retrieves the neighbors of a given vertex together with the weights of the edges leading to them.
+
+        Parameters:
+        - v (Vertex): The vertex whose neighbors are to be retrieved.
+        - key (str): The weight key, one of 'weight_keys'.
+
+        Returns:
+        - list of tuple: (neighbor, weight) pairs.
+
+        Raises:
+        - KeyError: If 'key' is not one of the weight keys.
+
+        Implementation Steps:
+        1. Find the slots of the neighbors as get_neighbors does.
+        2. Gather their weights from row 'idx' of the weight matrix with the same index array.
+
+        Example:
+            for neighbor, time in adj_matrix.get_weighted_neighbors(v1, 'time'):
+                ...
+        """
+        if key not in self.weights:
+            raise KeyError(f'{key!r} is not a weight key of this graph: an AdjMatrix only stores the weights named in weight_keys')
+        i = self.ids.index[v]
+        slots = self._slots_of(self._view()[i])
+        return list(zip(self._to_vertices(slots), self.weights[key][i, slots].tolist()))
+
+    def degrees(self, direction = 'out', block_size = 1024):
+        """
+        Computes the degree of every vertex at once.
+
+        Parameters:
+        - direction (str, optional): 'out' counts the set cells of each row, 'in' those of each column. Defaults to 'out'.
+        - block_size (int, optional): Rows unpacked at a time, bounding the temporary memory to block_size x capacity bytes.
+
+        Returns:
+        - dict: A dictionary mapping each vertex to its degree.
+
+        Example:
+            adj_matrix.degrees('in')
+            # {v1: 0, v2: 1}
+        """
+        import numpy as np
+        if direction not in ('out', 'in'):
+            raise ValueError(f'Invalid direction {direction}')
+        view, slots = self._view(), self._live_slots()
+        if direction == 'out':
+            res = np.zeros(len(slots), dtype = np.int64)
+        else:
+            res = np.zeros(self.capacity, dtype = np.int64)
+        for start in range(0, len(slots), block_size):
+            cells = np.unpackbits(view[slots[start:start + block_size]], axis = 1, bitorder = 'little')
+            if direction == 'out':
+                res[start:start + block_size] = cells.sum(axis = 1, dtype = np.int64)
+            else:
+                res += cells.sum(axis = 0, dtype = np.int64)
+        if direction == 'in':
+            res = res[slots]
+        return dict(zip(self.ids, res.tolist()))
+
+    def _words(self, view):
+        # rows as little-endian uint64 words: bit k % 64 of word k // 64 is cell k
+        return view.view('<u8')
+
+    def reachable(self, v):
+        """
+        Finds every vertex reachable from 'v', 'v' included.
+
+        Parameters:
+        - v (Vertex): The source vertex.
+
+        Returns:
+        - list of Vertex: The reachable vertices, in slot order.
+
+        Detailed Explanation:
+        This is a level-synchronous BFS on bitsets. The next frontier is the bitwise OR of the rows of the current frontier, computed in one np.bitwise_or.reduce over uint64 words, minus what was already reached. Each level costs O(|frontier| * n / 64) word operations.
+        """
+        import numpy as np
+        words = self._words(self._view())
+        s = self.ids.index[v]
+        reached = np.zeros(words.shape[1], dtype = words.dtype)
+        reached[s >> 6] |= np.uint64(1 << (s & 63))
+        frontier = np.array([s])
+        while len(frontier):
+            new = np.bitwise_or.reduce(words[frontier], axis = 0) & ~reached
+            reached |= new
+            frontier = self._slots_of(new.view(np.uint8))
+        return self._to_vertices(self._slots_of(reached.view(np.uint8)))
+
+    def transitive_closure(self):
+        """
+        Computes the transitive closure of the graph.
+
+        Parameters:
+        - None
+
+        Returns:
+        - AdjMatrix: A matrix on the same vertices where cell [u][v] is set if there is a path of one or more edges from u to v.
+
+        Detailed Explanation:
+        This is Warshall's algorithm on packed rows: for every vertex k, each row that reaches k is OR'ed with the row of k. The rows reaching k are found with one vectorized test on column k, and each OR handles 64 cells per uint64 word, so the closure costs O(n^3 / 64) word operations in the worst case and much less when few rows reach each k.
+
+        Example:
+            closure = adj_matrix.transitive_closure()
+            closure.has_edge(Edge(v1, v3))  # True if v3 can be reached from v1
+        """
+        import numpy as np
+        closure = AdjMatrix([], [])
+        closure.ids = self.ids.copy()
+        closure.capacity = self.capacity
+        closure.bits = bytearray(self.bits)
+
+        words = self._words(closure._view())
+        for k in self.ids.live_ids():
+            rows = np.flatnonzero(words[:, k >> 6] & np.uint64(1 << (k & 63)))
+            if len(rows):
+                words[rows] |= words[k]
+        return closure
@@ -0,0 +1,90 @@
+class VertexInterner:
+    """
+    Represents the mapping between the vertices of a graph and dense integer ids.
+
+    Attributes:
+    - index (dict): A dictionary mapping each live vertex to its id, in the order the vertices were added.
+    - vertices (list): The vertex of every id. A released id holds None until a new vertex reuses it.
+    - free (list of int): Released ids available for reuse.
+
+    Detailed Explanation:
+    A Vertex hashes with a Python-level __hash__ (a tuple of its id and datum, or the name of a Station), which is paid on every dictionary lookup keyed by vertices. A backend that interns its vertices hashes a Vertex once, when it enters a public method (a lookup in 'index', read directly on hot paths rather than through the Python-level __getitem__), and works on ints inside: neighbor dictionaries keyed by ints are probed with C-level int hashing and equality, and the vertices it returns are read back from a list by id.
+
+    Ids stay dense: a released id is reused by the next vertex, so tables indexed by id (lists, matrix rows) never grow past the largest number of vertices alive at once.
+
+    Practical Usages:
+    The vertex table of the graph backends (AdjList, AdjMatrix and the 'indexed' backend of ADT.graph.Graph).
+    """
+    def __init__(self, V = ()):
+        self.index = {}
+        self.vertices = []
+        self.free = []
+        for v in V:
+            self.intern(v)
+
+    def __len__(self):
+        return len(self.index)
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def __contains__(self, v):
+        return v in self.index
+
+    def __getitem__(self, v):
+        return self.index[v]
+
+    def get(self, v, default = None):
+        """
+        Returns the id of 'v', or 'default' if it is not interned.
+        """
+        return self.index.get(v, default)
+
+    def capacity(self):
+        """
+        Returns the number of ids in use or released, one more than the largest id.
+        """
+        return len(self.vertices)
+
+    def intern(self, v):
+        """
+        Returns the id of 'v', giving it one if it has none: a released id if there is one, the next unused id otherwise.
+        """
+        i = self.index.get(v)
+        if i is None:
+            if self.free:
+                i = self.free.pop()
+                self.vertices[i] = v
+            else:
+                i = len(self.vertices)
+                self.vertices.append(v)
+            self.index[v] = i
+        return i
+
+    def release(self, v):
+        """
+        Forgets 'v' and returns its former id, which the next interned vertex reuses.
+
+        Raises:
+        - KeyError: If 'v' is not interned.
+        """
+        i = self.index.pop(v)
+        self.vertices[i] = None
+        self.free.append(i)
+        return i
+
+    def live_ids(self):
+        """
+        Returns the ids of the live vertices, in the order of 'index'.
+        """
+        return list(self.index.values())
+
+    def copy(self):
+        """
+        Returns an independent interner with the same ids.
+        """
+        other = VertexInterner()
+        other.index = dict(self.index)
+        other.vertices = list(self.vertices)
+        other.free = list(self.free)
+        return other
@@ -0,0 +1,76 @@
+class UnionFind:
+    """
+    Represents a disjoint-set forest over the integers 0 .. n - 1.
+
+    Attributes:
+    - parent (list of int): The parent of every element; a root is its own parent.
+    - size (list of int): For a root, the number of elements in its set.
+    - count (int): The number of disjoint sets.
+
+    Detailed Explanation:
+    Every set is a tree whose root is the representative of the set. union links the root of the smaller tree under the root of the larger one (union by size), and find shortens the path it walks by pointing every other element to its grandparent (path halving). Together they make any sequence of m operations run in O(m α(n)), where α is the inverse Ackermann function, in practice a constant. find is a loop rather than a recursion, so deep trees cannot overflow the Python stack.
+
+    Elements can be added at any time with add, and unions never need to be undone, which makes the structure suited to maintaining connected components while edges are inserted.
+
+    Practical Usages:
+    Connected components, Kruskal's minimum spanning tree, and grouping equivalent items.
+    """
+    def __init__(self, n = 0):
+        self.parent = list(range(n))
+        self.size = [1] * n
+        self.count = n
+
+    def __len__(self):
+        return len(self.parent)
+
+    def add(self):
+        """
+        Adds a new element in a set of its own.
+
+        Returns:
+        - int: The new element, len(self) - 1.
+        """
+        i = len(self.parent)
+        self.parent.append(i)
+        self.size.append(1)
+        self.count += 1
+        return i
+
+    def find(self, i):
+        """
+        Returns the representative of the set containing 'i'.
+        """
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, a, b):
+        """
+        Merges the sets containing 'a' and 'b'.
+
+        Returns:
+        - bool: True if they were in different sets.
+        """
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return False
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+        self.count -= 1
+        return True
+
+    def connected(self, a, b):
+        """
+        Checks whether 'a' and 'b' are in the same set.
+        """
+        return self.find(a) == self.find(b)
+
+    def labels(self):
+        """
+        Returns the representative of every element, as a list indexed by element.
+        """
+        return [self.find(i) for i in range(len(self.parent))]
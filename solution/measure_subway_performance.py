@@ -0,0 +1,202 @@
+import sys
+import os
+import random
+import tempfile
+import tracemalloc
+from time import perf_counter
+
+from subway_map import SubwayMap, Station
+from ADT.graph import Graph
+from data_structure.graph import Vertex
+from ADT.all_pairs import DistanceMatrix
+from ADT.contraction_hierarchy import ContractionHierarchy
+
+cur_path = os.path.dirname(os.path.abspath(__file__))
+resource_dir = f'{cur_path}/resources'
+
+def load_subway_map(**kwargs):
+    return SubwayMap(f'{resource_dir}/vertices.json', f'{resource_dir}/edges.json', **kwargs)
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p / 100))]
+
+def report(name, latencies):
+    print(f'{name:>32} p50 {percentile(latencies, 50) * 1e6:10.1f} us'
+            f'  p99 {percentile(latencies, 99) * 1e6:10.1f} us  ({len(latencies)} queries)')
+
+def all_station_pairs(s, max_pairs = None, seed = 0):
+    stations = list(s.station_dict.values())
+    pairs = [(a, b) for a in stations for b in stations if a != b]
+    if max_pairs is not None and max_pairs < len(pairs):
+        pairs = random.Random(seed).sample(pairs, max_pairs)
+    return pairs
+
+def measure_queries(query, args_list):
+    latencies = []
+    for args in args_list:
+        begin = perf_counter()
+        query(*args)
+        latencies.append(perf_counter() - begin)
+    return latencies
+
+def measure_route_latency(s, max_pairs = None, weight = 'time'):
+    s.get_route_engine()
+    pairs = all_station_pairs(s, max_pairs)
+    sources = [(station,) for station in s.station_dict.values()]
+    report(f'single source ({weight})', measure_queries(lambda a: s.find_route(a, weight = weight), sources))
+    for method in ['dijkstra', 'astar']:
+        latencies = measure_queries(lambda a, b: s.find_route(a, b, weight = weight, method = method), pairs)
+        report(f'{method} ({weight})', latencies)
+
+def measure_distance_matrix(weight = 'time'):
+    s = load_subway_map()
+    csr = s.get_route_engine().csr
+    for method in DistanceMatrix.METHODS:
+        begin = perf_counter()
+        DistanceMatrix.compute(csr, weight, method = method)
+        print(f'{"all pairs " + method:>32} {perf_counter() - begin:10.3f} s')
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        load_subway_map(cache_dir = cache_dir).get_distance_matrix(weight)
+        s = load_subway_map(cache_dir = cache_dir)
+        s.get_route_engine()
+        begin = perf_counter()
+        s.get_distance_matrix(weight)
+        print(f'{"all pairs cached load":>32} {(perf_counter() - begin) * 1e3:10.3f} ms')
+        report(f'matrix lookup ({weight})', measure_queries(s.get_travel_cost, all_station_pairs(s, 10000)))
+
+def measure_contraction_hierarchy(s, max_pairs = None, weight = 'time'):
+    engine = s.get_route_engine()
+    begin = perf_counter()
+    ch = ContractionHierarchy.build(engine.csr, weight)
+    print(f'{"ch preprocessing (" + weight + ")":>32} {perf_counter() - begin:10.3f} s  ({ch.num_shortcuts()} shortcuts)')
+
+    pairs = all_station_pairs(s, max_pairs)
+    for name, query, stats in [('dijkstra', lambda a, b: engine.single_pair(a, b, weight), engine), 
+                                ('ch', ch.query, ch)]:
+        settled = 0
+        latencies = []
+        for a, b in pairs:
+            begin = perf_counter()
+            query(a, b)
+            latencies.append(perf_counter() - begin)
+            settled += stats.last_settled
+        report(f'{name} ({weight})', latencies)
+        print(f'{"":>32} {settled / len(pairs):10.1f} vertices settled per query')
+
+def measure_reachability(s, max_depths = (3, None), processes = 2, repeat = 3):
+    # "stations reachable within N stops" from every station, reported in queries per second (best of 'repeat')
+    sources = list(s.station_dict.values())
+    for max_depth in max_depths:
+        label = f'within {max_depth} stops' if max_depth is not None else 'unbounded'
+        for name, run in [('bfs per source', lambda: [s.bfs(v, max_depth = max_depth) for v in sources]),
+                            ('multi_bfs', lambda: s.multi_bfs(sources, max_depth)),
+                            (f'multi_bfs {processes} processes', lambda: s.multi_bfs(sources, max_depth, processes = processes))]:
+            times = []
+            for _ in range(repeat):
+                begin = perf_counter()
+                run()
+                times.append(perf_counter() - begin)
+            print(f'{name + " (" + label + ")":>40} {len(sources) / min(times):10.0f} queries/s')
+
+def measure_closures(n_closures = 100, n_sources = 50, weight = 'time', seed = 0):
+    # replays closing 'n_closures' random segments one after the other, then reopening them in reverse order;
+    # after every step, a route is asked from each of 'n_sources' stations to a random destination
+    rng = random.Random(seed)
+    names = sorted(load_subway_map().station_dict)
+    queries = [(src, rng.choice(names)) for src in rng.sample(names, n_sources)]
+    for method in ['astar', 'dynamic']:
+        s = load_subway_map()
+        edges = s.get_edges()
+        closures = random.Random(seed).sample(range(len(edges)), n_closures)
+        steps = [(s.remove_edge, edges[k]) for k in closures] + [(s.add_edge, edges[k]) for k in reversed(closures)]
+        routes = lambda: [s.find_route(src, dst, weight = weight, method = method) for src, dst in queries]
+        routes()
+        report(f'closure + {n_sources} {method} ({weight})', measure_queries(lambda change, e: (change(e), routes()), steps))
+        if method == 'dynamic':
+            report(f'closure update only ({weight})', measure_queries(lambda change, e: change(e), steps))
+
+def measure_cold_start(repeat = 5):
+    with tempfile.TemporaryDirectory() as cache_dir:
+        def clear_cache():
+            for f in os.listdir(cache_dir):
+                os.remove(os.path.join(cache_dir, f))
+
+        for name, kwargs, before in [('eager json.load', {}, None), 
+                                        ('lazy, building the cache', {'lazy': True}, clear_cache),
+                                        ('lazy, cached', {'lazy': True}, None)]:
+            times = []
+            for _ in range(repeat):
+                if before is not None:
+                    before()
+                begin = perf_counter()
+                load_subway_map(cache_dir = cache_dir, **kwargs)
+                times.append(perf_counter() - begin)
+            tracemalloc.start()
+            s = load_subway_map(cache_dir = cache_dir, **kwargs)
+            memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            del s 
+            print(f'{"startup " + name:>32} {min(times) * 1e3:10.1f} ms  {memory / 1024:10.0f} KiB retained')
+
+def measure_graph_file(repeat = 5, sizes = (10**3, 10**5)):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'subway.graph')
+        s = load_subway_map()
+        s.save(path)
+        station = lambda name, data: Station(name, **data)
+
+        # round trip: same stations with the same attributes, same segments
+        g = Graph.load(path, vertex_factory = station)
+        assert [(v.node_id, dict(v.datum)) for v in s.get_vertices()] == [(v.node_id, v.datum) for v in g.get_vertices()]
+        segments = lambda graph: sorted((e.from_vertex.node_id, e.to_vertex.node_id, e.is_directed, sorted(e.data.items()))
+                                            for e in graph.get_edges())
+        assert segments(s) == segments(g)
+
+        def first_use(**kwargs):
+            g = Graph.load(path, vertex_factory = station, **kwargs)
+            g.get_neighbors(g.get_vertices()[0])
+
+        # SubwayMap from the JSON resources against the same graph from the binary file, mapped or read
+        json_time = None
+        for name, load in [('subway json', load_subway_map),
+                            ('subway Graph.load', lambda: Graph.load(path, vertex_factory = station)),
+                            ('subway Graph.load, no mmap', lambda: Graph.load(path, mmap = False, vertex_factory = station)),
+                            ('subway load + first use', first_use),
+                            ('subway read + first use', lambda: first_use(mmap = False))]:
+            times = []
+            for _ in range(repeat):
+                begin = perf_counter()
+                load()
+                times.append(perf_counter() - begin)
+            json_time = json_time or min(times)
+            print(f'{name:>32} {min(times) * 1e3:10.3f} ms  {json_time / min(times):8.1f}x json')
+
+        # the load itself only reads the header, whatever the number of edges
+        rng = random.Random(0)
+        for m in sizes:
+            n = m // 10
+            path = os.path.join(tmp, f'{m}.graph')
+            Graph.from_arrays([rng.randrange(n) for _ in range(m)], [rng.randrange(n) for _ in range(m)],
+                                vertices = [Vertex(i, i) for i in range(n)], time = [rng.random() for _ in range(m)]).save(path)
+            times = []
+            for _ in range(repeat):
+                begin = perf_counter()
+                Graph.load(path)
+                times.append(perf_counter() - begin)
+            print(f'{"Graph.load, " + str(m) + " edges":>32} {min(times) * 1e3:10.3f} ms  ({os.path.getsize(path) / 2**20:.1f} MiB)')
+
+if __name__ == '__main__':
+    # python measure_subway_performance.py [max_pairs], every ordered station pair by default
+    max_pairs = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    measure_cold_start()
+    measure_graph_file()
+    s = load_subway_map()
+    for weight in ['time', 'distance']:
+        measure_route_latency(s, max_pairs, weight = weight)
+    measure_distance_matrix()
+    measure_reachability(s)
+    measure_closures()
+    for weight in ['time', 'distance']:
+        measure_contraction_hierarchy(s, max_pairs, weight = weight)
@@ -2,6 +2,7 @@ import matplotlib.pyplot as plt
 import os 
 import pickle 
 import random 
+import tracemalloc
 from time import time 
 
 import sorting 
@@ -56,7 +57,119 @@ def measure_time(sort_func):
 
     plot_line_graph(data, save_to = f'{result_dir}/{sort_func.__name__}.png', title = f'{sort_func.__name__} graph', x_label = 'list length', y_label = 'sorting time')
 
+def measure_comparisons(n = 20000, repeat = 3):
+    # the same sort with a legacy cmp (through cmp_to_key), with plain '<' and with a key computed once per element
+    case = [random.randint(0, n) for _ in range(n)]
+    records = [{'time': x} for x in case]
+    legacy = lambda x, y: x if x['time'] > y['time'] else y
+    for sort_func in [sorting.merge_sort, sorting.quick_sort]:
+        for name, args, kwargs in [('cmp', records, {'cmp': legacy}),
+                                    ('key', records, {'key': lambda r: r['time']}),
+                                    ('key, reverse', records, {'key': lambda r: r['time'], 'reverse': True}),
+                                    ('no key', case, {})]:
+            times = []
+            for _ in range(repeat):
+                lst = list(args)
+                begin = time()
+                sort_func(lst, **kwargs)
+                times.append(time() - begin)
+            print(f'{sort_func.__name__:>12} {name:>14} {min(times) * 1e3:10.1f} ms  ({n} elements)')
+
+def tim_sort_cases(n):
+    rng = random.Random(0)
+    nearly_sorted = list(range(n))
+    for _ in range(n // 100):
+        i, j = rng.randrange(n), rng.randrange(n)
+        nearly_sorted[i], nearly_sorted[j] = nearly_sorted[j], nearly_sorted[i]
+    return [('random', [rng.randint(0, n) for _ in range(n)]),
+            ('sorted', list(range(n))),
+            ('reversed', list(range(n, 0, -1))),
+            ('sawtooth', [i % 1000 for i in range(n)]),
+            ('sorted + 1% appended', list(range(n)) + [rng.randint(0, n) for _ in range(n // 100)]),
+            ('1% swapped', nearly_sorted)]
+
+def measure_tim_sort(n = 10**5, repeat = 3):
+    for name, case in tim_sort_cases(n):
+        for sort_func in [sorting.tim_sort, sorting.merge_sort, sorted]:
+            times = []
+            for _ in range(repeat):
+                lst = list(case)
+                begin = time()
+                res = sort_func(lst)
+                times.append(time() - begin)
+            assert res == sorted(case)
+            print(f'{name:>22} {sort_func.__name__:>12} {min(times) * 1e3:10.1f} ms  ({len(case)} elements)')
+
+def measure_quick_sort(n = 10**5, repeat = 3):
+    rng = random.Random(0)
+    cases = [('random', [rng.randint(0, n) for _ in range(n)]),
+                ('sorted', list(range(n))),
+                ('reversed', list(range(n, 0, -1))),
+                ('10 distinct values', [rng.randint(0, 9) for _ in range(n)]),
+                ('all equal', [0] * n),
+                ('organ pipe', list(range(n // 2)) + list(range(n // 2, 0, -1)))]
+    for name, case in cases:
+        for sort_func in [sorting.quick_sort, sorted]:
+            times = []
+            for _ in range(repeat):
+                lst = list(case)
+                begin = time()
+                res = sort_func(lst)
+                times.append(time() - begin)
+            assert res == sorted(case)
+            print(f'{name:>22} {sort_func.__name__:>12} {min(times) * 1e3:10.1f} ms  ({len(case)} elements)')
+
+def measure_merge_sort(sizes = (10**5, 10**6), repeat = 3):
+    # wall-clock time without tracing, then the peak of the memory allocated during one sort.
+    # abs gives back the non-negative ints themselves, so the key= rows show the cost of the decoration alone
+    for n in sizes:
+        case = [random.randint(0, n) for _ in range(n)]
+        for name, sort_func in [('merge_sort', sorting.merge_sort), ('merge_sort key', lambda l: sorting.merge_sort(l, key = abs)),
+                                ('tim_sort', sorting.tim_sort), ('sorted', sorted), ('sorted key', lambda l: sorted(l, key = abs))]:
+            times = []
+            for _ in range(repeat):
+                lst = list(case)
+                begin = time()
+                sort_func(lst)
+                times.append(time() - begin)
+            lst = list(case)
+            tracemalloc.start()
+            sort_func(lst)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f'{name:>14} {min(times):10.2f} s  peak {peak / 2**20:8.1f} MiB '
+                    f'({peak / n:.1f} bytes/element, {n} elements)')
+
+def measure_sorted_list(sizes = (10**4, 10**5, 10**6)):
+    # streaming inserts, then random positional reads and removals
+    for n in sizes:
+        case = [random.random() for _ in range(n)]
+        begin = time()
+        sl = sorting.SortedList()
+        for x in case:
+            sl.add(x)
+        inserted = time() - begin
+        positions = [random.randrange(n) for _ in range(10**4)]
+        begin = time()
+        for i in positions:
+            sl[i]
+        read = time() - begin
+        begin = time()
+        for x in case[:10**4]:
+            sl.remove(x)
+        removed = time() - begin
+        begin = time()
+        sorting.sort3_insert(case)
+        insertion_sort = time() - begin
+        print(f'{n:>8} elements: add {inserted / n * 1e6:.2f} us, index {read / len(positions) * 1e6:.2f} us, '
+                f'remove {removed / 10**4 * 1e6:.2f} us, sort3_insert {insertion_sort:.2f} s')
+
 if __name__ == '__main__':
+    measure_comparisons()
+    measure_tim_sort()
+    measure_quick_sort()
+    measure_merge_sort()
+    measure_sorted_list()
     # begin = time()
     # measure_time(sorted)
     # end = time()
@@ -1,80 +1,981 @@
-def get_insert_idx(res, elem, 
-        cmp = lambda x, y: x if x > y else y, ):
+from bisect import bisect_left, bisect_right
+from itertools import chain
+from operator import lt
 
-    for i, e in enumerate(res):
-        case = cmp(elem, e)
-        if elem == cmp(elem, e): # elem > e:
-            return i 
-    
-    return len(res)
+def _strictly_less(cmp):
+    # x < y for a legacy cmp: both orders must return y, checked with 'is' rather than '=='
+    def less(x, y):
+        return x is not y and cmp(x, y) is y and cmp(y, x) is y
+    return less
 
-def sort3_insert(lst, cmp = lambda x, y: x if x > y else y):
-    res = []
+def cmp_to_key(cmp):
+    """
+    Turns a legacy comparison function into a key function.
+
+    Parameters:
+    - cmp (callable): A function that takes two elements and returns the greater of them, like the former default `lambda x, y: x if x > y else y`.
+
+    Returns:
+    - type: A key class: key(x) < key(y) when both cmp(x, y) and cmp(y, x) return y, and key(x) == key(y) when neither is less.
+
+    Detailed Explanation:
+    Asking both orders makes the order strict whatever element cmp returns for equal elements, and the result is checked with `is` rather than `==`, so equal but distinct objects are never mistaken for each other. Every comparison costs two calls of cmp or more: passing a key instead is faster.
+
+    Example:
+        merge_sort(lst, key = cmp_to_key(lambda x, y: x if x.priority > y.priority else y))
+    """
+    less = _strictly_less(cmp)
+
+    class Key:
+        __slots__ = ('value',)
+
+        def __init__(self, value):
+            self.value = value
+
+        def __lt__(self, other):
+            return less(self.value, other.value)
+
+        def __eq__(self, other):
+            return not (less(self.value, other.value) or less(other.value, self.value))
+
+        __hash__ = None
+
+    return Key
+
+def _sort_keyed(sort, lst, cmp, key, reverse):
+    # decorate-sort-undecorate: 'sort' orders a list in place with '<' only.
+    # (key, position, element) tuples are compared on their keys, computed once, and on their unique positions,
+    # so the elements themselves are never compared and equal keys keep their order even with an unstable sort.
+    # Descending order sorts on (key, -position) and reads the result backwards.
+    sign = -1 if reverse else 1
+    if cmp is not None:
+        if key is not None:
+            raise ValueError('cmp and key cannot be combined')
+        # a tuple would compare its keys with '==' before '<': carry the position in the item instead
+        less = _strictly_less(cmp)
+
+        class Item:
+            __slots__ = ('value', 'position')
+
+            def __init__(self, value, position):
+                self.value = value
+                self.position = position
+
+            def __lt__(self, other):
+                x, y = self.value, other.value
+                if less(x, y):
+                    return True
+                return not less(y, x) and self.position < other.position
+
+        decorated = [Item(x, sign * i) for i, x in enumerate(lst)]
+        sort(decorated)
+        values = [item.value for item in decorated]
+    elif key is None and not reverse:
+        sort(lst)
+        return lst
+    else:
+        keys = lst if key is None else map(key, lst)
+        decorated = [(k, sign * i, x) for i, (k, x) in enumerate(zip(keys, lst))]
+        sort(decorated)
+        values = [t[2] for t in decorated]
+    if reverse:
+        values.reverse()
+    lst[:] = values
+    return lst
+
+class SortedList:
+    """
+    Represents a list kept in ascending order as elements are added and removed.
+
+    Attributes:
+    - load (int): The usual size of a block. A block is split past twice this size and joined with a neighbor below half of it.
+    - lists (list of list): The sorted blocks, each non-empty; every element of a block is not greater than those of the next.
+    - maxes (list): The last element of every block.
+
+    Detailed Explanation:
+    A single Python list pays a linear shift on every insertion, and finding the position by scanning it is linear too, so n streaming inserts cost O(n^2). Here the elements are cut into blocks of about 'load' elements. An element is placed by two binary searches, one over 'maxes' to find its block and one inside the block, and only that block is shifted, which is a memmove of at most 2 * load pointers.
+
+    Positions are answered by a Fenwick tree over the block lengths: the number of elements before a block, and the block and offset of a position, are found in O(log n). Adding or removing an element updates the tree in O(log n); splitting or joining blocks, once every 'load' updates or so, drops it and the next positional query rebuilds it in time linear in the number of blocks.
+
+    Elements are compared with '<' only. An element is added after the elements equal to it, so elements added in order come out in that order.
+
+    Practical Usages:
+    Streaming inserts into a sorted sequence (sort3_insert, leaderboards, sliding-window medians), rank and order-statistic queries.
+
+    Example:
+        sl = SortedList([5, 1, 4])
+        sl.add(3)                   # [1, 3, 4, 5]
+        sl[1]                       # 3
+        sl.bisect_left(4)           # 2
+        sl.remove(1)                # [3, 4, 5]
+    """
+    LOAD = 1000
+
+    def __init__(self, iterable = (), load = LOAD):
+        """
+        Creates a sorted list from the elements of 'iterable'.
+
+        Raises:
+        - ValueError: If 'load' is smaller than 4.
+        """
+        if load < 4:
+            raise ValueError(f'load must be at least 4, got {load}')
+        self.load = load
+        values = sorted(iterable)
+        self.lists = [values[i:i + load] for i in range(0, len(values), load)]
+        self.maxes = [block[-1] for block in self.lists]
+        self._len = len(values)
+        self._index = None
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        return chain.from_iterable(self.lists)
+
+    def __reversed__(self):
+        return chain.from_iterable(reversed(block) for block in reversed(self.lists))
+
+    def __repr__(self):
+        return f'{type(self).__name__}({list(self)!r})'
+
+    def __contains__(self, elem):
+        pos = bisect_left(self.maxes, elem)
+        if pos == len(self.maxes):
+            return False
+        block = self.lists[pos]
+        return not elem < block[bisect_left(block, elem)]
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return list(self)[idx]
+        pos, i = self._locate(idx)
+        return self.lists[pos][i]
+
+    def __delitem__(self, idx):
+        self._delete(*self._locate(idx))
+
+    # the Fenwick tree over the block lengths, rebuilt when blocks were split or joined
+    def _tree(self):
+        if self._index is None:
+            tree = [0]
+            tree.extend(len(block) for block in self.lists)
+            size = len(tree)
+            for i in range(1, size):
+                j = i + (i & -i)
+                if j < size:
+                    tree[j] += tree[i]
+            self._index = tree
+        return self._index
+
+    def _update(self, pos, delta):
+        tree = self._index
+        if tree is None:
+            return
+        i, size = pos + 1, len(tree)
+        while i < size:
+            tree[i] += delta
+            i += i & -i
+
+    # the number of elements in the blocks before block 'pos'
+    def _offset(self, pos):
+        tree = self._tree()
+        total = 0
+        while pos:
+            total += tree[pos]
+            pos -= pos & -pos
+        return total
+
+    # the block and the offset in it of position 'idx'
+    def _locate(self, idx):
+        if idx < 0:
+            idx += self._len
+        if not 0 <= idx < self._len:
+            raise IndexError('SortedList index out of range')
+        lists = self.lists
+        if idx < len(lists[0]):
+            return 0, idx
+        tree = self._tree()
+        pos, step = 0, 1 << (len(lists).bit_length() - 1)
+        while step:
+            nxt = pos + step
+            if nxt <= len(lists) and tree[nxt] <= idx:
+                pos = nxt
+                idx -= tree[nxt]
+            step >>= 1
+        return pos, idx
+
+    def add(self, elem):
+        """
+        Inserts 'elem' after the elements equal to it.
+        """
+        lists, maxes = self.lists, self.maxes
+        self._len += 1
+        if not maxes:
+            lists.append([elem])
+            maxes.append(elem)
+            self._index = None
+            return
+        pos = bisect_right(maxes, elem)
+        if pos == len(maxes):
+            pos -= 1
+            block = lists[pos]
+            block.append(elem)
+            maxes[pos] = elem
+        else:
+            block = lists[pos]
+            block.insert(bisect_right(block, elem), elem)
+        if len(block) > 2 * self.load:
+            lists.insert(pos + 1, block[self.load:])
+            del block[self.load:]
+            maxes.insert(pos, block[-1])
+            self._index = None
+        else:
+            self._update(pos, 1)
+
+    def update(self, iterable):
+        """
+        Inserts every element of 'iterable'.
+        """
+        for elem in iterable:
+            self.add(elem)
+
+    def _delete(self, pos, i):
+        lists, maxes = self.lists, self.maxes
+        block = lists[pos]
+        del block[i]
+        self._len -= 1
+        if not block:
+            del lists[pos]
+            del maxes[pos]
+            self._index = None
+            return
+        maxes[pos] = block[-1]
+        if len(block) < self.load // 2 and len(lists) > 1:
+            # join with a neighbor, splitting again if that makes the block too large
+            pos = pos if pos + 1 < len(lists) else pos - 1
+            block = lists[pos]
+            block.extend(lists.pop(pos + 1))
+            del maxes[pos]
+            if len(block) > 2 * self.load:
+                half = len(block) // 2
+                lists.insert(pos + 1, block[half:])
+                del block[half:]
+                maxes.insert(pos, block[-1])
+            self._index = None
+        else:
+            self._update(pos, -1)
+
+    def remove(self, elem):
+        """
+        Removes the first element equal to 'elem'.
+
+        Raises:
+        - ValueError: If no element is equal to 'elem'.
+        """
+        pos = bisect_left(self.maxes, elem)
+        if pos < len(self.maxes):
+            block = self.lists[pos]
+            i = bisect_left(block, elem)
+            if not elem < block[i]:
+                self._delete(pos, i)
+                return
+        raise ValueError(f'{elem!r} is not in the SortedList')
+
+    def discard(self, elem):
+        """
+        Removes the first element equal to 'elem', if there is one.
+        """
+        if elem in self:
+            self.remove(elem)
+
+    def pop(self, idx = -1):
+        """
+        Removes and returns the element at position 'idx', the greatest by default.
+
+        Raises:
+        - IndexError: If the list is empty or 'idx' is out of range.
+        """
+        pos, i = self._locate(idx)
+        elem = self.lists[pos][i]
+        self._delete(pos, i)
+        return elem
+
+    def bisect_left(self, elem):
+        """
+        Returns the position before the elements equal to 'elem', the number of elements less than it.
+        """
+        pos = bisect_left(self.maxes, elem)
+        if pos == len(self.maxes):
+            return self._len
+        return self._offset(pos) + bisect_left(self.lists[pos], elem)
+
+    def bisect_right(self, elem):
+        """
+        Returns the position after the elements equal to 'elem', the number of elements not greater than it.
+        """
+        pos = bisect_right(self.maxes, elem)
+        if pos == len(self.maxes):
+            return self._len
+        return self._offset(pos) + bisect_right(self.lists[pos], elem)
+
+    bisect = bisect_right
+
+    def count(self, elem):
+        """
+        Returns the number of elements equal to 'elem'.
+        """
+        return self.bisect_right(elem) - self.bisect_left(elem)
+
+    def index(self, elem):
+        """
+        Returns the position of the first element equal to 'elem'.
+
+        Raises:
+        - ValueError: If no element is equal to 'elem'.
+        """
+        if elem not in self:
+            raise ValueError(f'{elem!r} is not in the SortedList')
+        return self.bisect_left(elem)
+
+def get_insert_idx(res, elem, cmp = None):
+    """
+    Returns the position at which 'elem' goes in a list sorted in descending order.
+
+    Parameters:
+    - res (list): A list sorted in descending order.
+    - elem: The element to insert.
+    - cmp (callable, optional): A legacy comparison function returning the greater of two elements, see cmp_to_key. Defaults to comparing the elements with '<'.
+
+    Returns:
+    - int: The position of the first element of 'res' that is not greater than 'elem', len(res) if there is none.
+
+    Detailed Explanation:
+    Kept for the callers of the former sort3_insert, which inserted into a plain list; sort3_insert now inserts into a SortedList. The position is found by binary search rather than by scanning 'res'.
+    """
+    less = _strictly_less(cmp) if cmp is not None else lt
+    lo, hi = 0, len(res)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if less(elem, res[mid]):
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+def _insertion_sort(lst):
+    res = SortedList()
 
     for elem in lst:
-        new_idx = get_insert_idx(res, elem, cmp = cmp)
-        res.insert(new_idx, elem)
-    
-    return res 
-
-def merge_sort(lst, cmp = lambda x, y: x if x > y else y):
-    if len(lst) > 1:
-        mid = len(lst) // 2  
-        l = lst[:mid]  
-        r = lst[mid:]
-
-        return merge(merge_sort(l), merge_sort(r), lst)
+        res.add(elem)
+
+    lst[:] = res
+
+def sort3_insert(lst, cmp = None, key = None, reverse = True):
+    """
+    Sorts a list of elements with insertion sort.
+
+    Parameters:
+    - lst (list): The list of elements to be sorted. It is left unchanged.
+    - cmp (callable, optional): A legacy comparison function returning the greater of two elements, see cmp_to_key.
+    - key (callable, optional): A function computing the key each element is sorted by. Defaults to the element itself.
+    - reverse (bool, optional): Put the greatest element first. Defaults to True, since sort3_insert has always sorted in descending order.
+
+    Returns:
+    - list: A new list containing the sorted elements. Equal elements keep their order.
+
+    Detailed Explanation:
+    The elements are inserted one by one into a SortedList, each placed by binary search and shifting a single block, so n elements cost O(n log n) comparisons rather than the O(n^2) of scanning and shifting one list.
+
+    Example:
+        sort3_insert([4, 2, 5, 1, 3])                   # [5, 4, 3, 2, 1]
+        sort3_insert(['bb', 'a'], key = len, reverse = False)   # ['a', 'bb']
+    """
+    return _sort_keyed(_insertion_sort, list(lst), cmp, key, reverse)
+
+def merge_sort(lst, cmp = None, key = None, reverse = False):
+    """
+    Sorts a list of elements in place with merge sort.
+
+    Parameters:
+    - lst (list): The list of elements to be sorted.
+    - cmp (callable, optional): A legacy comparison function returning the greater of two elements, see cmp_to_key.
+    - key (callable, optional): A function computing the key each element is sorted by. Defaults to the element itself.
+    - reverse (bool, optional): Put the greatest element first. Defaults to False.
+
+    Returns:
+    - list: 'lst', sorted. Equal elements keep their order.
+
+    Detailed Explanation:
+    The keys are computed once per element and the sort compares them with '<' alone (see _sort_keyed), instead of calling a Python cmp function and comparing its result with '==' at every step.
+
+    The sort is bottom-up and allocates a single buffer of n / 2 slots:
+    1. Blocks of MERGE_BLOCK elements are sorted with binary insertion sort.
+    2. Adjacent runs of width 32, 64, 128, ... are merged pairwise. Two runs already in order (the last element of the left one not greater than the first of the right one) are skipped, and so are the head of the left run and the tail of the right run that are already in place.
+    3. The shorter of the two remaining parts is copied into the buffer, element by element, and merged back into the list from the end where it was.
+    Unlike the recursive version, no sublist is sliced at any level, and a sorted input is checked in one comparison per merge. This is not a ping-pong merge sort, which merges every pass from the list into the buffer and the next pass back: that needs a buffer of n slots, where copying the shorter run only needs n / 2.
+
+    Memory: sorting the elements themselves takes the buffer alone, n / 2 references (4 bytes per element on a 64-bit build). With a key, reverse or cmp, _sort_keyed first builds a (key, position, element) tuple per element, about 120 bytes per element with the position and the list holding them, plus the keys themselves; the buffer then refers to these tuples.
+
+    Example:
+        merge_sort([38, 27, 43, 3, 9, 82, 10])        # [3, 9, 10, 27, 38, 43, 82]
+        merge_sort(stations, key = lambda s: s.name)
+    """
+    return _sort_keyed(_merge_sort, lst, cmp, key, reverse)
+
+MERGE_BLOCK = 32
+
+def _merge_sort(lst):
+    # bottom-up merge sort with one buffer of n / 2, see merge_sort
+    n = len(lst)
+    for lo in range(0, n, MERGE_BLOCK):
+        _binary_insertion_sort(lst, lo, min(lo + MERGE_BLOCK, n), lo + 1)
+    buf = [None] * (n // 2)
+    width = MERGE_BLOCK
+    while width < n:
+        for lo in range(0, n - width, 2 * width):
+            mid = lo + width
+            _merge_runs(lst, buf, lo, mid, min(mid + width, n))
+        width *= 2
+
+def _merge_runs(lst, buf, lo, mid, hi):
+    # merges the sorted runs lst[lo:mid] and lst[mid:hi] in place, 'buf' holding at least the shorter one
+    if not lst[mid] < lst[mid - 1]:
+        return
+    first = bisect_right(lst, lst[mid], lo, mid)
+    last = bisect_left(lst, lst[mid - 1], mid, hi)
+    if mid - first <= last - mid:
+        _merge_low(lst, buf, first, mid, last)
     else:
-        return lst
+        _merge_high(lst, buf, first, mid, last)
 
-def merge(l, r, lst, cmp = lambda x, y: x if x > y else y):
-    i, j, k = 0, 0, 0
-    
-    while i < len(l) and j < len(r):
-        if cmp(l[i], r[j]) == r[j]:
-            lst[k] = l[i]
+def _merge_low(lst, buf, lo, mid, hi):
+    # merges lst[lo:mid] and lst[mid:hi] through a copy of the left run, from the left.
+    # The last element of the left run is greater than the whole right run, which is therefore used up first
+    k = mid - lo
+    for t in range(k):
+        buf[t] = lst[lo + t]
+    i, j, dest = 0, mid, lo
+    while j < hi:
+        if lst[j] < buf[i]:
+            lst[dest] = lst[j]
+            j += 1
+        else:
+            lst[dest] = buf[i]
             i += 1
+        dest += 1
+    while i < k:
+        lst[dest] = buf[i]
+        i += 1
+        dest += 1
+
+def _merge_high(lst, buf, lo, mid, hi):
+    # merges lst[lo:mid] and lst[mid:hi] through a copy of the right run, from the right.
+    # The first element of the left run is greater than the first of the right run, so the left run is used up first
+    k = hi - mid
+    for t in range(k):
+        buf[t] = lst[mid + t]
+    i, j, dest = k - 1, mid - 1, hi - 1
+    while j >= lo:
+        if buf[i] < lst[j]:
+            lst[dest] = lst[j]
+            j -= 1
         else:
-            lst[k] = r[j]
-            j += 1
-        k += 1
+            lst[dest] = buf[i]
+            i -= 1
+        dest -= 1
+    while i >= 0:
+        lst[dest] = buf[i]
+        i -= 1
+        dest -= 1
 
-    # Checking if any element was left
-    while i < len(l):
-        lst[k] = l[i]
-        i += 1
-        k += 1
+def merge(l, r, lst, cmp = None):
+    """
+    Merges two sorted lists into 'lst'.
+
+    Parameters:
+    - l, r (list): Lists sorted in ascending order.
+    - lst (list): The list the result is written to, from position 0. It must hold at least len(l) + len(r) elements.
+    - cmp (callable, optional): A legacy comparison function returning the greater of two elements, see cmp_to_key. Defaults to comparing the elements with '<'.
+
+    Returns:
+    - list: 'lst'. Of equal elements, those of 'l' come first.
+
+    Detailed Explanation:
+    Kept for the callers of the former recursive merge_sort; merge_sort now merges its runs in place. The two lists are merged the same way (see _merge_runs), after being copied one after the other.
+    """
+    n, mid = len(l) + len(r), len(l)
+    items = list(chain(l, r)) if cmp is None else list(map(cmp_to_key(cmp), chain(l, r)))
+    if 0 < mid < n:
+        _merge_runs(items, [None] * min(mid, n - mid), 0, mid, n)
+    lst[:n] = items if cmp is None else [k.value for k in items]
+    return lst
+
+def _sort_range(sort, lst, low, high, cmp):
+    # runs 'sort' over the keys of lst[low:high + 1] under 'cmp' and puts the elements back in the new order
+    keys = list(map(cmp_to_key(cmp), lst[low:high + 1]))
+    result = sort(keys)
+    lst[low:high + 1] = [k.value for k in keys]
+    return result
+
+INSERTION_CUTOFF = 16
+NINTHER_THRESHOLD = 40
+
+def _median_of_three(lst, i, j, k):
+    # the position of the median of lst[i], lst[j] and lst[k]
+    a, b, c = lst[i], lst[j], lst[k]
+    if b < a:
+        i, j, a, b = j, i, b, a
+    if c < b:
+        return k if a < c else i
+    return j
+
+def _choose_pivot(lst, low, high):
+    # median of three, or Tukey's ninther (the median of three medians of three) for larger ranges
+    size = high - low + 1
+    mid = low + size // 2
+    if size <= NINTHER_THRESHOLD:
+        return lst[_median_of_three(lst, low, mid, high)]
+    step = size // 8
+    return lst[_median_of_three(lst, _median_of_three(lst, low, low + step, low + 2 * step),
+                                _median_of_three(lst, mid - step, mid, mid + step),
+                                _median_of_three(lst, high - 2 * step, high - step, high))]
+
+def _partition(lst, low, high, pivot):
+    """
+    Partitions lst[low:high + 1] in three around 'pivot' (Dijkstra's Dutch national flag).
+
+    Returns:
+    - tuple: (lt, gt) such that the elements of lst[low:lt] are less than the pivot, those of lst[lt:gt + 1] equal to it and those of lst[gt + 1:high + 1] greater.
+    """
+    lt, i, gt = low, low, high
+    while i <= gt:
+        x = lst[i]
+        if x < pivot:
+            lst[lt], lst[i] = x, lst[lt]
+            lt += 1
+            i += 1
+        elif pivot < x:
+            lst[i], lst[gt] = lst[gt], x
+            gt -= 1
+        else:
+            i += 1
+    return lt, gt
+
+def partition(lst, low, high, cmp = None):
+    """
+    Partitions lst[low:high + 1] in place around its last element.
+
+    Parameters:
+    - lst (list): The list.
+    - low, high (int): The first and last positions of the range.
+    - cmp (callable, optional): A legacy comparison function returning the greater of two elements, see cmp_to_key. Defaults to comparing the elements with '<'.
+
+    Returns:
+    - int: A position p holding an element equal to the pivot, such that the elements of lst[low:p] are not greater than it and those of lst[p + 1:high + 1] are greater.
+
+    Detailed Explanation:
+    Kept for the callers of the former quick_sort. It runs the three-way partition of quick_sort (see _partition) with lst[high] as the pivot, and returns the last position of the elements equal to it.
+    """
+    if cmp is None:
+        return _partition(lst, low, high, lst[high])[1]
+    return low + _sort_range(lambda keys: _partition(keys, 0, len(keys) - 1, keys[-1])[1], lst, low, high, cmp)
+
+def _heap_sort(lst, low, high):
+    # sorts lst[low:high + 1] in place with a max-heap rooted at 'low'
+    n = high - low + 1
 
-    while j < len(r):
-        lst[k] = r[j]
-        j += 1
+    def sift_down(root, end):
+        x = lst[low + root]
+        child = 2 * root + 1
+        while child < end:
+            if child + 1 < end and lst[low + child] < lst[low + child + 1]:
+                child += 1
+            if not x < lst[low + child]:
+                break
+            lst[low + root] = lst[low + child]
+            root = child
+            child = 2 * root + 1
+        lst[low + root] = x
+
+    for root in range(n // 2 - 1, -1, -1):
+        sift_down(root, n)
+    for end in range(n - 1, 0, -1):
+        lst[low], lst[low + end] = lst[low + end], lst[low]
+        sift_down(0, end)
+
+def quick_sort(lst, cmp = None, key = None, reverse = False):
+    """
+    Sorts a list of elements in place with introsort, a quick sort that cannot degrade.
+
+    Parameters:
+    - lst (list): The list of elements to be sorted.
+    - cmp (callable, optional): A legacy comparison function returning the greater of two elements, see cmp_to_key.
+    - key (callable, optional): A function computing the key each element is sorted by. Defaults to the element itself.
+    - reverse (bool, optional): Put the greatest element first. Defaults to False.
+
+    Returns:
+    - list: 'lst', sorted. With a key or reverse, equal elements keep their order.
+
+    Detailed Explanation:
+    Quick sort selects a pivot, partitions the other elements according to whether they are less than or greater than the pivot, and sorts both sides. Introsort guards it against its quadratic cases:
+    - The pivot is the median of the first, middle and last elements, or for more than NINTHER_THRESHOLD elements Tukey's ninther. Sorted and reversed lists, which the last-element pivot turned quadratic, are split in halves.
+    - The partition is three-way: the elements equal to the pivot are set aside and never looked at again, so duplicate-heavy lists do not degrade.
+    - The ranges left to sort are kept on an explicit stack; the smaller side of every partition is sorted first and the larger one waits on the stack, which therefore holds O(log n) ranges. There is no recursion, and no RecursionError.
+    - A range still being partitioned after 2 * log2(n) levels is finished with heapsort, which bounds the worst case to O(n log n).
+    - Ranges of INSERTION_CUTOFF elements or less are finished with binary insertion sort.
+
+    Example:
+        quick_sort([10, 7, 8, 9, 1, 5])                   # [1, 5, 7, 8, 9, 10]
+        quick_sort([10, 7, 8, 9, 1, 5], reverse = True)   # [10, 9, 8, 7, 5, 1]
+    """
+    return _sort_keyed(lambda l: _quick_sort_util(l, 0, len(l) - 1), lst, cmp, key, reverse)
+
+def _quick_sort_util(lst, low, high):
+    # introsort of lst[low:high + 1], see quick_sort
+    if high <= low:
+        return lst
+    max_depth = 2 * (high - low + 1).bit_length()
+    stack = [(low, high, 0)]
+    while stack:
+        lo, hi, depth = stack.pop()
+        while hi - lo + 1 > INSERTION_CUTOFF:
+            if depth >= max_depth:
+                _heap_sort(lst, lo, hi)
+                break
+            depth += 1
+            lt, gt = _partition(lst, lo, hi, _choose_pivot(lst, lo, hi))
+            if lt - lo < hi - gt:
+                stack.append((gt + 1, hi, depth))
+                hi = lt - 1
+            else:
+                stack.append((lo, lt - 1, depth))
+                lo = gt + 1
+        else:
+            if lo < hi:
+                _binary_insertion_sort(lst, lo, hi + 1, lo + 1)
+
+    return lst
+
+def quick_sort_util(lst, low, high, cmp = None):
+    """
+    Sorts lst[low:high + 1] in place with the introsort of quick_sort.
+
+    Parameters:
+    - lst (list): The list.
+    - low, high (int): The first and last positions of the range.
+    - cmp (callable, optional): A legacy comparison function returning the greater of two elements, see cmp_to_key. Defaults to comparing the elements with '<'.
+
+    Returns:
+    - list: 'lst'.
+    """
+    if cmp is None:
+        return _quick_sort_util(lst, low, high)
+    _sort_range(lambda keys: _quick_sort_util(keys, 0, len(keys) - 1), lst, low, high, cmp)
+    return lst
+
+def tim_sort(lst, cmp = None, key = None, reverse = False):
+    """
+    Sorts a list of elements in place with TimSort.
+
+    Parameters:
+    - lst (list): The list of elements to be sorted.
+    - cmp (callable, optional): A legacy comparison function returning the greater of two elements, see cmp_to_key.
+    - key (callable, optional): A function computing the key each element is sorted by. Defaults to the element itself.
+    - reverse (bool, optional): Put the greatest element first. Defaults to False.
+
+    Returns:
+    - list: 'lst', sorted. Equal elements keep their order.
+
+    Detailed Explanation:
+    TimSort is a hybrid sorting algorithm derived from merge sort and insertion sort. It is designed to perform well on real-world data, which often contains runs of consecutive ordered elements.
+
+    Key Concepts:
+    - Runs: Maximal sequences of consecutive elements that are already ordered. A strictly descending run is reversed in place, which keeps equal elements in order.
+    - Minrun: Runs shorter than minrun (between 32 and 64, chosen so that n / minrun is a power of two or slightly less) are extended with binary insertion sort, so that the merges stay balanced.
+    - Run stack: The runs wait on a stack whose lengths keep decreasing faster than the Fibonacci numbers; merging whenever this breaks bounds the stack to O(log n) runs and keeps every merge between runs of similar sizes.
+    - Galloping: Before a merge, the elements of the first run that are not greater than the head of the second one, and those of the second run that are not less than the tail of the first one, are found with an exponential search and left in place. During the merge, once one run has won min_gallop times in a row, the merge looks for the end of the winning streak with an exponential search and copies it as a block.
+    - Merge buffer: Only the shorter of the two runs is copied out, so the buffer never holds more than n / 2 elements.
+
+    On data made of a few runs, such as a sorted list with a few appended or modified elements, run detection and galloping make the sort close to linear: a sorted or reversed list costs n - 1 comparisons.
+
+    Steps:
+    1. Find the next natural run, reversing it if it is descending, and extend it to minrun elements with binary insertion.
+    2. Push it on the run stack and merge the top runs until the stack invariants hold again.
+    3. When the list is exhausted, merge the remaining runs from the top.
+
+    Example:
+        lst = [5, 21, 7, 23, 19, 10, 12]
+        tim_sort(lst)   # [5, 7, 10, 12, 19, 21, 23]
+
+    Visual Illustration:
+
+        Identifying runs:
+
+        [5, 21] - increasing run
+        [7, 23] - increasing run
+        [19, 10] - decreasing run (reversed into [10, 19])
+
+        Merging runs:
+
+        Merge [5, 21] and [7, 23] -> [5, 7, 21, 23]
+        Merge result with [10, 12, 19] -> [5, 7, 10, 12, 19, 21, 23]
+    """
+    return _sort_keyed(lambda l: _TimSort(l).sort(), lst, cmp, key, reverse)
+
+MIN_GALLOP = 7
+
+def _min_run(n):
+    # n itself below 64, otherwise the 6 leading bits of n, plus one if any other bit is set
+    r = 0
+    while n >= 64:
+        r |= n & 1
+        n >>= 1
+    return n + r
+
+def _count_run(lst, lo, hi):
+    # length of the run starting at lo; a strictly descending run is reversed in place
+    k = lo + 1
+    if k == hi:
+        return 1
+    if lst[k] < lst[lo]:
+        k += 1
+        while k < hi and lst[k] < lst[k - 1]:
+            k += 1
+        lst[lo:k] = lst[lo:k][::-1]
+    else:
         k += 1
-    
-    return lst 
+        while k < hi and not lst[k] < lst[k - 1]:
+            k += 1
+    return k - lo
+
+def _binary_insertion_sort(lst, lo, hi, start):
+    # sorts lst[lo:hi], whose prefix lst[lo:start] is already sorted
+    for i in range(start, hi):
+        pivot = lst[i]
+        pos = bisect_right(lst, pivot, lo, i)
+        lst[pos + 1:i + 1] = lst[pos:i]
+        lst[pos] = pivot
 
-def partition(lst, low, high, cmp = lambda x, y: x if x > y else y):
-    i = low - 1  # index of smaller element
-    pivot = lst[high]  # pivot
+def _gallop_left(key, a, lo, hi, hint):
+    # the first position of the sorted a[lo:hi] whose element is not less than key, searching exponentially from a[hint]
+    ofs = 1
+    if a[hint] < key:
+        last = hint
+        while hint + ofs < hi and a[hint + ofs] < key:
+            last = hint + ofs
+            ofs = 2 * ofs + 1
+        return bisect_left(a, key, last + 1, min(hint + ofs, hi))
+    last = hint
+    while hint - ofs >= lo and not a[hint - ofs] < key:
+        last = hint - ofs
+        ofs = 2 * ofs + 1
+    return bisect_left(a, key, max(hint - ofs + 1, lo), last)
 
-    for j in range(low, high):
-        # If current element is smaller than or equal to pivot
-        if cmp(lst[j], pivot) == pivot:
-            i = i + 1
-            lst[i], lst[j] = lst[j], lst[i]  # swap
+def _gallop_right(key, a, lo, hi, hint):
+    # the first position of the sorted a[lo:hi] whose element is greater than key, searching exponentially from a[hint]
+    ofs = 1
+    if not key < a[hint]:
+        last = hint
+        while hint + ofs < hi and not key < a[hint + ofs]:
+            last = hint + ofs
+            ofs = 2 * ofs + 1
+        return bisect_right(a, key, last + 1, min(hint + ofs, hi))
+    last = hint
+    while hint - ofs >= lo and key < a[hint - ofs]:
+        last = hint - ofs
+        ofs = 2 * ofs + 1
+    return bisect_right(a, key, max(hint - ofs + 1, lo), last)
 
-    lst[i + 1], lst[high] = lst[high], lst[i + 1]  # swap
-    return i + 1
+class _TimSort:
+    # the state of one tim_sort: the list, the stack of pending runs as [base, length], and the adaptive gallop threshold
+    def __init__(self, lst):
+        self.lst = lst
+        self.runs = []
+        self.min_gallop = MIN_GALLOP
 
-def quick_sort(lst, cmp = lambda x, y: x if x > y else y):
-    return quick_sort_util(lst, 0, len(lst)-1, cmp = lambda x, y: x if x > y else y)
+    def sort(self):
+        lst = self.lst
+        n = len(lst)
+        min_run = _min_run(n)
+        lo = 0
+        while lo < n:
+            length = _count_run(lst, lo, n)
+            if length < min_run:
+                forced = min(min_run, n - lo)
+                _binary_insertion_sort(lst, lo, lo + forced, lo + length)
+                length = forced
+            self.runs.append([lo, length])
+            self.merge_collapse()
+            lo += length
+        while len(self.runs) > 1:
+            i = len(self.runs) - 2
+            if i > 0 and self.runs[i - 1][1] < self.runs[i + 1][1]:
+                i -= 1
+            self.merge_at(i)
 
-def quick_sort_util(lst, low, high, cmp = lambda x, y: x if x > y else y):
-    if low < high:
-        partition_index = partition(lst, low, high, cmp = lambda x, y: x if x > y else y)
+    def merge_collapse(self):
+        # restores, for the top four runs A, B, C, D: A > B + C, B > C + D and C > D (with the fix of de Gouw et al.)
+        runs = self.runs
+        while len(runs) > 1:
+            i = len(runs) - 2
+            if (i > 0 and runs[i - 1][1] <= runs[i][1] + runs[i + 1][1]) or \
+                    (i > 1 and runs[i - 2][1] <= runs[i - 1][1] + runs[i][1]):
+                if runs[i - 1][1] < runs[i + 1][1]:
+                    i -= 1
+            elif runs[i][1] > runs[i + 1][1]:
+                break
+            self.merge_at(i)
 
-        # recursively sort elements before partition and after partition
-        quick_sort_util(lst, low, partition_index - 1)
-        quick_sort_util(lst, partition_index + 1, high)
+    def merge_at(self, i):
+        lst = self.lst
+        base_a, na = self.runs[i]
+        base_b, nb = self.runs[i + 1]
+        self.runs[i][1] = na + nb
+        del self.runs[i + 1]
+
+        # the head of A not greater than B[0] and the tail of B not less than A[-1] are already in place
+        k = _gallop_right(lst[base_b], lst, base_a, base_a + na, base_a)
+        na -= k - base_a
+        base_a = k
+        if na == 0:
+            return
+        nb = _gallop_left(lst[base_a + na - 1], lst, base_b, base_b + nb, base_b + nb - 1) - base_b
+        if nb == 0:
+            return
+        if na <= nb:
+            self.merge_lo(base_a, na, base_b, nb)
+        else:
+            self.merge_hi(base_a, na, base_b, nb)
 
-    return lst 
+    def merge_lo(self, base_a, na, base_b, nb):
+        # merges from the left, with A (the shorter run) copied out
+        lst = self.lst
+        tmp = lst[base_a:base_a + na]
+        i, j, dest = 0, base_b, base_a
+        min_gallop = self.min_gallop
+        while na and nb:
+            count_a = count_b = 0
+            # one element at a time until a run wins min_gallop times in a row
+            while na and nb:
+                if lst[j] < tmp[i]:
+                    lst[dest] = lst[j]
+                    dest += 1
+                    j += 1
+                    nb -= 1
+                    count_b += 1
+                    count_a = 0
+                    if count_b >= min_gallop:
+                        break
+                else:
+                    lst[dest] = tmp[i]
+                    dest += 1
+                    i += 1
+                    na -= 1
+                    count_a += 1
+                    count_b = 0
+                    if count_a >= min_gallop:
+                        break
+            # galloping: copy whole streaks while they stay long, and make galloping easier to enter again
+            min_gallop += 1
+            while na and nb:
+                min_gallop -= min_gallop > 1
+                count_a = _gallop_right(lst[j], tmp, i, i + na, i) - i
+                if count_a:
+                    lst[dest:dest + count_a] = tmp[i:i + count_a]
+                    dest += count_a
+                    i += count_a
+                    na -= count_a
+                    if not na:
+                        break
+                lst[dest] = lst[j]
+                dest += 1
+                j += 1
+                nb -= 1
+                if not nb:
+                    break
+                count_b = _gallop_left(tmp[i], lst, j, j + nb, j) - j
+                if count_b:
+                    lst[dest:dest + count_b] = lst[j:j + count_b]
+                    dest += count_b
+                    j += count_b
+                    nb -= count_b
+                    if not nb:
+                        break
+                lst[dest] = tmp[i]
+                dest += 1
+                i += 1
+                na -= 1
+                if count_a < MIN_GALLOP and count_b < MIN_GALLOP:
+                    break
+            min_gallop += 1
+        self.min_gallop = max(min_gallop, 1)
+        # what is left of B is already in place
+        lst[dest:dest + na] = tmp[i:i + na]
 
+    def merge_hi(self, base_a, na, base_b, nb):
+        # merges from the right, with B (the shorter run) copied out
+        lst = self.lst
+        tmp = lst[base_b:base_b + nb]
+        i, j, dest = nb - 1, base_a + na - 1, base_b + nb - 1
+        min_gallop = self.min_gallop
+        while na and nb:
+            count_a = count_b = 0
+            while na and nb:
+                if tmp[i] < lst[j]:
+                    lst[dest] = lst[j]
+                    dest -= 1
+                    j -= 1
+                    na -= 1
+                    count_a += 1
+                    count_b = 0
+                    if count_a >= min_gallop:
+                        break
+                else:
+                    lst[dest] = tmp[i]
+                    dest -= 1
+                    i -= 1
+                    nb -= 1
+                    count_b += 1
+                    count_a = 0
+                    if count_b >= min_gallop:
+                        break
+            min_gallop += 1
+            while na and nb:
+                min_gallop -= min_gallop > 1
+                # the elements of A greater than tmp[i] go after it
+                k = _gallop_right(tmp[i], lst, base_a, base_a + na, base_a + na - 1)
+                count_a = base_a + na - k
+                if count_a:
+                    lst[dest - count_a + 1:dest + 1] = lst[k:k + count_a]
+                    dest -= count_a
+                    j -= count_a
+                    na -= count_a
+                    if not na:
+                        break
+                lst[dest] = tmp[i]
+                dest -= 1
+                i -= 1
+                nb -= 1
+                if not nb:
+                    break
+                # the elements of B not less than lst[j] go after it
+                k = _gallop_left(lst[j], tmp, 0, nb, nb - 1)
+                count_b = nb - k
+                if count_b:
+                    lst[dest - count_b + 1:dest + 1] = tmp[k:nb]
+                    dest -= count_b
+                    i -= count_b
+                    nb -= count_b
+                    if not nb:
+                        break
+                lst[dest] = lst[j]
+                dest -= 1
+                j -= 1
+                na -= 1
+                if count_a < MIN_GALLOP and count_b < MIN_GALLOP:
+                    break
+            min_gallop += 1
+        self.min_gallop = max(min_gallop, 1)
+        # what is left of A is already in place
+        lst[dest - nb + 1:dest + 1] = tmp[:nb]
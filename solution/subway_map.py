@@ -0,0 +1,421 @@
+import json 
+import math
+import os
+
+from data_structure.graph import Vertex, Edge
+from ADT.graph import Graph 
+from ADT.shortest_path import ShortestPathEngine, haversine
+from ADT.layout import project_coordinates
+from ADT.transfer_routing import TransferGraph
+from ADT.all_pairs import DistanceMatrix
+from ADT.contraction_hierarchy import ContractionHierarchy
+from ADT.dynamic_sssp import DynamicShortestPaths
+from subway_network import StationTable, EdgeTable, source_key, save_network, load_network
+
+TRANSFER_TIME = 5 # minutes, default penalty for changing lines
+
+class Station(Vertex):
+    def __init__(self, station_name, **data):
+        super().__init__(station_name, data)
+        self.station_name = station_name 
+        self.data = data  
+
+
+    @classmethod
+    def lazy(cls, station_name, record):
+        """
+        Creates a Station whose data is a StationRecord, read from vertices.json on first access.
+        """
+        station = cls(station_name)
+        station.datum = station.data = record
+        return station
+
+    def __eq__(self, other):
+        if isinstance(other, Station):
+            return self.station_name == other.station_name
+        return False 
+
+    def __hash__(self):
+        return hash(self.station_name) 
+
+    def __str__(self):
+        return str(self.station_name)
+
+class StationEdge(Edge):
+    def __init__(self, from_station, to_station, line, distance, time):
+        super().__init__(from_station, to_station, is_directed = False, distance = distance, time = time)
+        self.from_station = from_station
+        self.to_station = to_station 
+        self.distance = distance
+        self.time = time
+        self.line = line 
+
+def _as_number(value):
+    # the binary cache stores numbers as float64, give integral ones back as int like json does
+    return int(value) if value.is_integer() else value
+
+class SubwayMap(Graph):
+    def __init__(self, stations_json = 'resources/vertices.json', 
+                    station_edges_json = 'resources/edges.json', backend = 'indexed', cache_dir = None, lazy = False):
+        """
+        Loads the subway map.
+
+        Parameters:
+        - stations_json (str, optional): The stations file.
+        - station_edges_json (str, optional): The station edges file, grouped by line.
+        - backend (str, optional): The Graph backend. Defaults to 'indexed'.
+        - cache_dir (str, optional): Where precomputed data is cached. Defaults to a 'cache' directory next to 'station_edges_json'.
+        - lazy (bool, optional): Stream vertices.json into a compact StationTable instead of json.load, and keep it in a binary cache in 'cache_dir'. Station.data then only reads the attributes other than the name and the line from vertices.json when they are asked for. Defaults to False.
+        """
+        self.stations_json = stations_json
+        self.station_edges_json = station_edges_json
+        self.cache_dir = cache_dir if cache_dir is not None else \
+                            os.path.join(os.path.dirname(station_edges_json), 'cache')
+        # one key for every cache file of this map: the network, the distance matrices and the hierarchies
+        self._source_key = source_key(stations_json, station_edges_json)
+        self.station_table = None
+        if lazy:
+            stations, edges = self._load_network()
+        else:
+            stations, edges = self._load_json()
+
+        self.stations = stations
+        # the StationEdges of the map, kept in step with the graph: the adjacency backends only give back plain Edges
+        self.station_edges = list(edges)
+        station_dict = {}
+        for station in stations:
+            station_dict[station.station_name] = station
+        self.station_dict = station_dict
+        self._modified = False
+        self._route_engine = None
+        self._distance_matrices = {}
+        self._hierarchies = {}
+        self._dynamic_routes = {}
+        super().__init__(stations, edges, backend = backend, weight_keys = ['distance', 'time'])
+        self._transfer_graph = TransferGraph(edges, weight = 'time')
+
+    def _load_json(self):
+        with open(self.stations_json, 'r', encoding = 'utf-8') as stations:
+            stations = json.load(stations)
+            stations = [Station(s['station_nm'], **s) for s in \
+                            stations['DATA']]
+            station_dict = {}
+
+            for station in stations:
+                station_dict[station.station_name] = station 
+        
+        with open(self.station_edges_json, 'r', encoding = 'utf-8') as station_edges:
+            station_edges = json.load(station_edges) 
+            edges = []
+            for line, station_edges in station_edges.items():
+                for s in station_edges:
+                    from_station = station_dict[s['from']]
+                    to_station = station_dict[s['to']]
+                    edges.append(
+                        StationEdge(from_station, to_station, line, s['distance'], s['time'])
+                    )
+        return stations, edges
+
+    def _load_network(self):
+        key = self._source_key
+        path = os.path.join(self.cache_dir, 'network.bin')
+        network = load_network(path, key)
+        if network is None:
+            table = StationTable.from_json(self.stations_json)
+            network = table, EdgeTable.from_json(self.station_edges_json, table)
+            os.makedirs(self.cache_dir, exist_ok = True)
+            save_network(path, key, *network)
+        table, edge_table = network
+        self.station_table = table
+
+        stations = [Station.lazy(name, table.record(i)) for i, name in enumerate(table.names)]
+        edges = []
+        for k in range(len(edge_table)):
+            edges.append(StationEdge(stations[edge_table.from_rows[k]], stations[edge_table.to_rows[k]],
+                                        edge_table.line_names[edge_table.line_ids[k]],
+                                        _as_number(edge_table.distances[k]), _as_number(edge_table.times[k])))
+        return stations, edges
+
+    def add_vertex(self, v):
+        super().add_vertex(v)
+        self._invalidate_routing()
+        self._dynamic_routes = {}
+
+    def remove_vertex(self, v):
+        super().remove_vertex(v)
+        self.station_edges = [e for e in self.station_edges if e.from_vertex != v and e.to_vertex != v]
+        self._invalidate_routing()
+        self._dynamic_routes = {}
+
+    def add_edge(self, e):
+        super().add_edge(e)
+        self.station_edges.append(e)
+        self._invalidate_routing()
+        self._update_dynamic_routes(e)
+
+    def remove_edge(self, e):
+        super().remove_edge(e)
+        for i, kept in enumerate(self.station_edges):
+            if kept == e:
+                del self.station_edges[i]
+                break
+        self._invalidate_routing()
+        self._update_dynamic_routes(e)
+
+    def _invalidate_routing(self):
+        self._modified = True
+        self._route_engine = None
+        self._transfer_graph = None
+        self._distance_matrices = {}
+        self._hierarchies = {}
+
+    def _update_dynamic_routes(self, e):
+        # the arcs between the endpoints of 'e' now weigh the smallest weight of the edges left there
+        for weight, paths in self._dynamic_routes.items():
+            arcs = [(e.from_vertex, e.to_vertex)]
+            if not e.is_directed:
+                arcs.append((e.to_vertex, e.from_vertex))
+            for u, v in arcs:
+                weights = [self._segment_weight(u, neighbor, w, weight)
+                            for neighbor, w in self.get_weighted_neighbors(u, weight) if neighbor == v]
+                paths.set_arc(paths.vertex_indices[u], paths.vertex_indices[v], min(weights, default = None))
+
+    def _segment_weight(self, u, v, value, weight):
+        # edges.json marks unknown segment lengths with a negative distance,
+        # use the straight-line length between the stations instead
+        if weight == 'distance' and value < 0:
+            coordinates = self.get_coordinates()
+            return haversine(*coordinates[u], *coordinates[v])
+        return value
+
+    def get_station(self, station):
+        if isinstance(station, Station):
+            return station
+        try:
+            return self.station_dict[station]
+        except KeyError:
+            raise ValueError(f'{station} not in subway map')
+
+    def get_coordinates(self):
+        """
+        Returns a dictionary mapping each station to its (latitude, longitude) in WGS84 degrees.
+        Stations without coordinates in vertices.json are left out.
+        """
+        coordinates = {}
+        if self.station_table is not None:
+            rows = {name: i for i, name in enumerate(self.station_table.names)}
+            for station in self.get_vertices():
+                if station.station_name in rows:
+                    point = self.station_table.coordinates(rows[station.station_name])
+                    if point is not None:
+                        coordinates[station] = point
+            return coordinates
+
+        for station in self.get_vertices():
+            station = self.station_dict.get(station.station_name, station)
+            try:
+                coordinates[station] = (float(station.data['xpoint_wgs']), float(station.data['ypoint_wgs']))
+            except (KeyError, TypeError, ValueError):
+                pass
+        return coordinates
+
+    def layout_seed(self):
+        """
+        Seeds show with the stations' WGS coordinates, projected to the plane.
+        """
+        return project_coordinates(self.get_coordinates())
+
+    def get_route_engine(self):
+        """
+        Returns the ShortestPathEngine over a CSR snapshot of the current map.
+        The snapshot is built on first use and rebuilt after the map changes.
+        """
+        if self._route_engine is None:
+            csr = self.to_csr(weight_keys = ['distance', 'time'])
+            coordinates = self.get_coordinates()
+
+            distance = csr.weights['distance']
+            for i, station in enumerate(csr.vertices):
+                for pos in range(csr.offsets[i], csr.offsets[i + 1]):
+                    if distance[pos] < 0:
+                        other = csr.vertices[csr.targets[pos]]
+                        distance[pos] = self._segment_weight(station, other, distance[pos], 'distance')
+
+            self._route_engine = ShortestPathEngine(csr, coordinates)
+        return self._route_engine
+
+    def get_transfer_graph(self):
+        """
+        Returns the (station, line) TransferGraph of the current map.
+        It is built when the map is loaded and rebuilt after the map changes, from the StationEdges still in the graph.
+        """
+        if self._transfer_graph is None:
+            self._transfer_graph = TransferGraph([e for e in self.station_edges if self.has_edge(e)], weight = 'time')
+        return self._transfer_graph
+
+    def resource_hash(self):
+        """
+        Returns the key of the stations and edges json files in hex, as cache files are named after it.
+
+        It is the source_key of the network cache, computed once when the map is loaded from the path, size and
+        modification time of the files, so naming a cache file reads neither of them. A cached matrix or hierarchy
+        is also checked against the snapshot it was computed from when it is loaded.
+        """
+        return f'{self._source_key:016x}'
+
+    def _cache_path(self, name, extension):
+        return os.path.join(self.cache_dir, f'{name}_{self.resource_hash()}.{extension}')
+
+    def get_contraction_hierarchy(self, weight = 'time', use_cache = True):
+        """
+        Returns the ContractionHierarchy of 'weight' ('time' or 'distance').
+
+        Like get_distance_matrix, the index of an unmodified map is saved in 'cache_dir'
+        and reloaded by later starts instead of being rebuilt.
+        """
+        if weight in self._hierarchies:
+            return self._hierarchies[weight]
+
+        csr = self.get_route_engine().csr
+        path = self._cache_path(f'ch_{weight}', 'pkl')
+        ch = None
+        if use_cache and not self._modified and os.path.exists(path):
+            try:
+                ch = ContractionHierarchy.load(csr, path, weight)
+            except ValueError:
+                pass # another format version, or built from other arcs, weights or vertex order: build it again
+        if ch is None:
+            ch = ContractionHierarchy.build(csr, weight)
+            if use_cache and not self._modified:
+                os.makedirs(self.cache_dir, exist_ok = True)
+                ch.save(path)
+        self._hierarchies[weight] = ch
+        return ch
+
+    def get_distance_matrix(self, weight = 'time', method = 'floyd_warshall', use_cache = True):
+        """
+        Returns the all-pairs DistanceMatrix of 'weight' ('time' or 'distance').
+
+        The matrix of an unmodified map is cached in 'cache_dir' as a .npy file named after
+        resource_hash(), so later starts memory-map it instead of recomputing. A cached matrix is
+        only used if it was computed from the same CSR snapshot (see CSRGraph.digest), which
+        differs between backends. Once the map has been mutated, the matrix is computed in memory only.
+        """
+        if weight in self._distance_matrices:
+            return self._distance_matrices[weight]
+
+        csr = self.get_route_engine().csr
+        path = self._cache_path(f'{weight}', 'npy')
+        matrix = None
+        if use_cache and not self._modified and os.path.exists(path):
+            try:
+                matrix = DistanceMatrix.load(csr, path, weight)
+            except ValueError:
+                pass # computed from other arcs, weights or vertex order (another backend): compute it again
+        if matrix is None:
+            matrix = DistanceMatrix.compute(csr, weight, method = method)
+            if use_cache and not self._modified:
+                os.makedirs(self.cache_dir, exist_ok = True)
+                matrix.save(path)
+        self._distance_matrices[weight] = matrix
+        return matrix
+
+    def get_dynamic_routes(self, weight = 'time'):
+        """
+        Returns the DynamicShortestPaths of 'weight' ('time' or 'distance').
+
+        It is built from the current map on first use. Unlike the other indexes it survives
+        add_edge and remove_edge: its cached shortest-path trees are repaired in place,
+        so routes after a closure cost milliseconds instead of a rebuild and a search per source.
+        Adding or removing a station drops it.
+        """
+        if weight not in self._dynamic_routes:
+            csr = self.get_route_engine().csr
+            self._dynamic_routes[weight] = DynamicShortestPaths.from_csr(csr, weight)
+        return self._dynamic_routes[weight]
+
+    def get_travel_cost(self, src, dst, weight = 'time'):
+        """
+        Returns the shortest travel 'time' or 'distance' between two stations from the all-pairs matrix, in O(1).
+        """
+        return self.get_distance_matrix(weight).get(self.get_station(src), self.get_station(dst))
+
+    def find_transfer_routes(self, src, dst, transfer_time = TRANSFER_TIME, max_transfers = None):
+        """
+        Finds the Pareto-optimal routes by (travel time, number of transfers).
+
+        Parameters:
+        - src (Station or str): The departure station or its name.
+        - dst (Station or str): The arrival station or its name.
+        - transfer_time (float, optional): Minutes added for each line change. Defaults to TRANSFER_TIME.
+        - max_transfers (int, optional): Ignore routes with more transfers.
+
+        Returns:
+        - list of tuple: (time, transfers, path) sorted from fastest to fewest transfers, path being a list of (Station, line).
+
+        Example:
+            for time, transfers, path in SubwayMap().find_transfer_routes('서울', '잠실'):
+                print(time, transfers, [f'{station}({line})' for station, line in path])
+        """
+        return self.get_transfer_graph().pareto_routes(self.get_station(src), self.get_station(dst),
+                    transfer_cost = transfer_time, max_transfers = max_transfers)
+
+    def find_route(self, src, dst = None, weight = 'time', method = 'astar'):
+        """
+        Finds shortest routes on the 'time' (minutes) or 'distance' (meters) of the station edges.
+
+        Parameters:
+        - src (Station or str): The departure station or its name.
+        - dst (Station or str, optional): The arrival station or its name. If omitted, routes to every station are computed.
+        - weight (str, optional): 'time' or 'distance'. Defaults to 'time'.
+        - method (str, optional): 'astar', 'dijkstra' or 'ch' (contraction hierarchies), used when 'dst' is given, or 'dynamic' to answer from the incrementally maintained tree of 'src' (see get_dynamic_routes), with or without 'dst'. Defaults to 'astar'.
+
+        Returns:
+        - tuple: (cost, path) when 'dst' is given, with path a list of Station ((inf, []) if unreachable).
+          Otherwise (dist, parent) dictionaries keyed by Station; ShortestPathEngine.path_to(parent, station) rebuilds a path.
+
+        Example:
+            s = SubwayMap()
+            cost, path = s.find_route('서울', '강남')
+            dist, parent = s.find_route('서울')
+
+            # closures: only the trees of the sources asked for so far are repaired
+            s.find_route('서울', '강남', method = 'dynamic')
+            s.remove_edge(closed_segment)
+            s.find_route('서울', '강남', method = 'dynamic')
+        """
+        src = self.get_station(src)
+        if method == 'dynamic':
+            return self._dynamic_route(src, dst, weight)
+        engine = self.get_route_engine()
+        if dst is None:
+            return engine.single_source(src, weight = weight)
+
+        dst = self.get_station(dst)
+        if method == 'astar':
+            return engine.astar(src, dst, weight = weight)
+        elif method == 'dijkstra':
+            return engine.single_pair(src, dst, weight = weight)
+        elif method == 'ch':
+            return self.get_contraction_hierarchy(weight).query(src, dst)
+        else:
+            raise ValueError(f'Invalid method {method}')
+
+    def _dynamic_route(self, src, dst, weight):
+        paths = self.get_dynamic_routes(weight)
+        s = paths.vertex_indices[src]
+        vertices = paths.vertices
+        if dst is None:
+            dist, parent = paths.tree(s)
+            return ({vertices[i]: d for i, d in enumerate(dist) if d != math.inf},
+                    {vertices[i]: (vertices[p] if p != -1 else None) for i, p in enumerate(parent)
+                        if dist[i] != math.inf})
+        t = paths.vertex_indices[self.get_station(dst)]
+        return paths.distance(s, t), [vertices[i] for i in paths.path(s, t)]
+
+if __name__ == '__main__':
+    s = SubwayMap()
+    assert isinstance(s, Graph)
+    s.show(method = 'barnes_hut')
+
+
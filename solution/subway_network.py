@@ -0,0 +1,305 @@
+import codecs
+import hashlib
+import json
+import mmap
+import re
+import os
+import struct
+from array import array
+from collections.abc import Mapping
+
+MAGIC = b'SUBW'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sIQIIIQ') # magic, version, source key, stations, edges, lines, string pool bytes
+
+def iter_json_array(path, key = 'DATA', chunk_size = 1 << 16):
+    """
+    Streams the objects of a top-level array of a JSON file without loading the whole document.
+
+    Parameters:
+    - path (str): The JSON file, whose top level is an object.
+    - key (str, optional): The key of the array to stream. Defaults to 'DATA'.
+    - chunk_size (int, optional): Number of bytes read at a time.
+
+    Yields:
+    - tuple: (offset, length, record) where offset and length locate the record in the file, in bytes.
+
+    Detailed Explanation:
+    The file is read chunk by chunk through an incremental UTF-8 decoder. Each element is decoded with json.JSONDecoder.raw_decode as soon as the buffer holds all of it, and consumed text is dropped on the next read, so memory stays bounded by the chunk size plus one record. Everything before the '"key": [' marker (such as the DESCRIPTION object of vertices.json) is skipped unparsed.
+    """
+    decoder = json.JSONDecoder()
+    marker = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+    separator = re.compile(r'[\s,]*')
+    with open(path, 'rb') as f:
+        utf8 = codecs.getincrementaldecoder('utf-8')()
+        buf = ''
+        pos = 0
+        offset = 0 # bytes of the file before buf[pos]
+        eof = False
+
+        def advance(to):
+            nonlocal pos, offset
+            offset += len(buf[pos:to].encode('utf-8'))
+            pos = to
+
+        def refill():
+            nonlocal buf, pos, eof
+            if eof:
+                raise ValueError(f'unexpected end of {path} while looking for the {key!r} array')
+            buf = buf[pos:]
+            pos = 0
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buf += utf8.decode(chunk, final = eof)
+
+        while True:
+            m = marker.search(buf, pos)
+            if m is not None:
+                advance(m.end())
+                break
+            # keep a tail long enough to hold a marker split across chunks
+            advance(max(pos, len(buf) - len(key) - 64))
+            refill()
+
+        while True:
+            advance(separator.match(buf, pos).end())
+            if pos == len(buf):
+                refill()
+                continue
+            if buf[pos] == ']':
+                return
+            try:
+                record, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                refill()
+                continue
+            start = offset
+            advance(end)
+            yield start, offset - start, record
+
+def source_key(*paths):
+    """
+    Returns a cheap 64-bit key identifying the current version of the given files (path, size and mtime).
+
+    The key is a blake2b digest rather than hash(), which is salted per process for strings
+    (PYTHONHASHSEED), so that the key saved by one run matches the key computed by the next.
+    """
+    h = hashlib.blake2b(digest_size = 8)
+    for path in paths:
+        st = os.stat(path)
+        h.update(repr((os.path.abspath(path), st.st_size, st.st_mtime_ns)).encode('utf-8'))
+    return int.from_bytes(h.digest(), 'little')
+
+class StationRecord(Mapping):
+    """
+    A read-only view of one row of vertices.json.
+
+    'station_nm' and 'line_num' are answered from the StationTable. Any other attribute
+    ('address', 'tel', 'origin', ...) reads and decodes the row from the JSON file on first access.
+    """
+    __slots__ = ('table', 'index', '_full')
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+        self._full = None
+
+    def _load(self):
+        if self._full is None:
+            self._full = self.table.read_record(self.index)
+        return self._full
+
+    def __getitem__(self, key):
+        if key == 'station_nm':
+            return self.table.names[self.index]
+        if key == 'line_num':
+            return self.table.lines[self.index]
+        return self._load()[key]
+
+    def __iter__(self):
+        return iter(self._load())
+
+    def __len__(self):
+        return len(self._load())
+
+class StationTable:
+    """
+    Represents the rows of vertices.json as a struct of arrays holding only the routing columns.
+
+    Attributes:
+    - path (str): The JSON file the rows come from.
+    - names (list of str): station_nm of every row.
+    - lines (list of str): line_num of every row.
+    - latitudes, longitudes (array('d') or memoryview): xpoint_wgs and ypoint_wgs of every row, nan if missing.
+    - offsets, lengths: Position in bytes of every row inside 'path', used to read the other attributes on demand.
+
+    Detailed Explanation:
+    A row of vertices.json carries about 35 attributes, but routing only needs the name, the line and the coordinates. Keeping those in parallel arrays, instead of one dict per row, keeps the memory of the loaded network small; the rest of a row is decoded only when a StationRecord is asked for it.
+    """
+    __slots__ = ('path', 'names', 'lines', 'latitudes', 'longitudes', 'offsets', 'lengths')
+
+    def __init__(self, path, names, lines, latitudes, longitudes, offsets, lengths):
+        self.path = path
+        self.names = names
+        self.lines = lines
+        self.latitudes = latitudes
+        self.longitudes = longitudes
+        self.offsets = offsets
+        self.lengths = lengths
+
+    @classmethod
+    def from_json(cls, path):
+        """
+        Streams vertices.json into a StationTable.
+        """
+        names, lines = [], []
+        latitudes, longitudes = array('d'), array('d')
+        offsets, lengths = array('q'), array('q')
+        for offset, length, row in iter_json_array(path, 'DATA'):
+            names.append(row['station_nm'])
+            lines.append(row['line_num'])
+            latitudes.append(_to_float(row.get('xpoint_wgs')))
+            longitudes.append(_to_float(row.get('ypoint_wgs')))
+            offsets.append(offset)
+            lengths.append(length)
+        return cls(path, names, lines, latitudes, longitudes, offsets, lengths)
+
+    def __len__(self):
+        return len(self.names)
+
+    def record(self, i):
+        """
+        Returns a lazy StationRecord for row i.
+        """
+        return StationRecord(self, i)
+
+    def read_record(self, i):
+        """
+        Reads and decodes every attribute of row i from the JSON file.
+        """
+        with open(self.path, 'rb') as f:
+            f.seek(self.offsets[i])
+            return json.loads(f.read(self.lengths[i]).decode('utf-8'))
+
+    def coordinates(self, i):
+        """
+        Returns (latitude, longitude) of row i, or None if it has no coordinates.
+        """
+        lat, lon = self.latitudes[i], self.longitudes[i]
+        if lat != lat or lon != lon: # nan
+            return None
+        return lat, lon
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float('nan')
+
+class EdgeTable:
+    """
+    Represents the segments of edges.json as parallel arrays.
+
+    Attributes:
+    - line_names (list of str): The distinct lines, in file order.
+    - from_rows, to_rows: For every segment, the StationTable row of its endpoints (the last row with that name, as SubwayMap does).
+    - line_ids: For every segment, its index into line_names.
+    - distances, times: For every segment, its distance and time.
+    """
+    __slots__ = ('line_names', 'from_rows', 'to_rows', 'line_ids', 'distances', 'times')
+
+    def __init__(self, line_names, from_rows, to_rows, line_ids, distances, times):
+        self.line_names = line_names
+        self.from_rows = from_rows
+        self.to_rows = to_rows
+        self.line_ids = line_ids
+        self.distances = distances
+        self.times = times
+
+    @classmethod
+    def from_json(cls, path, station_table):
+        """
+        Reads edges.json, resolving station names against 'station_table'.
+        """
+        rows = {name: i for i, name in enumerate(station_table.names)}
+        with open(path, 'r', encoding = 'utf-8') as f:
+            segments = json.load(f)
+        line_names = list(segments)
+        from_rows, to_rows, line_ids = array('i'), array('i'), array('i')
+        distances, times = array('d'), array('d')
+        for line_id, line in enumerate(line_names):
+            for s in segments[line]:
+                from_rows.append(rows[s['from']])
+                to_rows.append(rows[s['to']])
+                line_ids.append(line_id)
+                distances.append(s['distance'])
+                times.append(s['time'])
+        return cls(line_names, from_rows, to_rows, line_ids, distances, times)
+
+    def __len__(self):
+        return len(self.from_rows)
+
+def _string_pool(strings):
+    return '\0'.join(strings).encode('utf-8')
+
+def save_network(path, key, station_table, edge_table):
+    """
+    Writes a StationTable and an EdgeTable to a binary cache file.
+
+    Layout: HEADER, then the UTF-8 string pool (station names, station lines, edge line names and
+    the source path, separated by NUL), padded to 8 bytes, then the arrays latitudes, longitudes,
+    offsets, lengths (per station) and distances, times, from_rows, to_rows, line_ids (per edge).
+    """
+    strings = station_table.names + station_table.lines + edge_table.line_names + [station_table.path]
+    pool = _string_pool(strings)
+    arrays = [array('d', station_table.latitudes), array('d', station_table.longitudes),
+                array('q', station_table.offsets), array('q', station_table.lengths),
+                array('d', edge_table.distances), array('d', edge_table.times),
+                array('i', edge_table.from_rows), array('i', edge_table.to_rows), array('i', edge_table.line_ids)]
+    tmp = f'{path}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, key, len(station_table), len(edge_table),
+                            len(edge_table.line_names), len(pool)))
+        f.write(pool)
+        f.write(b'\0' * (-(HEADER.size + len(pool)) % 8))
+        for a in arrays:
+            a.tofile(f)
+    os.replace(tmp, path)
+
+def load_network(path, key):
+    """
+    Maps a binary cache file written by save_network.
+
+    Returns:
+    - tuple: (StationTable, EdgeTable) whose numeric columns are zero-copy memoryviews of the mapped file, or None if the file is missing, from another format version, was built from other sources than 'key', or is shorter than its header says (a write cut short).
+    """
+    # mmap refuses an empty file: check the size before mapping
+    if not os.path.exists(path) or os.path.getsize(path) < HEADER.size:
+        return None
+    with open(path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ)
+    magic, version, file_key, n, m, n_lines, pool_size = HEADER.unpack_from(mm, 0)
+    if magic != MAGIC or version != FORMAT_VERSION or file_key != key:
+        return None
+
+    pos = HEADER.size + pool_size + (-(HEADER.size + pool_size) % 8)
+    layout = [('d', n), ('d', n), ('q', n), ('q', n), ('d', m), ('d', m), ('i', m), ('i', m), ('i', m)]
+    if pos + sum(struct.calcsize(fmt) * count for fmt, count in layout) > len(mm):
+        return None
+    strings = mm[HEADER.size:HEADER.size + pool_size].decode('utf-8').split('\0')
+    if len(strings) != 2 * n + n_lines + 1:
+        return None
+    names, lines = strings[:n], strings[n:2 * n]
+    line_names, source = strings[2 * n:2 * n + n_lines], strings[2 * n + n_lines]
+
+    view = memoryview(mm)
+    columns = []
+    for fmt, count in layout:
+        size = struct.calcsize(fmt) * count
+        columns.append(view[pos:pos + size].cast(fmt))
+        pos += size
+    latitudes, longitudes, offsets, lengths, distances, times, from_rows, to_rows, line_ids = columns
+    return (StationTable(source, names, lines, latitudes, longitudes, offsets, lengths),
+            EdgeTable(line_names, from_rows, to_rows, line_ids, distances, times))
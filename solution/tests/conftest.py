@@ -0,0 +1,16 @@
+import os
+import sys
+
+import pytest
+
+SOLUTION = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESOURCES = os.path.join(SOLUTION, 'resources')
+
+# the modules import each other from the solution directory, as when the scripts are run from there
+sys.path.insert(0, SOLUTION)
+
+BACKENDS = ['indexed', 'VE', 'adjacent_list', 'adjacent_matrix']
+
+@pytest.fixture
+def subway_files():
+    return os.path.join(RESOURCES, 'vertices.json'), os.path.join(RESOURCES, 'edges.json')
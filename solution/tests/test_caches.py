@@ -0,0 +1,49 @@
+import pytest
+
+from ADT.all_pairs import DistanceMatrix
+from ADT.contraction_hierarchy import ContractionHierarchy
+from data_structure.csr import CSRGraph
+from data_structure.graph import Vertex, Edge
+from subway_map import SubwayMap
+
+def _path_graph_edges(vertices, times = (1, 2, 3)):
+    by_name = {v.node_id: v for v in vertices}
+    path = [by_name[name] for name in 'ABCD']
+    return [Edge(u, v, is_directed = False, time = t) for (u, v), t in zip(zip(path, path[1:]), times)]
+
+def _path_graph(times = (1, 2, 3)):
+    vertices = [Vertex(name, None) for name in 'ABCD']
+    return CSRGraph.from_edges(vertices, _path_graph_edges(vertices, times))
+
+# each index with how it is built and loaded, the file it is saved to, the SubwayMap method caching it, and a query
+INDEXES = [
+    pytest.param(DistanceMatrix.compute, DistanceMatrix.load, 'time.npy', 'get_distance_matrix',
+                    lambda index, u, v: index.get(u, v), id = 'distance_matrix'),
+    pytest.param(ContractionHierarchy.build, ContractionHierarchy.load, 'ch_time.pkl', 'get_contraction_hierarchy',
+                    lambda index, u, v: index.query(u, v)[0], id = 'contraction_hierarchy'),
+]
+
+@pytest.mark.parametrize('build, load, file_name, getter, query', INDEXES)
+def test_index_cache_checks_its_source(tmp_path, build, load, file_name, getter, query):
+    csr = _path_graph()
+    path = str(tmp_path / file_name)
+    build(csr, 'time').save(path)
+
+    loaded = load(csr, path, 'time')
+    assert query(loaded, csr.vertices[0], csr.vertices[3]) == 6
+    reordered = CSRGraph.from_edges(csr.vertices[::-1], _path_graph_edges(csr.vertices))
+    for other, weight in [(reordered, 'time'), (csr, None), (_path_graph((1, 2, 4)), 'time')]:
+        with pytest.raises(ValueError):
+            load(other, path, weight)
+
+@pytest.mark.parametrize('build, load, file_name, getter, query', INDEXES)
+def test_index_cache_is_not_shared_between_backends(subway_files, tmp_path, build, load, file_name, getter, query):
+    # AdjMatrix folds parallel segments into one arc, so its snapshot differs from the indexed one
+    stations_json, edges_json = subway_files
+    getattr(SubwayMap(stations_json, edges_json, backend = 'indexed', cache_dir = str(tmp_path)), getter)('time')
+    shared = SubwayMap(stations_json, edges_json, backend = 'adjacent_matrix', cache_dir = str(tmp_path))
+    fresh = SubwayMap(stations_json, edges_json, backend = 'adjacent_matrix', cache_dir = str(tmp_path / 'fresh'))
+    shared_index, fresh_index = getattr(shared, getter)('time'), getattr(fresh, getter)('time')
+    for src in shared.stations[::50]:
+        for dst in shared.stations:
+            assert query(shared_index, src, dst) == pytest.approx(query(fresh_index, src, dst))
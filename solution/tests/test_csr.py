@@ -0,0 +1,81 @@
+import math
+from heapq import heappop, heappush
+
+import pytest
+
+from conftest import BACKENDS
+from ADT.graph import Graph
+from data_structure.csr import CSRGraph
+from data_structure.graph import AdjList, Vertex, Edge
+from subway_map import SubwayMap
+
+def test_searches_keep_the_snapshot_compact():
+    V = [Vertex(i, None) for i in range(50)]
+    E = [Edge(V[i], V[(i * 7 + 3) % 50], time = i / 4) for i in range(50)] + [Edge(V[i], V[i + 1], time = 1) for i in range(49)]
+    csr = CSRGraph.from_edges(V, E, ['time'])
+    arrays = csr.memory_usage()
+    assert arrays == 4 * (51 + 99) + 8 * 99
+
+    csr.search(0, 'time')
+    csr.search(0)
+    assert csr.memory_usage() == arrays
+    assert vars(csr).keys() == {'vertices', 'vertex_indices', 'offsets', 'targets', 'weights'}
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_default_weight_columns_skip_non_numeric_attributes(backend):
+    a, b, c = V = [Vertex(name, None) for name in 'abc']
+    weight_keys = ['time'] if backend == 'adjacent_matrix' else None
+    g = Graph(V, [Edge(a, b, time = 1, line = 'L1'), Edge(b, c, time = 2.5, line = 'L2')], backend = backend, weight_keys = weight_keys)
+    csr = g.to_csr()
+    assert list(csr.weights) == ['time']
+    assert csr.shortest_path(a, c, 'time') == (3.5, [a, b, c])
+
+def test_adj_list_snapshot_expands_slots_by_multiplicity():
+    a, b, c = V = [Vertex(name, None) for name in 'abc']
+    adj = AdjList(V, [Edge(a, b, time = 1, stops = [1, 2]), Edge(a, c, time = 2, stops = [3]), Edge(a, c, time = 3, stops = [4])])
+    csr = CSRGraph.from_adj_list(adj)
+    # a list-valued attribute is not a weight column, even next to parallel arcs
+    assert list(csr.weights) == ['time']
+    assert list(csr.targets) == [1, 2, 2] and list(csr.weights['time']) == [1, 2, 3]
+    with pytest.raises(TypeError):
+        CSRGraph.from_adj_list(adj, weight_keys = ['stops'])
+
+def _dijkstra(graph, src, weight):
+    # the plain object-graph Dijkstra the snapshot stands in for
+    dist = {src: 0}
+    heap = [(0, 0, src)]
+    count = 1
+    while heap:
+        d, _, v = heappop(heap)
+        if d > dist[v]:
+            continue
+        for n, w in graph.get_weighted_neighbors(v, weight):
+            if d + w < dist.get(n, math.inf):
+                dist[n] = d + w
+                heappush(heap, (d + w, count, n))
+                count += 1
+    return dist
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_csr_search_matches_graph_dijkstra(subway_files, tmp_path, backend):
+    stations_json, edges_json = subway_files
+    subway_map = SubwayMap(stations_json, edges_json, backend = backend, cache_dir = str(tmp_path))
+    csr = subway_map.to_csr(weight_keys = ['distance', 'time'])
+    # the VE backend may list equal stations more than once, the snapshot interns them
+    assert csr.num_vertices() == len(set(subway_map.get_vertices()))
+    for src in subway_map.get_vertices()[::97]:
+        assert set(csr.bfs(src)) == set(subway_map.bfs(src))
+        assert set(csr.dfs(src)) == set(subway_map.dfs(src))
+        # edges.json marks unknown distances with -1, so only 'time' is a valid Dijkstra weight as stored
+        expected = _dijkstra(subway_map, src, 'time')
+        lengths = csr.shortest_path_lengths(src, 'time')
+        assert lengths.keys() == expected.keys()
+        assert all(lengths[v] == pytest.approx(d) for v, d in expected.items())
+
+        dst = max(expected, key = expected.get)
+        cost, path = csr.shortest_path(src, dst, 'time')
+        assert cost == pytest.approx(expected[dst])
+        assert path[0] == src and path[-1] == dst
+        # every step of the path is the lightest of the parallel arcs between its endpoints
+        steps = [min(w for n, w in subway_map.get_weighted_neighbors(u, 'time') if n == v) for u, v in zip(path, path[1:])]
+        assert sum(steps) == pytest.approx(cost)
@@ -0,0 +1,62 @@
+import math
+import random
+from heapq import heappop, heappush
+
+import pytest
+
+from ADT.dynamic_sssp import DynamicShortestPaths
+
+def _fresh_dist(out_arcs, source):
+    # Dijkstra from scratch over the current arcs
+    dist = [math.inf] * len(out_arcs)
+    dist[source] = 0
+    heap = [(0, source)]
+    while heap:
+        d, u = heappop(heap)
+        if d > dist[u]:
+            continue
+        for v, w in out_arcs[u].items():
+            if d + w < dist[v]:
+                dist[v] = d + w
+                heappush(heap, (d + w, v))
+    return dist
+
+def _check_trees(paths):
+    for source, (dist, parent) in paths.trees.items():
+        assert dist == _fresh_dist(paths.out_arcs, source)
+        for v, p in enumerate(parent):
+            if v == source or dist[v] == math.inf:
+                assert p == -1
+            else:
+                # the parent arc exists and is tight
+                assert dist[p] + paths.out_arcs[p][v] == dist[v]
+
+@pytest.mark.parametrize('seed', range(5))
+def test_repaired_trees_match_a_fresh_dijkstra(seed):
+    rng = random.Random(seed)
+    n = 40
+    # integer weights from a small range: many ties, so many vertices have several tight in-arcs
+    arcs = [(rng.randrange(n), rng.randrange(n), rng.randint(1, 4)) for _ in range(120)]
+    paths = DynamicShortestPaths(range(n), [(u, v, w) for u, v, w in arcs if u != v])
+    for source in rng.sample(range(n), 5):
+        paths.tree(source)
+    _check_trees(paths)
+
+    for _ in range(300):
+        u, v = rng.sample(range(n), 2)
+        if v in paths.out_arcs[u] and rng.random() < 0.4:
+            paths.set_arc(u, v, None)
+        else:
+            # an insertion, or a longer or shorter reweighting of an existing arc
+            paths.set_arc(u, v, rng.randint(1, 4))
+        _check_trees(paths)
+
+    # the last arc of a shortest path deleted, then put back
+    dist, parent = paths.tree(0)
+    v = max((x for x in range(n) if dist[x] < math.inf), key = dist.__getitem__)
+    if v != 0:
+        u, w = parent[v], paths.out_arcs[parent[v]][v]
+        paths.set_arc(u, v, None)
+        _check_trees(paths)
+        paths.set_arc(u, v, w)
+        _check_trees(paths)
@@ -0,0 +1,98 @@
+import pytest
+
+from conftest import BACKENDS
+from ADT.graph import Graph
+from data_structure.graph import AdjList, AdjMatrix, Vertex, Edge
+
+def test_adj_matrix_weights_are_opt_in_float32():
+    V = [Vertex(i, i) for i in range(3)]
+    E = [Edge(V[0], V[1], time = 2.5), Edge(V[1], V[2], time = 4)]
+    assert AdjMatrix(V, E).weights == {}
+    with pytest.raises(KeyError, match = 'weight_keys'):
+        AdjMatrix(V, E).get_weighted_neighbors(V[0], 'time')
+
+    matrix = AdjMatrix(V, E, weight_keys = ['time'])
+    assert matrix.weights['time'].dtype == 'float32'
+    assert matrix.get_weighted_neighbors(V[1], 'time') == [(V[2], 4.0)]
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_weights_of_edges_added_to_an_empty_graph(backend):
+    V = [Vertex(i, i) for i in range(3)]
+    weight_keys = ['time'] if backend == 'adjacent_matrix' else None
+    g = Graph(V, [], backend = backend, weight_keys = weight_keys)
+    g.add_edge(Edge(V[0], V[1], time = 3))
+    g.add_edge(Edge(V[0], V[2], time = 5))
+    assert sorted(g.get_weighted_neighbors(V[0], 'time'), key = lambda p: p[0].node_id) == [(V[1], 3), (V[2], 5)]
+
+def test_adj_list_list_weights_next_to_parallel_edges():
+    a, b, c = V = [Vertex(name, None) for name in 'abc']
+    adj = AdjList(V, [Edge(a, b, stops = [1, 2]), Edge(a, c, stops = [3]), Edge(a, c, stops = [4])])
+    assert adj.get_weighted_neighbors(a, 'stops') == [(b, [1, 2]), (c, [3]), (c, [4])]
+
+def test_adj_matrix_without_weight_keys_says_so():
+    V = [Vertex(i, i) for i in range(2)]
+    g = Graph(V, [], backend = 'adjacent_matrix')
+    g.add_edge(Edge(V[0], V[1], time = 3))
+    with pytest.raises(KeyError, match = 'weight_keys'):
+        g.get_weighted_neighbors(V[0], 'time')
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_bridges_fold_opposite_arcs_on_every_backend(backend):
+    u, w, x = V = [Vertex(name, None) for name in 'uwx']
+    g = Graph(V, [Edge(u, w), Edge(w, u), Edge(w, x)], backend = backend)
+    assert sorted((e.from_vertex.node_id, e.to_vertex.node_id) for e in g.bridges()) == [('u', 'w'), ('w', 'x')]
+    assert g.articulation_points() == [w]
+
+    if backend != 'adjacent_matrix': # the matrix holds no parallel arcs
+        g.add_edge(Edge(u, w))
+        assert [(e.from_vertex.node_id, e.to_vertex.node_id) for e in g.bridges()] == [('w', 'x')]
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_components_after_adding_a_vertex(backend):
+    a, b, c = V = [Vertex(name, None) for name in 'abc']
+    g = Graph(V[:2], [Edge(a, b)], backend = backend)
+    assert g.connected_components() == [[a, b]]
+    g.add_vertex(c)
+    assert g.connected_components() == [[a, b], [c]]
+    if backend == 'adjacent_matrix': # the matrix accepts a vertex it already holds
+        g.add_vertex(a)
+        assert g.connected_components() == [[a, b], [c]]
+        assert g.same_component(a, b)
+    else:
+        with pytest.raises(ValueError):
+            g.add_vertex(a)
+
+def _diamond_graph(backend):
+    # the graph of the dfs / bfs docstrings: A - B, C - D - E - F, G, H
+    V = {name: Vertex(name, name) for name in 'ABCDEFGH'}
+    E = [Edge(V[a], V[b], False) for a, b in ['AB', 'AC', 'BD', 'CD', 'DE', 'EF', 'EG', 'EH']]
+    return Graph(list(V.values()), E, backend = backend), V
+
+def _names(vertices):
+    return ''.join(v.node_id for v in vertices)
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_traversals_stop_at_target_and_max_depth(backend):
+    g, V = _diamond_graph(backend)
+    assert _names(g.dfs(V['A'])) == 'ABDEFGHC'
+    assert _names(g.bfs(V['A'])) == 'ABCDEFGH'
+    assert _names(g.dfs(V['A'], target = V['E'])) == 'ABDE'
+    assert _names(g.bfs(V['A'], target = V['D'])) == 'ABCD'
+    assert _names(g.dfs(V['A'], max_depth = 2)) == 'ABDC'
+    assert _names(g.bfs(V['A'], max_depth = 1)) == 'ABC'
+    assert _names(g.bfs(V['E'], max_depth = 0)) == 'E'
+    assert _names(g.iter_bfs(V['A'], max_depth = 3)) == 'ABCDE'
+
+@pytest.mark.parametrize('backend', ['indexed', 'adjacent_list', 'adjacent_matrix'])
+def test_iter_traversals_are_lazy(backend, monkeypatch):
+    g, V = _diamond_graph(backend)
+    expanded = []
+    get_neighbors = g.get_neighbors
+    monkeypatch.setattr(g, 'get_neighbors', lambda v: expanded.append(v) or get_neighbors(v))
+    for traversal in (g.iter_dfs, g.iter_bfs):
+        expanded.clear()
+        it = traversal(V['A'])
+        assert expanded == []
+        assert _names([next(it), next(it)]) == 'AB'
+        # only the vertices already yielded have been expanded
+        assert _names(expanded) == 'A'
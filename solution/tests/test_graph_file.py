@@ -0,0 +1,83 @@
+import pytest
+
+from conftest import BACKENDS
+from ADT.graph import Graph
+from data_structure.graph import Vertex, Edge
+
+def _mixed_graph():
+    # node ids and data of several types, mixed directedness, and attributes found on some edges only
+    a, b, c, d = V = [Vertex('a', 1), Vertex(('b', 2), 'x'), Vertex('c', 2.5), Vertex('d', (1, 'y'))]
+    E = [Edge(a, b, True, time = 1.5, line = 'L1', n = 3, stops = [1, 2]),
+            Edge(b, c, False, time = 2, line = 'L2', n = 4, stops = [], note = 'x'),
+            Edge(c, d, True, time = 0.25, line = 'L1', n = 5, stops = [3], shut = True)]
+    return V, E
+
+def _vertices(graph):
+    return [(v.node_id, v.datum) for v in graph.get_vertices()]
+
+def _edges(graph):
+    index = {v: i for i, v in enumerate(graph.get_vertices())}
+    return sorted((index[e.from_vertex], index[e.to_vertex], e.is_directed, sorted(e.data.items())) for e in graph.get_edges())
+
+def _arcs(graph, weight_keys):
+    index = {v: i for i, v in enumerate(graph.get_vertices())}
+    arcs = []
+    for v in graph.get_vertices():
+        columns = [graph.get_weighted_neighbors(v, k) for k in weight_keys]
+        arcs.extend((index[v], index[row[0][0]], *[w for _, w in row]) for row in zip(*columns))
+    return sorted(arcs)
+
+@pytest.mark.parametrize('mmap', [True, False])
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_graph_file_round_trip(tmp_path, backend, mmap):
+    V, E = _mixed_graph()
+    path = str(tmp_path / 'g.graph')
+    Graph(V, E).save(path)
+
+    loaded = Graph.load(path, mmap = mmap, backend = backend)
+    assert _vertices(loaded) == _vertices(Graph(V, E))
+    if backend in ('indexed', 'VE'):
+        assert _edges(loaded) == _edges(Graph(V, E))
+    else:
+        # the adjacency backends keep the numeric columns as weights
+        expected = Graph(V, E, backend = backend, weight_keys = ['time', 'n'])
+        assert _arcs(loaded, ['time', 'n']) == _arcs(expected, ['time', 'n'])
+
+@pytest.mark.parametrize('mmap', [True, False])
+@pytest.mark.parametrize('backend', ['adjacent_list', 'adjacent_matrix'])
+def test_adjacency_backends_save_directed_arcs(tmp_path, backend, mmap):
+    a, b, c = V = [Vertex(name, None) for name in 'abc']
+    E = [Edge(a, b, False, time = 1, line = 'L1'), Edge(a, b, False, time = 2, line = 'L2'), Edge(b, c, False, time = 3, line = 'L1')]
+    weight_keys = ['time'] if backend == 'adjacent_matrix' else None
+    path = str(tmp_path / 'g.graph')
+    Graph(V, E, backend = backend, weight_keys = weight_keys).save(path)
+
+    edges = _edges(Graph.load(path, mmap = mmap))
+    assert all(directed for _, _, directed, _ in edges)
+    if backend == 'adjacent_matrix':
+        # one cell per ordered pair: the parallel edges a - b are folded into the last one
+        assert [(u, v, data) for u, v, _, data in edges] == [
+            (0, 1, [('time', 2.0)]), (1, 0, [('time', 2.0)]), (1, 2, [('time', 3.0)]), (2, 1, [('time', 3.0)])]
+    else:
+        # an AdjList keeps every parallel arc and every attribute, strings included
+        assert len(edges) == 6
+        assert sorted(data for _, _, _, data in edges) == sorted(
+            [('line', line), ('time', time)] for line, time in [('L1', 1), ('L2', 2), ('L1', 3)] * 2)
+
+def test_adj_list_saves_list_weights_next_to_parallel_arcs(tmp_path):
+    a, b, c = V = [Vertex(name, None) for name in 'abc']
+    E = [Edge(a, b, stops = [1, 2]), Edge(a, c, stops = [3]), Edge(a, c, stops = [4])]
+    path = str(tmp_path / 'g.graph')
+    Graph(V, E, backend = 'adjacent_list').save(path)
+
+    assert [(u, v, data) for u, v, _, data in _edges(Graph.load(path))] == [
+        (0, 1, [('stops', [1, 2])]), (0, 2, [('stops', [3])]), (0, 2, [('stops', [4])])]
+
+def test_graph_file_rejects_other_files(tmp_path):
+    path = tmp_path / 'not.graph'
+    path.write_bytes(b'GRPX' + bytes(60))
+    with pytest.raises(ValueError):
+        Graph.load(str(path))
+    path.write_bytes(b'')
+    with pytest.raises(ValueError):
+        Graph.load(str(path), mmap = False)
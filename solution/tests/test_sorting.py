@@ -0,0 +1,222 @@
+import bisect
+import random
+from operator import attrgetter
+
+import pytest
+
+from sorting import sorting
+from sorting.sorting import SortedList, get_insert_idx, merge, merge_sort, partition, quick_sort, quick_sort_util, tim_sort
+
+GREATER = lambda x, y: x if x > y else y # the former default cmp
+LESSER = lambda x, y: x if x < y else y
+
+class Tagged:
+    # compares on 'key' alone, so equal keys tell a stable sort by their tags
+    __slots__ = ('key', 'tag')
+
+    def __init__(self, key, tag):
+        self.key = key
+        self.tag = tag
+
+    def __lt__(self, other):
+        return self.key < other.key
+
+def _tags(items):
+    return [(x.key, x.tag) for x in items]
+
+def _random_inputs(n, seed):
+    rng = random.Random(seed)
+    runs = []
+    while len(runs) < n:
+        # ascending and descending runs of random lengths, the shape timsort detects
+        run = sorted(rng.randrange(n + 1) for _ in range(rng.randrange(1, 200)))
+        runs.extend(run if rng.random() < 0.5 else run[::-1])
+    return [[rng.randrange(n + 1) for _ in range(n)],
+            [rng.randrange(4) for _ in range(n)],
+            runs[:n],
+            list(range(n)) + [rng.randrange(n + 1) for _ in range(8)]]
+
+def test_legacy_helpers_take_cmp():
+    assert get_insert_idx([9, 7, 7, 3], 7, cmp = GREATER) == get_insert_idx([9, 7, 7, 3], 7) == 1
+    assert get_insert_idx([9, 7, 7, 3], 1, cmp = GREATER) == 4
+    assert get_insert_idx([3, 7, 7, 9], 7, cmp = LESSER) == 1
+
+    first = lambda x, y: x if x[0] > y[0] else y
+    assert merge([(1, 'l'), (4, 'l')], [(2, 'r'), (4, 'r')], [None] * 4, cmp = first) == [(1, 'l'), (2, 'r'), (4, 'l'), (4, 'r')]
+    assert merge([1, 4, 4], [2, 4, 5], [None] * 6) == [1, 2, 4, 4, 4, 5]
+    assert merge([], [2], [None]) == [2]
+
+    for cmp in (None, GREATER):
+        lst = [0, 0, 5, 1, 8, 3, 5, 9, 2, 5, 0]
+        p = partition(lst, 2, 9, cmp = cmp) if cmp else partition(lst, 2, 9)
+        assert lst[:2] == [0, 0] and lst[10:] == [0]
+        assert sorted(lst[2:10]) == [1, 2, 3, 5, 5, 5, 8, 9]
+        assert lst[p] == 5 and all(x <= 5 for x in lst[2:p]) and all(x > 5 for x in lst[p + 1:10])
+
+    lst = [9, 9, 5, 1, 8, 3, 0]
+    assert quick_sort_util(lst, 2, 5, cmp = GREATER) == [9, 9, 1, 3, 5, 8, 0]
+    assert quick_sort_util(lst, 2, 5, cmp = LESSER) == [9, 9, 8, 5, 3, 1, 0]
+    assert quick_sort_util(lst, 0, 6) == [0, 1, 3, 5, 8, 9, 9]
+
+@pytest.mark.parametrize('n', [0, 1, 2, 31, 63, 64, 65, 1000, 5000])
+def test_tim_sort_matches_sorted(n):
+    for data in _random_inputs(n, n):
+        assert tim_sort(list(data)) == sorted(data)
+        assert tim_sort(list(data), reverse = True) == sorted(data, reverse = True)
+        assert tim_sort(list(data), key = lambda x: x % 7) == sorted(data, key = lambda x: x % 7)
+        assert tim_sort(list(data), key = lambda x: x % 7, reverse = True) == sorted(data, key = lambda x: x % 7, reverse = True)
+        assert tim_sort(list(data), cmp = GREATER) == sorted(data)
+
+        # the elements themselves, without the positions _sort_keyed adds: the merges alone keep equal keys in order
+        items = [Tagged(x % 5, i) for i, x in enumerate(data)]
+        assert _tags(tim_sort(list(items))) == _tags(sorted(items, key = attrgetter('key')))
+
+def test_tim_sort_gallops_through_interleaved_blocks(monkeypatch):
+    calls = {'merge': 0, 'gallop': 0}
+    def spy(original, counter):
+        def wrapper(*args):
+            calls[counter] += 1
+            return original(*args)
+        return wrapper
+    monkeypatch.setattr(sorting._TimSort, 'merge_at', spy(sorting._TimSort.merge_at, 'merge'))
+    monkeypatch.setattr(sorting, '_gallop_left', spy(sorting._gallop_left, 'gallop'))
+    monkeypatch.setattr(sorting, '_gallop_right', spy(sorting._gallop_right, 'gallop'))
+
+    # two ascending runs made of alternating blocks of 100: every block is a streak that gallops
+    a = [x for b in range(0, 2000, 200) for x in range(b, b + 100)]
+    b = [x + 100 for x in a]
+    assert tim_sort(a + b) == sorted(a + b)
+    assert calls['merge'] == 1
+    # two gallops trim the runs before the merge, the rest were taken inside it
+    assert calls['gallop'] > 2
+
+def _adversarial_inputs(n):
+    # the inputs that turn a last-element pivot quadratic, and all-equal keys for a two-way partition
+    half = n // 2
+    return [list(range(n)), list(range(n, 0, -1)), [7] * n,
+            list(range(half)) + list(range(n - half, 0, -1))]
+
+@pytest.mark.parametrize('n', [0, 1, 2, 16, 17, 41, 1000, 5000])
+def test_quick_sort_matches_sorted_on_adversarial_inputs(n):
+    for data in _adversarial_inputs(n) + _random_inputs(n, n):
+        assert quick_sort(list(data)) == sorted(data)
+        assert quick_sort(list(data), reverse = True) == sorted(data, reverse = True)
+        assert quick_sort(list(data), key = lambda x: x % 7) == sorted(data, key = lambda x: x % 7)
+        assert quick_sort(list(data), cmp = LESSER) == sorted(data, reverse = True)
+
+def test_quick_sort_takes_the_ninther_of_large_ranges(monkeypatch):
+    medians = []
+    median_of_three = sorting._median_of_three
+    def spy(lst, i, j, k):
+        medians.append((i, j, k))
+        return median_of_three(lst, i, j, k)
+    monkeypatch.setattr(sorting, '_median_of_three', spy)
+
+    assert quick_sort(list(range(1000))) == list(range(1000))
+    # the first pivot is the median of the medians of three spread triples over the whole list
+    assert medians[:3] == [(0, 125, 250), (375, 500, 625), (749, 874, 999)]
+    assert len(medians) > 4
+
+def test_quick_sort_partitions_equal_keys_once(monkeypatch):
+    calls = []
+    partition_ = sorting._partition
+    def spy(lst, low, high, pivot):
+        calls.append((low, high))
+        return partition_(lst, low, high, pivot)
+    monkeypatch.setattr(sorting, '_partition', spy)
+    assert quick_sort([7] * 1000) == [7] * 1000
+    assert calls == [(0, 999)]
+
+    calls.clear()
+    data = [random.Random(3).randrange(3) for _ in range(1000)]
+    assert quick_sort(list(data)) == sorted(data)
+    # every partition sets aside one of the three keys
+    assert len(calls) <= 3
+
+def test_quick_sort_falls_back_to_heap_sort_at_the_depth_limit(monkeypatch):
+    heap_sorts = []
+    heap_sort = sorting._heap_sort
+    def spy(lst, low, high):
+        heap_sorts.append((low, high))
+        heap_sort(lst, low, high)
+    monkeypatch.setattr(sorting, '_heap_sort', spy)
+    # the worst pivot, the least element, peels one element per level
+    monkeypatch.setattr(sorting, '_choose_pivot', lambda lst, low, high: min(lst[low:high + 1]))
+
+    data = list(range(500, 0, -1)) + list(range(500))
+    assert quick_sort(list(data)) == sorted(data)
+    assert len(heap_sorts) == 1
+    low, high = heap_sorts[0]
+    # 2 * log2(1000) levels of one or two elements each
+    assert high - low + 1 >= 1000 - 2 * 2 * (1000).bit_length()
+
+@pytest.mark.parametrize('n', [1, 3, 31, 33, 65, 127, 1001, 4099])
+def test_merge_sort_matches_sorted(n):
+    for data in _adversarial_inputs(n) + _random_inputs(n, n):
+        assert merge_sort(list(data)) == sorted(data)
+        assert merge_sort(list(data), reverse = True) == sorted(data, reverse = True)
+        assert merge_sort(list(data), key = lambda x: x % 7) == sorted(data, key = lambda x: x % 7)
+        assert merge_sort(list(data), key = lambda x: x % 7, reverse = True) == sorted(data, key = lambda x: x % 7, reverse = True)
+        assert merge_sort(list(data), cmp = GREATER) == sorted(data)
+
+        # the blocks, the run merges and their buffer alone keep equal keys in order
+        items = [Tagged(x % 5, i) for i, x in enumerate(data)]
+        assert _tags(merge_sort(list(items))) == _tags(sorted(items, key = attrgetter('key')))
+
+def _check_blocks(sl, expected):
+    assert list(sl) == expected and len(sl) == len(expected)
+    assert all(sl.lists) and sl.maxes == [block[-1] for block in sl.lists]
+    assert all(len(block) <= 2 * sl.load for block in sl.lists)
+
+def test_sorted_list_matches_a_plain_sorted_list():
+    rng = random.Random(25)
+    initial = [rng.randrange(50) for _ in range(30)]
+    sl, expected = SortedList(initial, load = 4), sorted(initial)
+    block_counts = set()
+    for step in range(3000):
+        # grow, then shrink, then grow again, so that blocks split and join
+        grow = (step // 500) % 2 == 0
+        x = rng.randrange(50)
+        if grow or not expected:
+            sl.add(x)
+            bisect.insort_right(expected, x)
+        elif rng.random() < 0.5:
+            if x in expected:
+                sl.remove(x)
+                expected.remove(x)
+            else:
+                with pytest.raises(ValueError):
+                    sl.remove(x)
+        else:
+            i = rng.randrange(-len(expected), len(expected))
+            assert sl.pop(i) == expected.pop(i)
+        block_counts.add(len(sl.lists))
+
+        y = rng.randrange(-1, 51)
+        assert sl.bisect_left(y) == bisect.bisect_left(expected, y)
+        assert sl.bisect_right(y) == bisect.bisect_right(expected, y)
+        assert sl.count(y) == expected.count(y)
+        assert (y in sl) == (y in expected)
+        if y in expected:
+            assert sl.index(y) == expected.index(y)
+        if expected:
+            i = rng.randrange(-len(expected), len(expected))
+            assert sl[i] == expected[i]
+        if step % 100 == 0:
+            _check_blocks(sl, expected)
+            a, b = sorted(rng.randrange(-len(expected) - 2, len(expected) + 2) for _ in range(2))
+            assert sl[a:b] == expected[a:b] and sl[::-3] == expected[::-3]
+            assert list(reversed(sl)) == expected[::-1]
+    _check_blocks(sl, expected)
+    assert len(block_counts) > 10
+
+def test_sorted_list_keeps_equal_elements_in_insertion_order():
+    sl = SortedList(load = 4)
+    items = [Tagged(i % 3, i) for i in range(40)]
+    for x in items:
+        sl.add(x)
+    assert _tags(sl) == _tags(sorted(items, key = attrgetter('key')))
+    with pytest.raises(IndexError):
+        sl[40]
+    with pytest.raises(ValueError):
+        SortedList(load = 3)
@@ -0,0 +1,35 @@
+import pytest
+
+from conftest import BACKENDS
+from subway_map import SubwayMap, StationEdge
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_transfer_routes_after_mutation(subway_files, tmp_path, backend):
+    stations_json, edges_json = subway_files
+    subway_map = SubwayMap(stations_json, edges_json, backend = backend, cache_dir = str(tmp_path))
+    edge = subway_map.station_edges[0]
+    src, dst = edge.from_station, edge.to_station
+
+    subway_map.remove_edge(edge)
+    shortcut = StationEdge(src, dst, 'shortcut', edge.distance, 0.5)
+    subway_map.add_edge(shortcut)
+
+    routes = subway_map.find_transfer_routes(src, dst)
+    time, transfers, path = routes[0]
+    assert (time, transfers) == (0.5, 0)
+    assert path == [(src, 'shortcut'), (dst, 'shortcut')]
+
+def test_routing_keeps_the_snapshot_compact(subway_files, tmp_path):
+    stations_json, edges_json = subway_files
+    subway_map = SubwayMap(stations_json, edges_json, cache_dir = str(tmp_path))
+    edge = subway_map.station_edges[0]
+    csr = subway_map.get_route_engine().csr
+    arrays = csr.memory_usage()
+
+    for weight in ('time', 'distance'):
+        for method in ('astar', 'dijkstra'):
+            subway_map.find_route(edge.from_station, edge.to_station, weight = weight, method = method)
+        subway_map.find_route(edge.from_station, weight = weight)
+    assert subway_map.get_route_engine().csr is csr
+    assert csr.memory_usage() == arrays
+    assert vars(csr).keys() == {'vertices', 'vertex_indices', 'offsets', 'targets', 'weights'}
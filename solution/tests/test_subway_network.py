@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+
+from conftest import SOLUTION
+from subway_map import SubwayMap
+from subway_network import source_key, load_network
+
+def _source_key_in_subprocess(*paths):
+    code = f'from subway_network import source_key; print(source_key(*{paths!r}))'
+    return int(subprocess.run([sys.executable, '-c', code], cwd = SOLUTION, capture_output = True, text = True, check = True).stdout)
+
+def test_source_key_is_stable_across_processes(subway_files):
+    assert _source_key_in_subprocess(*subway_files) == source_key(*subway_files)
+
+def test_network_cache_hits_in_another_process(subway_files, tmp_path):
+    stations_json, edges_json = subway_files
+    SubwayMap(stations_json, edges_json, cache_dir = str(tmp_path), lazy = True)
+
+    key = _source_key_in_subprocess(stations_json, edges_json)
+    assert load_network(str(tmp_path / 'network.bin'), key) is not None
+
+def test_one_key_names_every_cache(subway_files, tmp_path, monkeypatch):
+    import subway_map
+    calls = []
+    def counting_source_key(*paths):
+        calls.append(paths)
+        return source_key(*paths)
+    monkeypatch.setattr(subway_map, 'source_key', counting_source_key)
+
+    s = SubwayMap(*subway_files, cache_dir = str(tmp_path), lazy = True)
+    s.get_distance_matrix('time')
+    s.get_contraction_hierarchy('time')
+    assert len(calls) == 1
+
+    key = f'{source_key(*subway_files):016x}'
+    assert s.resource_hash() == key
+    assert sorted(os.listdir(tmp_path)) == ['ch_time_' + key + '.pkl', 'network.bin', 'time_' + key + '.npy', 'time_' + key + '.npy.source']
+
+def test_truncated_network_cache_falls_back_to_json(subway_files, tmp_path):
+    rows = len(SubwayMap(*subway_files, cache_dir = str(tmp_path), lazy = True).station_table)
+    path = tmp_path / 'network.bin'
+    data = path.read_bytes()
+    key = source_key(*subway_files)
+    assert load_network(str(path), key) is not None
+
+    for size in (0, 10, len(data) // 2, len(data) - 1):
+        path.write_bytes(data[:size])
+        assert load_network(str(path), key) is None
+        s = SubwayMap(*subway_files, cache_dir = str(tmp_path), lazy = True)
+        assert len(s.station_table) == rows
+        assert path.read_bytes() == data # rebuilt